@@ -0,0 +1,185 @@
+import os
+import re
+import sqlite3
+import datetime
+import threading
+from constants import BACKUP_DIR, BACKUP_INTERVAL_HOURS, BACKUP_RETENTION, BACKUP_PAGES_PER_STEP
+
+
+class BackupJob:
+    """Copy a live database to ``dest`` with the SQLite backup API.
+
+    The copy runs in a worker thread, ``pages`` pages per step, so the UI
+    stays responsive; poll ``fraction`` and ``finished`` from the Tk thread.
+    The source connection holds one read transaction for the whole copy,
+    so the backup is a consistent snapshot even while other connections
+    keep committing. The file only appears at ``dest`` once it is complete.
+    """
+
+    def __init__(self, db_file, dest, pages=BACKUP_PAGES_PER_STEP):
+        self.db_file = db_file
+        self.dest = dest
+        self.pages = pages
+        self.done_pages = 0
+        self.total_pages = 0
+        self.error = None
+        self.finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="backup", daemon=True)
+
+    @property
+    def fraction(self):
+        if self.finished.is_set() and self.error is None:
+            return 1.0
+        if not self.total_pages:
+            return 0.0
+        return self.done_pages / self.total_pages
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self.finished.wait(timeout)
+        return self.error is None
+
+    def _on_progress(self, status, remaining, total):
+        self.total_pages = total
+        self.done_pages = total - remaining
+
+    def _run(self):
+        tmp = self.dest + ".part"
+        src = dst = None
+        try:
+            src = sqlite3.connect(self.db_file, isolation_level=None)
+            src.execute("BEGIN")
+            src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            dst = sqlite3.connect(tmp)
+            src.backup(dst, pages=self.pages, progress=self._on_progress, sleep=0.005)
+            dst.close()
+            dst = None
+            os.replace(tmp, self.dest)
+        except Exception as e:
+            self.error = e
+            if dst is not None:
+                dst.close()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        finally:
+            if src is not None:
+                src.close()
+            self.finished.set()
+
+
+# Timestamp in scheduled backup names; sorts in time order as text.
+STAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+
+class BackupScheduler:
+    """Take a timestamped backup every ``interval_hours`` and keep the
+    newest ``retention`` files in ``directory``."""
+
+    def __init__(self, db_file, directory=BACKUP_DIR, interval_hours=BACKUP_INTERVAL_HOURS,
+                 retention=BACKUP_RETENTION):
+        self.db_file = db_file
+        self.directory = directory
+        self.interval = interval_hours * 3600
+        self.retention = retention
+        self.last_job = None
+        self._timer = None
+        self._stopped = threading.Event()
+
+    def _prefix(self):
+        return os.path.splitext(os.path.basename(self.db_file))[0]
+
+    def start(self):
+        """Begin the schedule. A backup is taken straight away when the newest
+        one is already older than the interval (e.g. the app was closed)."""
+        if self.interval > 0:
+            if self._overdue():
+                threading.Thread(target=self._tick, daemon=True).start()
+            else:
+                self._schedule()
+        return self
+
+    def _overdue(self):
+        existing = self.backups()
+        if not existing:
+            return True
+        age = datetime.datetime.now().timestamp() - os.path.getmtime(existing[0])
+        return age >= self.interval
+
+    def stop(self):
+        self._stopped.set()
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _schedule(self):
+        if self._stopped.is_set():
+            return
+        self._timer = threading.Timer(self.interval, self._tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _tick(self):
+        try:
+            self.run_now().wait()
+            self.prune()
+        finally:
+            self._schedule()
+
+    def run_now(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.datetime.now().strftime(STAMP_FORMAT)
+        dest = os.path.join(self.directory, f"{self._prefix()}-{stamp}.db")
+        self.last_job = BackupJob(self.db_file, dest).start()
+        return self.last_job
+
+    def backups(self):
+        """Existing scheduled backups, newest first. Only names this scheduler
+        writes count, so other files in the directory are never pruned."""
+        pattern = re.compile(re.escape(self._prefix()) + r"-\d{8}-\d{6}\.db")
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted((os.path.join(self.directory, n) for n in names if pattern.fullmatch(n)), reverse=True)
+
+    def prune(self):
+        for path in self.backups()[self.retention:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class RestoreJob:
+    """Load a backup into the live ``Database`` in a worker thread.
+
+    Same polling interface as ``BackupJob``; see ``Database.restore_from``.
+    """
+
+    def __init__(self, db, path, pages=BACKUP_PAGES_PER_STEP):
+        self.db = db
+        self.path = path
+        self.pages = pages
+        self.done_pages = 0
+        self.total_pages = 0
+        self.error = None
+        self.finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="restore", daemon=True)
+
+    fraction = BackupJob.fraction
+    wait = BackupJob.wait
+    _on_progress = BackupJob._on_progress
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.db.restore_from(self.path, pages=self.pages, progress=self._on_progress)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
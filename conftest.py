@@ -0,0 +1,14 @@
+import pytest
+
+from database import Database
+
+# A manual smoke script for the Tk app, not a pytest module.
+collect_ignore = ["test_init_main.py"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fully migrated database in a fresh temporary directory."""
+    database = Database(str(tmp_path / "test.db"))
+    yield database
+    database.close()
@@ -10,3 +10,49 @@ DORM_WATER = 80.0
 
 DEFAULT_APPEARANCE = "Dark"
 DEFAULT_COLOR_THEME = "blue"
+
+# SQLite tuning profile used by Database: "desktop", "bulk-load" or "read-mostly".
+# The APARTMENT_DB_PROFILE environment variable overrides this value.
+DB_PROFILE = "desktop"
+DB_PROFILE_ENV = "APARTMENT_DB_PROFILE"
+
+# Number of read-only connections Database.query may hand out at once.
+DB_READER_POOL_SIZE = 4
+
+# Query instrumentation (off unless APARTMENT_QUERY_STATS is set to 1).
+QUERY_STATS_ENV = "APARTMENT_QUERY_STATS"
+SLOW_QUERY_MS = 50.0
+SLOW_QUERY_LOG = "slow_queries.log"
+
+# Online backups (backup.py). An interval of 0 disables scheduled backups.
+BACKUP_DIR = "backups"
+BACKUP_INTERVAL_HOURS = 24
+BACKUP_RETENTION = 7
+BACKUP_PAGES_PER_STEP = 256
+
+# Most tenant rows TenantModel keeps in its identity map before evicting.
+TENANT_CACHE_SIZE = 2048
+
+# Rows fetched per keyset page by the grids (tenants, payments, maintenance, logs).
+PAGE_SIZE = 200
+
+# Most ids bound into one ``IN (...)`` lookup; older SQLite builds cap a
+# statement at 999 parameters.
+BALANCE_BATCH = 500
+
+# Pages kept on either side of the rows on screen by the virtual grids (virtual_tree.py).
+VIRTUAL_BUFFER_PAGES = 1
+
+# Background loading of view data (loader.py).
+LOADER_WORKERS = 2
+LOADER_POLL_MS = 30
+
+# Search boxes (search.py): quiet time after the last keystroke before a
+# search runs, and the most matches kept for narrowing in memory.
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_REFINE_LIMIT = 2000
+
+# A limited full-text search ranks its matches by bm25 only when there are at
+# most this many; bm25 scores every match, so past this the first matches in
+# id order are returned instead (models/base.py).
+SEARCH_RANK_LIMIT = 2000
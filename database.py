@@ -1,135 +1,794 @@
 import os
+import queue
 import sqlite3
-from constants import DB_FILE, DORM_DEFAULT_CAPACITY
+import datetime
+import pathlib
+import threading
+import time
+import weakref
+from contextlib import contextmanager, nullcontext
+from constants import (
+    DB_FILE,
+    DORM_DEFAULT_CAPACITY,
+    DB_PROFILE,
+    DB_PROFILE_ENV,
+    DB_READER_POOL_SIZE,
+    QUERY_STATS_ENV,
+)
+from query_stats import QueryStats
+from records import record_factory
 
 
-class Database:
-    def __init__(self, db_file=DB_FILE):
-        self.db_file = db_file
-        first_time = not os.path.exists(db_file)
-        self.conn = sqlite3.connect(db_file, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.setup(first_time)
-
-    def _ensure_column(self, table, column, col_def):
-        cur = self.conn.cursor()
-        cur.execute(f"PRAGMA table_info({table})")
-        cols = [r[1] for r in cur.fetchall()]
-        if column not in cols:
-            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_def}")
-            self.conn.commit()
+# Named PRAGMA sets applied to every connection. cache_size is negative, so
+# it is in KiB; mmap_size and busy_timeout are in bytes and milliseconds.
+PROFILES = {
+    # Interactive front-desk use: WAL lets readers run beside the writer and
+    # synchronous=NORMAL only fsyncs at checkpoints, which is durable in WAL.
+    "desktop": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Imports and backfills: no fsyncs at all and a large cache. A power loss
+    # mid-load can lose the most recent transactions, so switch back after.
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    # Reporting machines: big page cache and memory-mapped reads.
+    "read-mostly": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
 
-    def setup(self, first_time=False):
-        c = self.conn.cursor()
+PRAGMA_ORDER = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE,
-            password TEXT
-        );
-        """)
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS units (
-            unit_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            unit_code TEXT,
-            unit_type TEXT,
-            price REAL,
-            status TEXT,
-            capacity INTEGER
-        );
-        """)
+def resolve_profile(name=None):
+    name = name or os.environ.get(DB_PROFILE_ENV) or DB_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile {name!r}; expected one of {', '.join(PROFILES)}")
+    return name
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS tenants (
-            tenant_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            contact TEXT,
-            unit_id INTEGER,
-            tenant_type TEXT,
-            move_in DATE,
-            move_out DATE,
-            status TEXT,
-            guardian_name TEXT,
-            guardian_contact TEXT,
-            guardian_relation TEXT,
-            emergency_contact TEXT,
-            advance_paid REAL DEFAULT 0,
-            deposit_paid REAL DEFAULT 0,
-            move_out_reason TEXT,
-            FOREIGN KEY(unit_id) REFERENCES units(unit_id)
-        );
-        """)
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS payments (
-            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tenant_id INTEGER,
-            rent REAL,
-            electricity REAL,
-            water REAL,
-            total REAL,
-            date_paid DATE,
-            status TEXT,
-            note TEXT,
-            FOREIGN KEY(tenant_id) REFERENCES tenants(tenant_id)
-        );
-        """)
+def _apply_profile(conn, profile, read_only=False):
+    settings = PROFILES[profile]
+    for pragma in PRAGMA_ORDER:
+        # The journal mode is a property of the file, set by the writer.
+        if pragma in settings and not (read_only and pragma == "journal_mode"):
+            conn.execute(f"PRAGMA {pragma}={settings[pragma]}")
+
+
+class ReaderPool:
+    """Read-only connections shared between threads, one thread per
+    connection at a time. At most ``size`` connections are ever opened;
+    further readers wait until one is released."""
+
+    def __init__(self, db_file, profile, size=DB_READER_POOL_SIZE):
+        self._uri = pathlib.Path(db_file).resolve().as_uri() + "?mode=ro"
+        self._profile = profile
+        self._size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._opened = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        conn.row_factory = record_factory
+        _apply_profile(conn, self._profile, read_only=True)
+        with self._lock:
+            self._opened.append(conn)
+        return conn
+
+    def acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        with self._lock:
+            opened, self._opened = self._opened, []
+        for conn in opened:
+            conn.close()
+
+    @contextmanager
+    def drained(self):
+        """Wait for every reader to be returned, close them all and hold the
+        pool empty for the duration of the block. Readers opened afterwards
+        see whatever the file contains by then."""
+        for _ in range(self._size):
+            self._slots.acquire()
+        try:
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+            self.close()
+            yield
+        finally:
+            for _ in range(self._size):
+                self._slots.release()
+
+
+def _create_base_tables(c):
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE,
+        password TEXT
+    );
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS units (
+        unit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        unit_code TEXT,
+        unit_type TEXT,
+        price REAL,
+        status TEXT,
+        capacity INTEGER
+    );
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS tenants (
+        tenant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        contact TEXT,
+        unit_id INTEGER,
+        tenant_type TEXT,
+        move_in DATE,
+        move_out DATE,
+        status TEXT,
+        guardian_name TEXT,
+        guardian_contact TEXT,
+        guardian_relation TEXT,
+        emergency_contact TEXT,
+        advance_paid REAL DEFAULT 0,
+        deposit_paid REAL DEFAULT 0,
+        move_out_reason TEXT,
+        FOREIGN KEY(unit_id) REFERENCES units(unit_id)
+    );
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS payments (
+        payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tenant_id INTEGER,
+        rent REAL,
+        electricity REAL,
+        water REAL,
+        total REAL,
+        date_paid DATE,
+        status TEXT,
+        note TEXT,
+        FOREIGN KEY(tenant_id) REFERENCES tenants(tenant_id)
+    );
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS maintenance (
+        request_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tenant_id INTEGER,
+        description TEXT,
+        priority TEXT,
+        date_requested DATE,
+        status TEXT,
+        fee REAL DEFAULT 0,
+        staff TEXT,
+        date_completed DATE,
+        deleted INTEGER DEFAULT 0,
+        FOREIGN KEY(tenant_id) REFERENCES tenants(tenant_id)
+    );
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS staff (
+        staff_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        contact TEXT,
+        role TEXT,
+        status TEXT
+    );
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS activity_log (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        action TEXT,
+        details TEXT
+    );
+    """)
+
+
+def _ensure_columns(c, table, columns):
+    c.execute(f"PRAGMA table_info({table})")
+    existing = {r[1] for r in c.fetchall()}
+    for column, col_def in columns:
+        if column not in existing:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_def}")
+
+
+def _add_legacy_columns(c):
+    # Databases created before the schema was versioned may be missing
+    # columns that were added to the CREATE TABLE statements over time.
+    _ensure_columns(c, "units", [("capacity", "INTEGER DEFAULT 1")])
+    _ensure_columns(c, "tenants", [
+        ("guardian_name", "TEXT DEFAULT ''"),
+        ("guardian_contact", "TEXT DEFAULT ''"),
+        ("guardian_relation", "TEXT DEFAULT ''"),
+        ("emergency_contact", "TEXT DEFAULT ''"),
+        ("advance_paid", "REAL DEFAULT 0"),
+        ("deposit_paid", "REAL DEFAULT 0"),
+        ("move_out_reason", "TEXT DEFAULT ''"),
+    ])
+    _ensure_columns(c, "payments", [("note", "TEXT DEFAULT ''")])
+    _ensure_columns(c, "maintenance", [
+        ("fee", "REAL DEFAULT 0"),
+        ("staff", "TEXT DEFAULT ''"),
+        ("date_completed", "DATE DEFAULT NULL"),
+        ("deleted", "INTEGER DEFAULT 0"),
+    ])
+    _ensure_columns(c, "staff", [("status", "TEXT DEFAULT 'Active'")])
+
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS maintenance (
-            request_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tenant_id INTEGER,
-            description TEXT,
-            priority TEXT,
-            date_requested DATE,
-            status TEXT,
-            fee REAL DEFAULT 0,
-            staff TEXT,
-            date_completed DATE,
-            deleted INTEGER DEFAULT 0,
-            FOREIGN KEY(tenant_id) REFERENCES tenants(tenant_id)
-        );
+def _add_hot_path_indexes(c):
+    # payments(tenant_id, note): PaymentModel.invoice_exists_with_note
+    c.execute("CREATE INDEX IF NOT EXISTS idx_payments_tenant_note ON payments(tenant_id, note)")
+    # payments(date_paid): the dashboard income range (and the monthly rollup rebuild)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_payments_date_paid ON payments(date_paid)")
+    # maintenance(deleted, date_requested): date-range scans of live requests
+    c.execute("CREATE INDEX IF NOT EXISTS idx_maintenance_deleted_date ON maintenance(deleted, date_requested)")
+    # maintenance(deleted, status): MaintenanceModel.counts
+    c.execute("CREATE INDEX IF NOT EXISTS idx_maintenance_deleted_status ON maintenance(deleted, status)")
+    # tenants(unit_id, status): TenantModel.tenants_in_unit
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tenants_unit_status ON tenants(unit_id, status)")
+
+
+def _add_page_indexes(c):
+    # maintenance(deleted, request_id): MaintenanceModel.page seeks on the key
+    # within the live rows instead of sorting every one of them
+    c.execute("CREATE INDEX IF NOT EXISTS idx_maintenance_deleted_id ON maintenance(deleted, request_id)")
+
+
+# Unit status derived from its active-tenant count: a dorm is Full once the
+# count reaches its capacity, any other unit with a tenant is Occupied.
+UNIT_STATUS_SQL = """CASE
+        WHEN occupant_count <= 0 THEN 'Vacant'
+        WHEN LOWER(unit_type) = 'dorm' AND occupant_count >= capacity THEN 'Full'
+        ELSE 'Occupied'
+    END"""
+
+
+def _recount_occupancy(c):
+    c.execute("""
+    UPDATE units SET occupant_count = (
+        SELECT COUNT(*) FROM tenants t
+        WHERE t.unit_id = units.unit_id AND t.status = 'Active'
+    )
+    """)
+    c.execute(f"UPDATE units SET status = {UNIT_STATUS_SQL}")
+
+
+def _add_occupancy_counters(c):
+    # units.occupant_count counts Active tenants and is kept by the triggers
+    # below; status follows from it, so no code writes units.status by hand.
+    _ensure_columns(c, "units", [("occupant_count", "INTEGER NOT NULL DEFAULT 0")])
+    _recount_occupancy(c)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_tenants_occupancy_insert
+    AFTER INSERT ON tenants WHEN NEW.status = 'Active' AND NEW.unit_id IS NOT NULL
+    BEGIN
+        UPDATE units SET occupant_count = occupant_count + 1 WHERE unit_id = NEW.unit_id;
+    END
+    """)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_tenants_occupancy_delete
+    AFTER DELETE ON tenants WHEN OLD.status = 'Active' AND OLD.unit_id IS NOT NULL
+    BEGIN
+        UPDATE units SET occupant_count = occupant_count - 1 WHERE unit_id = OLD.unit_id;
+    END
+    """)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_tenants_occupancy_update
+    AFTER UPDATE OF status, unit_id ON tenants
+    WHEN (OLD.status = 'Active') != (NEW.status = 'Active') OR OLD.unit_id IS NOT NEW.unit_id
+    BEGIN
+        UPDATE units SET occupant_count = occupant_count - 1
+        WHERE unit_id = OLD.unit_id AND OLD.status = 'Active';
+        UPDATE units SET occupant_count = occupant_count + 1
+        WHERE unit_id = NEW.unit_id AND NEW.status = 'Active';
+    END
+    """)
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_units_status
+    AFTER UPDATE OF occupant_count, capacity, unit_type ON units
+    BEGIN
+        UPDATE units SET status = {UNIT_STATUS_SQL} WHERE unit_id = NEW.unit_id;
+    END
+    """)
+
+
+# Monthly rollups of payments (by date_paid) and live maintenance fees (by
+# date_requested), keyed by the tenant's type. Each trigger adds a signed
+# delta with an upsert, so a write touches one rollup row per side.
+ROLLUPS = {
+    "payments_monthly": {
+        "source": "payments",
+        "date": "date_paid",
+        "amount": "total",
+        "live": "{row}.date_paid IS NOT NULL",
+        "columns": "total, date_paid, tenant_id",
+    },
+    "maintenance_monthly": {
+        "source": "maintenance",
+        "date": "date_requested",
+        "amount": "fee",
+        "live": "{row}.date_requested IS NOT NULL AND COALESCE({row}.deleted, 0) = 0",
+        "columns": "fee, date_requested, deleted, tenant_id",
+    },
+}
+
+
+def _rollup_delta_sql(rollup, spec, row, sign):
+    # Upsert one signed delta for the OLD/NEW row of a source-table trigger.
+    live = spec["live"].format(row=row)
+    return f"""
+        INSERT INTO {rollup} (year, month, tenant_type, total, item_count)
+        SELECT CAST(substr({row}.{spec["date"]}, 1, 4) AS INTEGER),
+               CAST(substr({row}.{spec["date"]}, 6, 2) AS INTEGER),
+               COALESCE((SELECT tenant_type FROM tenants WHERE tenant_id = {row}.tenant_id), ''),
+               {sign}COALESCE({row}.{spec["amount"]}, 0), {sign}1
+        WHERE {live}
+        ON CONFLICT(year, month, tenant_type) DO UPDATE SET
+            total = total + excluded.total,
+            item_count = item_count + excluded.item_count;"""
+
+
+def _rollup_tenant_sql(rollup, spec, row, sign):
+    # Move all of one tenant's rows between tenant_type buckets.
+    live = spec["live"].format(row="s")
+    return f"""
+        INSERT INTO {rollup} (year, month, tenant_type, total, item_count)
+        SELECT CAST(substr(s.{spec["date"]}, 1, 4) AS INTEGER),
+               CAST(substr(s.{spec["date"]}, 6, 2) AS INTEGER),
+               COALESCE({row}.tenant_type, ''),
+               {sign}SUM(COALESCE(s.{spec["amount"]}, 0)), {sign}COUNT(*)
+        FROM {spec["source"]} s
+        WHERE s.tenant_id = {row}.tenant_id AND {live}
+        GROUP BY 1, 2
+        ON CONFLICT(year, month, tenant_type) DO UPDATE SET
+            total = total + excluded.total,
+            item_count = item_count + excluded.item_count;"""
+
+
+def _rebuild_rollups(c):
+    for rollup, spec in ROLLUPS.items():
+        live = spec["live"].format(row="s")
+        c.execute(f"DELETE FROM {rollup}")
+        c.execute(f"""
+        INSERT INTO {rollup} (year, month, tenant_type, total, item_count)
+        SELECT CAST(substr(s.{spec["date"]}, 1, 4) AS INTEGER),
+               CAST(substr(s.{spec["date"]}, 6, 2) AS INTEGER),
+               COALESCE(t.tenant_type, ''),
+               SUM(COALESCE(s.{spec["amount"]}, 0)), COUNT(*)
+        FROM {spec["source"]} s
+        LEFT JOIN tenants t ON t.tenant_id = s.tenant_id
+        WHERE {live}
+        GROUP BY 1, 2, 3
         """)
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS staff (
-            staff_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            contact TEXT,
-            role TEXT,
-            status TEXT
-        );
+
+def _add_monthly_rollups(c):
+    for rollup, spec in ROLLUPS.items():
+        source = spec["source"]
+        c.execute(f"""
+        CREATE TABLE IF NOT EXISTS {rollup} (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            tenant_type TEXT NOT NULL,
+            total REAL NOT NULL DEFAULT 0,
+            item_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (year, month, tenant_type)
+        ) WITHOUT ROWID
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{rollup}_insert AFTER INSERT ON {source}
+        BEGIN{_rollup_delta_sql(rollup, spec, "NEW", "")}
+        END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{rollup}_delete AFTER DELETE ON {source}
+        BEGIN{_rollup_delta_sql(rollup, spec, "OLD", "-")}
+        END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{rollup}_update AFTER UPDATE OF {spec["columns"]} ON {source}
+        BEGIN{_rollup_delta_sql(rollup, spec, "OLD", "-")}{_rollup_delta_sql(rollup, spec, "NEW", "")}
+        END
         """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{rollup}_tenant_type AFTER UPDATE OF tenant_type ON tenants
+        WHEN OLD.tenant_type IS NOT NEW.tenant_type
+        BEGIN{_rollup_tenant_sql(rollup, spec, "OLD", "-")}{_rollup_tenant_sql(rollup, spec, "NEW", "")}
+        END
+        """)
+    _rebuild_rollups(c)
+
+
+# Single-column FTS5 indexes whose rowid is the source table's primary key.
+FTS_TABLES = {
+    "payments_fts": ("payments", "payment_id", "note"),
+    "maintenance_fts": ("maintenance", "request_id", "description"),
+}
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
 
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS activity_log (
-            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            action TEXT,
-            details TEXT
-        );
+def _fts5_available(c):
+    try:
+        c.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        c.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _add_search_indexes(c):
+    # Full-text indexes for the search boxes, kept in step by triggers.
+    # SQLite builds without FTS5 skip this; the models then fall back to LIKE.
+    if not _fts5_available(c):
+        return
+    c.execute(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS tenants_fts
+    USING fts5(name, contact, unit_code, {FTS_OPTIONS})
+    """)
+    c.execute("""
+    INSERT INTO tenants_fts (rowid, name, contact, unit_code)
+    SELECT t.tenant_id, t.name, t.contact, u.unit_code
+    FROM tenants t LEFT JOIN units u ON u.unit_id = t.unit_id
+    """)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_tenants_fts_insert AFTER INSERT ON tenants
+    BEGIN
+        INSERT INTO tenants_fts (rowid, name, contact, unit_code)
+        VALUES (NEW.tenant_id, NEW.name, NEW.contact,
+                (SELECT unit_code FROM units WHERE unit_id = NEW.unit_id));
+    END
+    """)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_tenants_fts_update AFTER UPDATE OF name, contact, unit_id ON tenants
+    BEGIN
+        DELETE FROM tenants_fts WHERE rowid = OLD.tenant_id;
+        INSERT INTO tenants_fts (rowid, name, contact, unit_code)
+        VALUES (NEW.tenant_id, NEW.name, NEW.contact,
+                (SELECT unit_code FROM units WHERE unit_id = NEW.unit_id));
+    END
+    """)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_tenants_fts_delete AFTER DELETE ON tenants
+    BEGIN
+        DELETE FROM tenants_fts WHERE rowid = OLD.tenant_id;
+    END
+    """)
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_units_fts_code AFTER UPDATE OF unit_code ON units
+    BEGIN
+        UPDATE tenants_fts SET unit_code = NEW.unit_code
+        WHERE rowid IN (SELECT tenant_id FROM tenants WHERE unit_id = NEW.unit_id);
+    END
+    """)
+    for fts, (source, key, column) in FTS_TABLES.items():
+        c.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column}, {FTS_OPTIONS})")
+        c.execute(f"INSERT INTO {fts} (rowid, {column}) SELECT {key}, {column} FROM {source}")
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {source}
+        BEGIN
+            INSERT INTO {fts} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+        END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {column} ON {source}
+        BEGIN
+            UPDATE {fts} SET {column} = NEW.{column} WHERE rowid = NEW.{key};
+        END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {source}
+        BEGIN
+            DELETE FROM {fts} WHERE rowid = OLD.{key};
+        END
         """)
 
-        self.conn.commit()
 
-        self._ensure_column("units", "capacity", "INTEGER DEFAULT 1")
-        self._ensure_column("tenants", "guardian_name", "TEXT DEFAULT ''")
-        self._ensure_column("tenants", "guardian_contact", "TEXT DEFAULT ''")
-        self._ensure_column("tenants", "guardian_relation", "TEXT DEFAULT ''")
-        self._ensure_column("tenants", "emergency_contact", "TEXT DEFAULT ''")
-        self._ensure_column("tenants", "advance_paid", "REAL DEFAULT 0")
-        self._ensure_column("tenants", "deposit_paid", "REAL DEFAULT 0")
-        self._ensure_column("tenants", "move_out_reason", "TEXT DEFAULT ''")
-        self._ensure_column("payments", "note", "TEXT DEFAULT ''")
-        self._ensure_column("maintenance", "fee", "REAL DEFAULT 0")
-        self._ensure_column("maintenance", "staff", "TEXT DEFAULT ''")
-        self._ensure_column("maintenance", "date_completed", "DATE DEFAULT NULL")
-        self._ensure_column("maintenance", "deleted", "INTEGER DEFAULT 0")
-        self._ensure_column("staff", "status", "TEXT DEFAULT 'Active'")
+# Payment statuses that count as owed in tenant_balances.
+OUTSTANDING_STATUSES = ("Due", "Overdue")
+_OUTSTANDING_SQL = ", ".join(f"'{s}'" for s in OUTSTANDING_STATUSES)
+
+
+def _balance_delta_sql(row, sign):
+    # Upsert the signed outstanding amount/count of one OLD/NEW payment row.
+    return f"""
+        INSERT INTO tenant_balances (tenant_id, outstanding_due, months_in_arrears)
+        SELECT {row}.tenant_id,
+               {sign}(CASE WHEN {row}.status IN ({_OUTSTANDING_SQL}) THEN COALESCE({row}.total, 0) ELSE 0 END),
+               {sign}(CASE WHEN {row}.status IN ({_OUTSTANDING_SQL}) THEN 1 ELSE 0 END)
+        WHERE {row}.tenant_id IS NOT NULL
+        ON CONFLICT(tenant_id) DO UPDATE SET
+            outstanding_due = outstanding_due + excluded.outstanding_due,
+            months_in_arrears = months_in_arrears + excluded.months_in_arrears;"""
+
 
+def _last_paid_sql(row):
+    # Recompute one tenant's last payment date from its own payment rows.
+    return f"""
+        UPDATE tenant_balances SET last_paid_date = (
+            SELECT MAX(date_paid) FROM payments WHERE tenant_id = {row}.tenant_id AND status = 'Paid'
+        ) WHERE tenant_id = {row}.tenant_id AND {row}.status = 'Paid';"""
+
+
+def _rebuild_balances(c):
+    c.execute("DELETE FROM tenant_balances")
+    c.execute(f"""
+    INSERT INTO tenant_balances (tenant_id, outstanding_due, months_in_arrears, last_paid_date)
+    SELECT tenant_id,
+           SUM(CASE WHEN status IN ({_OUTSTANDING_SQL}) THEN COALESCE(total, 0) ELSE 0 END),
+           SUM(CASE WHEN status IN ({_OUTSTANDING_SQL}) THEN 1 ELSE 0 END),
+           MAX(CASE WHEN status = 'Paid' THEN date_paid END)
+    FROM payments
+    WHERE tenant_id IS NOT NULL
+    GROUP BY tenant_id
+    """)
+
+
+def _add_tenant_balances(c):
+    # One row per tenant with payments: what is owed (Due/Overdue invoices,
+    # one per billed month) and when they last paid. Kept by triggers.
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS tenant_balances (
+        tenant_id INTEGER PRIMARY KEY,
+        outstanding_due REAL NOT NULL DEFAULT 0,
+        months_in_arrears INTEGER NOT NULL DEFAULT 0,
+        last_paid_date DATE
+    )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tenant_balances_arrears ON tenant_balances(months_in_arrears)")
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tenant_balances_insert AFTER INSERT ON payments
+    BEGIN{_balance_delta_sql("NEW", "")}
+        UPDATE tenant_balances SET last_paid_date = NEW.date_paid
+        WHERE tenant_id = NEW.tenant_id AND NEW.status = 'Paid'
+          AND (last_paid_date IS NULL OR NEW.date_paid > last_paid_date);
+    END
+    """)
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tenant_balances_delete AFTER DELETE ON payments
+    BEGIN{_balance_delta_sql("OLD", "-")}{_last_paid_sql("OLD")}
+    END
+    """)
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tenant_balances_update AFTER UPDATE OF total, status, date_paid, tenant_id ON payments
+    BEGIN{_balance_delta_sql("OLD", "-")}{_balance_delta_sql("NEW", "")}{_last_paid_sql("OLD")}{_last_paid_sql("NEW")}
+    END
+    """)
+    _rebuild_balances(c)
+
+
+def _fix_occupancy_update_trigger(c):
+    # The version 5 trigger compared status with = and !=, which give NULL
+    # when either status is NULL, so moving a tenant between NULL and
+    # 'Active' was never counted. Counts are rebuilt for the rows it missed.
+    c.execute("DROP TRIGGER IF EXISTS trg_tenants_occupancy_update")
+    c.execute("""
+    CREATE TRIGGER trg_tenants_occupancy_update
+    AFTER UPDATE OF status, unit_id ON tenants
+    WHEN (OLD.status IS 'Active') IS NOT (NEW.status IS 'Active') OR OLD.unit_id IS NOT NEW.unit_id
+    BEGIN
+        UPDATE units SET occupant_count = occupant_count - 1
+        WHERE unit_id = OLD.unit_id AND OLD.status IS 'Active';
+        UPDATE units SET occupant_count = occupant_count + 1
+        WHERE unit_id = NEW.unit_id AND NEW.status IS 'Active';
+    END
+    """)
+    _recount_occupancy(c)
+
+
+def _drop_note_search_indexes(c):
+    # No view searches payment notes or maintenance descriptions, so their
+    # version 7 indexes only slowed down every write to those tables.
+    for fts in FTS_TABLES:
+        for event in ("insert", "update", "delete"):
+            c.execute(f"DROP TRIGGER IF EXISTS trg_{fts}_{event}")
+        c.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+# Ordered (version, name, apply) registry. Each migration runs exactly once;
+# append new entries with the next version number and never edit old ones.
+MIGRATIONS = [
+    (1, "base tables", _create_base_tables),
+    (2, "legacy columns", _add_legacy_columns),
+    (3, "hot path indexes", _add_hot_path_indexes),
+    (4, "keyset page indexes", _add_page_indexes),
+    (5, "unit occupancy counters", _add_occupancy_counters),
+    (6, "monthly rollups", _add_monthly_rollups),
+    (7, "full-text search", _add_search_indexes),
+    (8, "tenant balances", _add_tenant_balances),
+    (9, "NULL-safe occupancy trigger", _fix_occupancy_update_trigger),
+    (10, "drop note search indexes", _drop_note_search_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def validate_backup(path):
+    """Raise ValueError unless ``path`` is an intact database this version
+    can load. Returns the backup's schema version."""
+    if not os.path.isfile(path):
+        raise ValueError(f"Backup file not found: {path}")
+    uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+    try:
+        conn = sqlite3.connect(uri, uri=True)
+    except sqlite3.Error as e:
+        raise ValueError(f"Cannot open backup: {e}")
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            raise ValueError(f"Backup failed integrity check: {result}")
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        missing = {"users", "units", "tenants", "payments"} - tables
+        if missing:
+            raise ValueError(f"Not an apartment database (missing {', '.join(sorted(missing))})")
+        version = 0
+        if "schema_version" in tables:
+            version = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+        if version > SCHEMA_VERSION:
+            raise ValueError(
+                f"Backup uses schema version {version}, newer than this application ({SCHEMA_VERSION})"
+            )
+        return version
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"Backup is not a valid database: {e}")
+    finally:
+        conn.close()
+
+
+def _weak_callback(callback):
+    # Bound methods are held weakly so a discarded model does not stay registered.
+    if hasattr(callback, "__self__"):
+        return weakref.WeakMethod(callback)
+
+    def ref(fn=callback):
+        return fn
+    return ref
+
+
+def _call_alive(refs):
+    """Call every live callback in ``refs``; return the refs still alive."""
+    alive = []
+    for ref in list(refs):
+        callback = ref()
+        if callback is not None:
+            alive.append(ref)
+            callback()
+    return alive
+
+
+class Database:
+    def __init__(self, db_file=DB_FILE, profile=None):
+        self.db_file = db_file
+        self.profile = resolve_profile(profile)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = record_factory
+        _apply_profile(self.conn, self.profile)
+        self._write_lock = threading.RLock()
+        self._tx_depth = 0
+        self._tx_owner = None
+        self.stats = None
+        self._reset_listeners = []
+        self._change_listeners = {}
+        # Tables written inside the open transaction, announced at commit.
+        self._pending_changes = set()
+        self.setup()
+        self._readers = self._open_readers()
+        if os.environ.get(QUERY_STATS_ENV) == "1":
+            self.enable_instrumentation()
+
+    def _open_readers(self):
+        if self.db_file == ":memory:" or self.db_file.startswith("file:"):
+            return None
+        return ReaderPool(self.db_file, self.profile)
+
+    def schema_version(self):
+        try:
+            row = self.conn.execute("SELECT MAX(version) AS v FROM schema_version").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        return row["v"] or 0
+
+    def migrate(self):
+        current = self.schema_version()
+        pending = [m for m in MIGRATIONS if m[0] > current]
+        if not pending:
+            return 0
+
+        c = self.conn.cursor()
+        try:
+            c.execute("BEGIN")
+            c.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT,
+                applied_at TEXT
+            );
+            """)
+            for version, name, apply in pending:
+                apply(c)
+                c.execute(
+                    "INSERT INTO schema_version (version, name, applied_at) VALUES (?,?,?)",
+                    (version, name, datetime.datetime.now().isoformat(sep=" ", timespec="seconds")),
+                )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(pending)
+
+    def setup(self):
+        self.migrate()
         self.seed_defaults()
+        self._detect_fts()
+
+    def _detect_fts(self):
+        # Models use FTS5 search when the indexes exist. Migration 7 skips
+        # them on SQLite builds without FTS5, so a database migrated by such
+        # a build gets them the first time a build with FTS5 opens it.
+        row = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name='tenants_fts'").fetchone()
+        self.has_fts = row is not None
+        if self.has_fts or not _fts5_available(self.conn):
+            return
+        c = self.conn.cursor()
+        try:
+            c.execute("BEGIN")
+            _add_search_indexes(c)
+            _drop_note_search_indexes(c)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.has_fts = True
 
     def seed_defaults(self):
         c = self.conn.cursor()
@@ -164,16 +823,238 @@ class Database:
 
         self.conn.commit()
 
+    def _commit(self):
+        self.conn.commit()
+
+    def in_transaction(self):
+        """True when the calling thread is inside ``transaction()``."""
+        return self._tx_owner == threading.get_ident()
+
+    @contextmanager
+    def transaction(self):
+        """Group writes so they commit once, or not at all.
+
+        Nested blocks become savepoints: an exception inside an inner block
+        only rolls back that block. Other threads' writes wait until the
+        outermost block finishes.
+        """
+        with self._write_lock:
+            depth = self._tx_depth
+            if depth == 0:
+                self.conn.execute("BEGIN")
+                self._tx_owner = threading.get_ident()
+            else:
+                self.conn.execute(f"SAVEPOINT sp{depth}")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if depth == 0:
+                    self._tx_owner = None
+                    self._pending_changes.clear()
+                    self.conn.rollback()
+                else:
+                    self.conn.execute(f"ROLLBACK TO sp{depth}")
+                    self.conn.execute(f"RELEASE sp{depth}")
+                # Caches may have been refilled with the rolled-back rows.
+                self._notify_reset()
+                raise
+            self._tx_depth -= 1
+            if depth == 0:
+                self._tx_owner = None
+                self._commit()
+                changed, self._pending_changes = self._pending_changes, set()
+                self.notify_changed(*changed)
+            else:
+                self.conn.execute(f"RELEASE sp{depth}")
+
+    def rebuild_rollups(self):
+        """Recompute payments_monthly and maintenance_monthly from scratch.
+
+        Triggers keep the rollups current; this repairs a database whose
+        rows were changed with the triggers missing (for example by an
+        external tool). Returns the number of rollup rows written.
+        """
+        with self.transaction():
+            c = self.conn.cursor()
+            _rebuild_rollups(c)
+            return sum(c.execute(f"SELECT COUNT(*) FROM {rollup}").fetchone()[0] for rollup in ROLLUPS)
+
+    def rebuild_balances(self):
+        """Recompute tenant_balances from the payments table.
+
+        Like ``rebuild_rollups``, this is a repair tool; triggers keep the
+        table current. Returns the number of tenants with a balance row.
+        """
+        with self.transaction():
+            c = self.conn.cursor()
+            _rebuild_balances(c)
+            return c.execute("SELECT COUNT(*) FROM tenant_balances").fetchone()[0]
+
+    def enable_instrumentation(self, **options):
+        """Start timing every query/execute call; see QueryStats for options."""
+        self.stats = QueryStats(**options)
+        return self.stats
+
+    def disable_instrumentation(self):
+        self.stats = None
+
+    def _explain(self, sql, params=()):
+        with self._write_lock:
+            rows = self.conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return [r["detail"] for r in rows]
+
+    def _query(self, sql, params):
+        if self._readers is None or self.in_transaction():
+            with self._write_lock:
+                return self.conn.execute(sql, params).fetchall()
+        with self._readers.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _execute(self, sql, params):
+        with self._write_lock:
+            cur = self.conn.cursor()
+            cur.execute(sql, params)
+            if not self._tx_depth:
+                self._commit()
+            return cur
+
     def query(self, sql, params=()):
-        cur = self.conn.cursor()
-        cur.execute(sql, params)
-        return cur.fetchall()
+        stats = self.stats
+        if stats is None:
+            return self._query(sql, params)
+        start = time.perf_counter()
+        rows = self._query(sql, params)
+        stats.record(sql, params, time.perf_counter() - start, len(rows), self._explain)
+        return rows
+
+    def iter_query(self, sql, params=(), chunk_size=500):
+        """Yield rows ``chunk_size`` at a time via fetchmany instead of
+        materialising the whole result like ``query`` does.
+
+        The connection stays checked out until the generator is exhausted
+        or closed, so consume it promptly.
+        """
+        stats = self.stats
+        tally = [0.0, 0]
+        try:
+            if self._readers is None or self.in_transaction():
+                with self._write_lock:
+                    yield from self._iter_cursor(self.conn, sql, params, chunk_size, tally)
+            else:
+                with self._readers.connection() as conn:
+                    yield from self._iter_cursor(conn, sql, params, chunk_size, tally)
+        finally:
+            # Recorded once the connection is given back, as query() does:
+            # _explain takes the write lock, and restore_from holds that lock
+            # while it waits for every reader to be returned.
+            if stats is not None:
+                stats.record(sql, params, tally[0], tally[1], self._explain)
+
+    def _iter_cursor(self, conn, sql, params, chunk_size, tally):
+        """Yield the rows of ``sql``, adding time spent and rows to ``tally``."""
+        start = time.perf_counter()
+        cur = conn.execute(sql, params)
+        try:
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                tally[0] += time.perf_counter() - start
+                if not rows:
+                    break
+                tally[1] += len(rows)
+                yield from rows
+                start = time.perf_counter()
+        finally:
+            cur.close()
 
     def execute(self, sql, params=()):
-        cur = self.conn.cursor()
-        cur.execute(sql, params)
-        self.conn.commit()
+        stats = self.stats
+        if stats is None:
+            return self._execute(sql, params)
+        start = time.perf_counter()
+        cur = self._execute(sql, params)
+        stats.record(sql, params, time.perf_counter() - start, max(cur.rowcount, 0), self._explain)
         return cur
 
+    def executemany(self, sql, seq_of_params):
+        with self.transaction():
+            return self.conn.executemany(sql, seq_of_params)
+
+    def insert_many(self, sql, seq_of_params):
+        """Run an INSERT for each parameter row in one transaction.
+
+        Returns one entry per row: the rowid it was given, or None when the
+        statement inserted nothing (``INSERT OR IGNORE`` hitting a conflict).
+        Each rowid is read back as its row goes in, so the ids are right
+        even when they are not consecutive.
+        """
+        ids = []
+        with self.transaction():
+            cur = self.conn.cursor()
+            for params in seq_of_params:
+                cur.execute(sql, params)
+                ids.append(cur.lastrowid if cur.rowcount > 0 else None)
+        return ids
+
+    def add_reset_listener(self, callback):
+        """Call ``callback()`` whenever rows may have changed behind a model's
+        back: after ``restore_from`` and after a transaction rolls back.
+        Models use it to drop their caches. Bound methods are held weakly,
+        so a discarded model does not stay registered."""
+        self._reset_listeners.append(_weak_callback(callback))
+
+    def _notify_reset(self):
+        self._reset_listeners = _call_alive(self._reset_listeners)
+
+    def add_change_listener(self, table, callback):
+        """Call ``callback()`` after ``notify_changed(table)``.
+
+        Models announce the tables they write so that other models whose
+        rows depend on those tables (through joins or triggers) can drop
+        their caches. Inside ``transaction()`` the announcement waits for
+        the outermost commit, and each table is announced once. Callbacks
+        are held like reset listeners.
+        """
+        self._change_listeners.setdefault(table, []).append(_weak_callback(callback))
+
+    def notify_changed(self, *tables):
+        if self.in_transaction():
+            # Announcing now would let other threads refill their caches
+            # from rows that do not include this transaction's writes.
+            self._pending_changes.update(tables)
+            return
+        for table in tables:
+            listeners = self._change_listeners.get(table)
+            if listeners:
+                self._change_listeners[table] = _call_alive(listeners)
+
+    def restore_from(self, path, pages=-1, progress=None):
+        """Replace the live database with the backup at ``path`` in place.
+
+        The backup is validated first. Readers are drained and the content is
+        copied into the writer connection with the backup API, so existing
+        Database and model objects keep working. Older backups are migrated
+        to the current schema.
+        """
+        validate_backup(path)
+        uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+        with self._write_lock:
+            if self._tx_depth:
+                raise RuntimeError("Cannot restore inside a transaction")
+            drained = self._readers.drained() if self._readers is not None else nullcontext()
+            with drained:
+                src = sqlite3.connect(uri, uri=True)
+                try:
+                    src.backup(self.conn, pages=pages, progress=progress)
+                finally:
+                    src.close()
+                _apply_profile(self.conn, self.profile)
+                self.migrate()
+                self._detect_fts()
+        self._notify_reset()
+
     def close(self):
+        if self._readers is not None:
+            self._readers.close()
         self.conn.close()
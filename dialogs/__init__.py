@@ -8,6 +8,7 @@ from .receipt import ReceiptDialog
 from .maintenance import MaintenanceDialog
 from .staff import StaffDialog
 from .policy import PolicyDialog
+from .progress import ProgressDialog
 
 __all__ = [
     "LoginDialog",
@@ -21,4 +22,5 @@ __all__ = [
     "MaintenanceDialog",
     "StaffDialog",
     "PolicyDialog",
+    "ProgressDialog",
 ]
@@ -0,0 +1,50 @@
+import customtkinter as ctk
+
+class ProgressDialog(ctk.CTkToplevel):
+    """Progress window for a background job.
+
+    ``job`` needs ``fraction`` (0..1), a ``finished`` event and ``error``;
+    ``on_done(job)`` runs on the Tk thread once the job finishes. With
+    ``modal`` the window grabs input until then, for jobs that block the
+    database (a restore holds the write lock and every reader), where any
+    click that reads or writes would freeze the main loop.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, parent, title, message, job, on_done=None, modal=False):
+        super().__init__(parent)
+        self.job = job
+        self.on_done = on_done
+
+        self.title(title)
+        self.geometry("380x140")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", lambda: None)
+        if modal:
+            self.grab_set()
+
+        frm = ctk.CTkFrame(self, corner_radius=12)
+        frm.pack(fill="both", expand=True, padx=16, pady=16)
+
+        ctk.CTkLabel(frm, text=message, font=ctk.CTkFont(size=13, weight="bold")).pack(anchor="w", padx=10, pady=(6, 8))
+        self.bar = ctk.CTkProgressBar(frm, width=320)
+        self.bar.set(0)
+        self.bar.pack(padx=10, pady=(0, 6))
+        self.pct_lbl = ctk.CTkLabel(frm, text="0%", font=ctk.CTkFont(size=11), text_color="gray80")
+        self.pct_lbl.pack(anchor="e", padx=10)
+
+        self.after(self.POLL_MS, self.poll)
+
+    def poll(self):
+        fraction = self.job.fraction
+        self.bar.set(fraction)
+        self.pct_lbl.configure(text=f"{fraction * 100:.0f}%")
+        if not self.job.finished.is_set():
+            self.after(self.POLL_MS, self.poll)
+            return
+        self.grab_release()
+        self.destroy()
+        if callable(self.on_done):
+            self.on_done(self.job)
@@ -10,11 +10,8 @@ import os
 import tempfile
 
 
-def format_receipt(payment_row: dict) -> str:
-    try:
-        pr = dict(payment_row)
-    except Exception:
-        pr = payment_row
+def format_receipt(payment_row) -> str:
+    pr = payment_row
 
     WIDTH = 60
     sep = "=" * WIDTH
@@ -63,11 +60,7 @@ def format_receipt(payment_row: dict) -> str:
 class ReceiptDialog(ctk.CTkToplevel):
     def __init__(self, parent, payment_row):
         super().__init__(parent)
-        # normalize mapping (accept sqlite3.Row)
-        try:
-            self.payment_row = dict(payment_row)
-        except Exception:
-            self.payment_row = payment_row
+        self.payment_row = payment_row
 
         pid = self.payment_row.get("payment_id") or "N/A"
         self.title(f"Receipt - Payment #{pid}")
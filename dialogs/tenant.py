@@ -13,6 +13,8 @@ class TenantDialog(ctk.CTkToplevel):
         self.tenant = tenant
         self.saved = False
         self.result = {}
+        # unit_id -> active tenants, fetched once on the first unit/type change
+        self._occupants = None
 
         self.title("Tenant")
         self.geometry("650x680")
@@ -190,7 +192,9 @@ class TenantDialog(ctk.CTkToplevel):
             self.deposit_e.insert(0, f"{auto_amount:.2f}")
         
         if unit and unit["unit_type"].lower() == "dorm" and ttype == "dorm":
-            tenants = self.tenant_model.tenants_in_unit(unit["unit_id"])
+            if self._occupants is None:
+                self._occupants = self.tenant_model.occupants_by_unit()
+            tenants = self._occupants.get(unit["unit_id"], [])
             names = []
             for t in tenants:
                 if self.tenant and t["tenant_id"] == self.tenant["tenant_id"]:
@@ -0,0 +1,111 @@
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from constants import LOADER_WORKERS, LOADER_POLL_MS
+
+
+class BackgroundLoader:
+    """Run view queries on worker threads and hand results back to Tk.
+
+    ``submit(key, fetch, on_done)`` runs ``fetch()`` on the executor; a
+    Tk ``after()`` loop polls the futures and calls ``on_done(result)`` on
+    the Tk thread. Each key (one per view or grid) only delivers its newest
+    request: submitting again for the same key cancels the older request
+    if it has not started and drops its result if it has.
+
+    ``fetch`` must not touch widgets or Tk variables; read those first and
+    pass the values in.
+    """
+
+    def __init__(self, widget, workers=LOADER_WORKERS, poll_ms=LOADER_POLL_MS):
+        self._widget = widget
+        self._poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loader")
+        self._latest = {}
+        self._pending = []
+        self._polling = False
+        self.on_busy_changed = None
+
+    def submit(self, key, fetch, on_done, on_error=None):
+        """Start ``fetch`` for ``key`` and return the request's generation."""
+        generation = self._latest.get(key, 0) + 1
+        self._latest[key] = generation
+        for item in self._pending:
+            if item[0] == key:
+                item[2].cancel()
+        future = self._executor.submit(fetch)
+        was_busy = self.busy
+        self._pending.append((key, generation, future, on_done, on_error))
+        if not was_busy:
+            self._busy_changed()
+        if not self._polling:
+            self._polling = True
+            self._widget.after(self._poll_ms, self._poll)
+        return generation
+
+    def cancel(self, key):
+        """Drop whatever is in flight for ``key``."""
+        was_busy = self.busy
+        self._drop(key)
+        if was_busy and not self.busy:
+            self._busy_changed()
+
+    def cancel_all(self):
+        was_busy = self.busy
+        for key in list(self._latest):
+            self._drop(key)
+        if was_busy:
+            self._busy_changed()
+
+    def _drop(self, key):
+        self._latest[key] = self._latest.get(key, 0) + 1
+        for item in self._pending:
+            if item[0] == key:
+                item[2].cancel()
+
+    def is_loading(self, key):
+        generation = self._latest.get(key)
+        return any(item[0] == key and item[1] == generation for item in self._pending)
+
+    @property
+    def busy(self):
+        return any(item[1] == self._latest.get(item[0]) for item in self._pending)
+
+    def _busy_changed(self):
+        if self.on_busy_changed is not None:
+            self.on_busy_changed(self.busy)
+
+    def _poll(self):
+        was_busy = self.busy
+        still_pending = []
+        done = []
+        for item in self._pending:
+            if item[2].done():
+                done.append(item)
+            else:
+                still_pending.append(item)
+        self._pending = still_pending
+        for key, generation, future, on_done, on_error in done:
+            if future.cancelled() or self._latest.get(key) != generation:
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+                else:
+                    traceback.print_exception(type(e), e, e.__traceback__, file=sys.stderr)
+                continue
+            on_done(result)
+        if was_busy != self.busy:
+            self._busy_changed()
+        if self._pending:
+            self._widget.after(self._poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        for item in self._pending:
+            item[2].cancel()
+        self._pending = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
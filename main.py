@@ -1,5 +1,6 @@
 import customtkinter as ctk
 from database import Database
+from backup import BackupScheduler
 from dialogs import LoginDialog, PolicyDialog
 from ui.main_app import MainApp
 from constants import DEFAULT_APPEARANCE, DEFAULT_COLOR_THEME
@@ -24,6 +25,7 @@ def main():
 
     root.destroy()
 
+    scheduler = BackupScheduler(db.db_file).start()
     while True:
         app = MainApp(db)
         app.mainloop()
@@ -38,6 +40,7 @@ def main():
             break
         new_root.destroy()
 
+    scheduler.stop()
     db.close()
 
 
@@ -1,8 +1,13 @@
 import datetime
 from models.base import BaseModel
+from constants import PAGE_SIZE
 
 
 class ActivityLogModel(BaseModel):
+    PAGE_FILTERS = {
+        "action": "action = ?",
+    }
+
     def __init__(self, db):
         super().__init__(db)
 
@@ -16,5 +21,22 @@ class ActivityLogModel(BaseModel):
     def all(self):
         return self.query("SELECT * FROM activity_log ORDER BY log_id DESC")
 
+    def iter_all(self, chunk_size=500):
+        return self._db.iter_query("SELECT * FROM activity_log ORDER BY log_id DESC", chunk_size=chunk_size)
+
+    def page(self, after_id=None, limit=PAGE_SIZE, filters=None, offset=0):
+        """One page of ``all()`` (newest first) after ``after_id``; see ``PAGE_FILTERS``."""
+        return self._keyset_page("SELECT * FROM activity_log", "log_id", after_id, limit, filters, offset=offset)
+
+    def count(self, filters=None):
+        sql = "SELECT COUNT(*) AS c FROM activity_log"
+        clauses, params = self._filter_clauses(filters)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self.query(sql, params)[0]["c"]
+
+    def estimate_count(self):
+        return self._estimate_rows("activity_log", "log_id")
+
     def clear(self):
         self.execute("DELETE FROM activity_log", ())
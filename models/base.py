@@ -1,7 +1,14 @@
+import re
+import unicodedata
 from abc import ABC, abstractmethod
+from constants import PAGE_SIZE, SEARCH_RANK_LIMIT
 
 
 class BaseModel(ABC):
+    # Filters accepted by ``page``/``count``: name -> SQL condition; the
+    # filter's value is bound to every ``?`` in it.
+    PAGE_FILTERS = {}
+
     def __init__(self, db: "Database"):
         self._db = db
 
@@ -11,8 +18,152 @@ class BaseModel(ABC):
     def execute(self, sql, params=()):
         return self._db.execute(sql, params)
 
+    def transaction(self):
+        return self._db.transaction()
+
+    def _filter_clauses(self, filters):
+        clauses, params = [], []
+        for name, value in (filters or {}).items():
+            try:
+                clauses.append(self.PAGE_FILTERS[name])
+            except KeyError:
+                raise ValueError(f"Unknown filter for {type(self).__name__}: {name!r}") from None
+            params.extend([value] * clauses[-1].count("?"))
+        return clauses, params
+
+    def _keyset_page(self, select, key, after_id=None, limit=PAGE_SIZE, filters=None, where=(), offset=0):
+        """Return up to ``limit`` rows of ``select`` with ``key`` below ``after_id``.
+
+        Rows come newest first; pass the last row's key back as ``after_id``
+        for the next page. Seeking on the primary key keeps every page an
+        index range scan, however deep into the history it is. ``offset``
+        skips rows instead, for jumping into the middle of a grid whose
+        previous page is not known; it costs a scan of the skipped rows.
+        """
+        clauses, params = self._filter_clauses(filters)
+        clauses = list(where) + clauses
+        if after_id is not None:
+            clauses.append(f"{key} < ?")
+            params.append(after_id)
+        if clauses:
+            select += " WHERE " + " AND ".join(clauses)
+        sql = f"{select} ORDER BY {key} DESC LIMIT ?"
+        params.append(limit)
+        if offset:
+            sql += " OFFSET ?"
+            params.append(offset)
+        return self.query(sql, params)
+
+    def _text_search(self, select, key, fts, columns, query, where=(), params=(), limit=None, weights=()):
+        """Rows of ``select`` (a SELECT ... FROM ... without WHERE) where every
+        word of ``query`` starts a word in one of the searched columns.
+
+        With FTS5 the ``fts`` index (rowid = ``key``) is matched and rows come
+        best first by bm25, ``weights`` giving per-column boosts. Without it
+        ``columns`` are scanned with LIKE (a substring match) and rows come
+        in ``key`` order.
+
+        A ``limit`` search whose terms match more than ``SEARCH_RANK_LIMIT``
+        rows is not ranked: scoring every match costs far more than reading
+        the first ``limit`` of them, so those come in ``key`` order as well.
+        """
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return []
+        clauses, args = list(where), list(params)
+        if self._db.has_fts:
+            match = " ".join(f'"{term}"*' for term in terms)
+            if limit is not None and self._fts_hits(fts, match, SEARCH_RANK_LIMIT + 1) > SEARCH_RANK_LIMIT:
+                # FTS5 yields matches in rowid order, so no sort is needed.
+                sql = f"{select} JOIN (SELECT rowid AS fts_id FROM {fts} WHERE {fts} MATCH ?) f ON f.fts_id = {key}"
+                order = "f.fts_id"
+            else:
+                rank = ", ".join([fts] + [str(w) for w in weights])
+                sql = (f"{select} JOIN (SELECT rowid AS fts_id, bm25({rank}) AS fts_rank "
+                       f"FROM {fts} WHERE {fts} MATCH ?) f ON f.fts_id = {key}")
+                order = "f.fts_rank"
+            args.insert(0, match)
+        else:
+            sql = select
+            for term in terms:
+                clauses.append("(" + " OR ".join(f"{col} LIKE ?" for col in columns) + ")")
+                args.extend([f"%{term}%"] * len(columns))
+            order = key
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return self.query(sql, args)
+
+    def _fts_hits(self, fts, match, cap):
+        # Counts at most ``cap`` matches, so a common prefix stops early.
+        row = self.query(f"SELECT COUNT(*) AS c FROM (SELECT 1 FROM {fts} WHERE {fts} MATCH ? LIMIT ?)", (match, cap))
+        return row[0]["c"]
+
+    def text_matches(self, texts, query):
+        """Whether a row whose searched columns hold ``texts`` is one that
+        ``_text_search`` returns for ``query``; lets rows already fetched be
+        narrowed without another query."""
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return False
+        if self._db.has_fts:
+            terms = [_fold(term) for term in terms]
+            words = [word for text in texts for word in re.findall(r"[^\W_]+", _fold(str(text or "")))]
+            return all(any(word.startswith(term) for word in words) for term in terms)
+        terms = [term.lower() for term in terms]
+        texts = [str(text or "").lower() for text in texts]
+        return all(any(term in text for text in texts) for term in terms)
+
+    def _estimate_rows(self, table, key):
+        # MIN/MAX on the integer primary key are single b-tree seeks, unlike
+        # COUNT(*) which visits every row; deleted ids make this an upper bound.
+        row = self.query(f"SELECT MIN({key}) AS lo, MAX({key}) AS hi FROM {table}")[0]
+        if row["hi"] is None:
+            return 0
+        return row["hi"] - row["lo"] + 1
+
+
+def _fold(text):
+    # Case and accents folded the way the unicode61 tokenizer folds them.
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
 
 class Reportable(ABC):
+    """Models with a dated amount that reports add up.
+
+    Ranges are half-open (``start`` included, ``end`` excluded) and take
+    ``datetime.date`` objects or ISO date strings.
+    """
+    # monthly_series group_by name -> SQL expression.
+    SERIES_GROUPS = {}
+
     @abstractmethod
     def total_for_month(self, year, month):
         raise NotImplementedError()
+
+    @abstractmethod
+    def total_for_range(self, start, end):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def monthly_series(self, start, end, group_by=None):
+        """Return rows of ``month`` ('YYYY-MM'), the ``group_by`` column if
+        given, and ``total``, ordered by month. Months without rows are
+        left out."""
+        raise NotImplementedError()
+
+    def _series_group(self, group_by):
+        if group_by is None:
+            return None
+        try:
+            return self.SERIES_GROUPS[group_by]
+        except KeyError:
+            raise ValueError(f"Unknown group_by for {type(self).__name__}: {group_by!r}") from None
+
+    @staticmethod
+    def _iso(value):
+        return value.isoformat() if hasattr(value, "isoformat") else str(value)
@@ -1,7 +1,18 @@
 import datetime
 from models.base import BaseModel, Reportable
+from constants import PAGE_SIZE
 
 class MaintenanceModel(BaseModel, Reportable):
+    PAGE_FILTERS = {
+        "tenant_id": "m.tenant_id = ?",
+        "status": "m.status = ? COLLATE NOCASE",
+    }
+    SERIES_GROUPS = {
+        "tenant_type": "COALESCE(t.tenant_type, '')",
+        "priority": "m.priority",
+        "status": "m.status",
+    }
+
     def __init__(self, db):
         super().__init__(db)
 
@@ -12,6 +23,19 @@ class MaintenanceModel(BaseModel, Reportable):
         VALUES (?,?,?,?,?,?,?)
         """, (tenant_id, description, priority, date_req, "Pending", fee, staff))
 
+    def create_many(self, rows):
+        """Insert an iterable of request dicts in one transaction; returns the new ids.
+
+        Each dict takes the ``create`` arguments plus optional ``date_requested``
+        and ``status``.
+        """
+        today = datetime.date.today().isoformat()
+        return self._db.insert_many("""
+        INSERT INTO maintenance (tenant_id, description, priority, date_requested, status, fee, staff)
+        VALUES (?,?,?,?,?,?,?)
+        """, ((r["tenant_id"], r["description"], r["priority"], r.get("date_requested", today),
+               r.get("status", "Pending"), r.get("fee", 0.0), r.get("staff", "")) for r in rows))
+
     def all(self):
         return self.query("""
         SELECT m.*, t.name AS tenant_name
@@ -21,6 +45,30 @@ class MaintenanceModel(BaseModel, Reportable):
         ORDER BY m.request_id DESC
         """)
 
+    def iter_all(self, chunk_size=500):
+        return self._db.iter_query("""
+        SELECT m.*, t.name AS tenant_name
+        FROM maintenance m
+        LEFT JOIN tenants t ON m.tenant_id = t.tenant_id
+        WHERE m.deleted = 0
+        ORDER BY m.request_id DESC
+        """, chunk_size=chunk_size)
+
+    def page(self, after_id=None, limit=PAGE_SIZE, filters=None, offset=0):
+        """One page of ``all()`` (newest first) after ``after_id``; see ``PAGE_FILTERS``."""
+        return self._keyset_page("""
+        SELECT m.*, t.name AS tenant_name
+        FROM maintenance m
+        LEFT JOIN tenants t ON m.tenant_id = t.tenant_id
+        """, "m.request_id", after_id, limit, filters, where=("m.deleted = 0",), offset=offset)
+
+    def count(self, filters=None):
+        clauses, params = self._filter_clauses(filters)
+        return self.query(
+            "SELECT COUNT(*) AS c FROM maintenance m WHERE " + " AND ".join(["m.deleted = 0"] + clauses),
+            params,
+        )[0]["c"]
+
     def all_including_deleted(self):
         return self.query("""
         SELECT m.*, t.name AS tenant_name
@@ -35,21 +83,38 @@ class MaintenanceModel(BaseModel, Reportable):
         return total, pending
 
     def total_fee_for_month(self, year, month):
-        start = datetime.date(year, month, 1)
-        if month == 12:
-            end = datetime.date(year + 1, 1, 1)
-        else:
-            end = datetime.date(year, month + 1, 1)
+        # maintenance_monthly is kept by triggers; see database.ROLLUPS.
         row = self.query("""
-        SELECT SUM(fee) AS s
-        FROM maintenance
-        WHERE date_requested >= ? AND date_requested < ? AND deleted=0
-        """, (start.isoformat(), end.isoformat()))[0]
+        SELECT SUM(total) AS s
+        FROM maintenance_monthly
+        WHERE year=? AND month=?
+        """, (year, month))[0]
         return row["s"] or 0.0
 
     def total_for_month(self, year, month):
         return self.total_fee_for_month(year, month)
 
+    def total_for_range(self, start, end):
+        row = self.query("""
+        SELECT SUM(fee) AS s
+        FROM maintenance
+        WHERE deleted=0 AND date_requested >= ? AND date_requested < ?
+        """, (self._iso(start), self._iso(end)))[0]
+        return row["s"] or 0.0
+
+    def monthly_series(self, start, end, group_by=None):
+        group = self._series_group(group_by)
+        extra = f", {group} AS {group_by}" if group else ""
+        keys = "1, 2" if group else "1"
+        return self.query(f"""
+        SELECT substr(m.date_requested, 1, 7) AS month{extra}, SUM(m.fee) AS total
+        FROM maintenance m
+        LEFT JOIN tenants t ON m.tenant_id = t.tenant_id
+        WHERE m.deleted = 0 AND m.date_requested >= ? AND m.date_requested < ?
+        GROUP BY {keys}
+        ORDER BY {keys}
+        """, (self._iso(start), self._iso(end)))
+
     def get(self, request_id):
         rows = self.query("""
         SELECT m.*, t.name AS tenant_name
@@ -83,3 +148,13 @@ class MaintenanceModel(BaseModel, Reportable):
         SET tenant_id=?, description=?, priority=?, fee=?, staff=?
         WHERE request_id=?
         """, (tenant_id, description, priority, fee, staff, request_id))
+
+    def update_many(self, rows):
+        """Apply an iterable of request dicts (``request_id`` plus the ``update``
+        arguments) in one transaction."""
+        self._db.executemany("""
+        UPDATE maintenance
+        SET tenant_id=?, description=?, priority=?, fee=?, staff=?
+        WHERE request_id=?
+        """, ((r["tenant_id"], r["description"], r["priority"], r.get("fee", 0.0), r.get("staff", ""),
+               r["request_id"]) for r in rows))
@@ -1,7 +1,25 @@
 import datetime
 from models.base import BaseModel, Reportable
+from constants import BALANCE_BATCH, PAGE_SIZE
 
 class PaymentModel(BaseModel, Reportable):
+    PAGE_FILTERS = {
+        "tenant_id": "p.tenant_id = ?",
+        "tenant_type": "t.tenant_type = ? COLLATE NOCASE",
+        "status": "p.status = ?",
+        # date_paid in [date_from, date_to), like the Reportable ranges;
+        # unpaid bills have no date_paid and drop out.
+        "date_from": "p.date_paid >= ?",
+        "date_to": "p.date_paid < ?",
+        # Substring of the tenant's name, the note or the tenant id, any case.
+        "text": "(instr(lower(t.name), lower(?)) > 0 OR instr(lower(p.note), lower(?)) > 0"
+                " OR instr(p.tenant_id, ?) > 0)",
+    }
+    SERIES_GROUPS = {
+        "tenant_type": "COALESCE(t.tenant_type, '')",
+        "status": "p.status",
+    }
+
     def __init__(self, db):
         super().__init__(db)
 
@@ -21,6 +39,27 @@ class PaymentModel(BaseModel, Reportable):
         VALUES (?,?,?,?,?,?,?,?)
         """, (tenant_id, rent, electricity, water, total, None, "Due", note))
 
+    def create_many(self, rows):
+        """Insert an iterable of payment dicts in one transaction; returns the new ids.
+
+        Each dict takes the ``create`` arguments; ``status`` defaults to Paid
+        and an explicit ``date_paid`` may be given when backfilling history.
+        """
+        today = datetime.date.today().isoformat()
+
+        def values():
+            for r in rows:
+                rent, electricity, water = r.get("rent"), r.get("electricity"), r.get("water")
+                status = r.get("status", "Paid")
+                date_paid = r.get("date_paid", today if status == "Paid" else None)
+                total = (rent or 0) + (electricity or 0) + (water or 0)
+                yield (r["tenant_id"], rent, electricity, water, total, date_paid, status, r.get("note", ""))
+
+        return self._db.insert_many("""
+        INSERT INTO payments (tenant_id, rent, electricity, water, total, date_paid, status, note)
+        VALUES (?,?,?,?,?,?,?,?)
+        """, values())
+
     def invoice_exists_with_note(self, tenant_id, note):
         if not note:
             return False
@@ -38,6 +77,62 @@ class PaymentModel(BaseModel, Reportable):
         ORDER BY p.payment_id DESC
         """)
 
+    def iter_all(self, chunk_size=500):
+        return self._db.iter_query("""
+        SELECT p.*, t.name, t.tenant_type
+        FROM payments p
+        LEFT JOIN tenants t ON p.tenant_id = t.tenant_id
+        ORDER BY p.payment_id DESC
+        """, chunk_size=chunk_size)
+
+    def page(self, after_id=None, limit=PAGE_SIZE, filters=None, offset=0):
+        """One page of ``all()`` (newest first) after ``after_id``; see ``PAGE_FILTERS``."""
+        return self._keyset_page("""
+        SELECT p.*, t.name, t.tenant_type
+        FROM payments p
+        LEFT JOIN tenants t ON p.tenant_id = t.tenant_id
+        """, "p.payment_id", after_id, limit, filters, offset=offset)
+
+    def count(self, filters=None):
+        if not filters:
+            return self.query("SELECT COUNT(*) AS c FROM payments")[0]["c"]
+        clauses, params = self._filter_clauses(filters)
+        return self.query("""
+        SELECT COUNT(*) AS c
+        FROM payments p
+        LEFT JOIN tenants t ON p.tenant_id = t.tenant_id
+        WHERE """ + " AND ".join(clauses), params)[0]["c"]
+
+    def estimate_count(self):
+        return self._estimate_rows("payments", "payment_id")
+
+    def balance(self, tenant_id):
+        """Return the tenant's tenant_balances row, or None if they have no payments."""
+        rows = self.query("SELECT * FROM tenant_balances WHERE tenant_id=?", (tenant_id,))
+        return rows[0] if rows else None
+
+    def balances(self, tenant_ids):
+        """Map tenant_id -> tenant_balances row for those of ``tenant_ids`` that
+        have payments; looked up by primary key, BALANCE_BATCH ids a query."""
+        ids = list(tenant_ids)
+        balances = {}
+        for start in range(0, len(ids), BALANCE_BATCH):
+            batch = ids[start:start + BALANCE_BATCH]
+            rows = self.query(
+                "SELECT * FROM tenant_balances WHERE tenant_id IN (%s)" % ",".join("?" * len(batch)), batch)
+            balances.update((r["tenant_id"], r) for r in rows)
+        return balances
+
+    def arrears_summary(self):
+        """Return (tenants in arrears, total outstanding) over active tenants."""
+        row = self.query("""
+        SELECT COUNT(*) AS n, SUM(b.outstanding_due) AS s
+        FROM tenant_balances b
+        JOIN tenants t ON t.tenant_id = b.tenant_id
+        WHERE b.months_in_arrears > 0 AND t.status = 'Active'
+        """)[0]
+        return row["n"], row["s"] or 0.0
+
     def get(self, payment_id):
         rows = self.query("""
         SELECT p.*, t.name, t.tenant_type
@@ -56,15 +151,51 @@ class PaymentModel(BaseModel, Reportable):
         WHERE payment_id=?
         """, (rent, electricity, water, total, date_paid, status, note, payment_id))
 
+    def update_many(self, rows):
+        """Apply an iterable of payment dicts (``payment_id`` plus the ``update``
+        arguments) in one transaction."""
+        today = datetime.date.today().isoformat()
+
+        def values():
+            for r in rows:
+                rent, electricity, water = r.get("rent"), r.get("electricity"), r.get("water")
+                status = r["status"]
+                total = (rent or 0) + (electricity or 0) + (water or 0)
+                date_paid = today if status == "Paid" else None
+                yield (rent, electricity, water, total, date_paid, status, r.get("note", ""), r["payment_id"])
+
+        self._db.executemany("""
+        UPDATE payments
+        SET rent=?, electricity=?, water=?, total=?, date_paid=?, status=?, note=?
+        WHERE payment_id=?
+        """, values())
+
     def total_for_month(self, year, month):
-        start = datetime.date(year, month, 1)
-        if month == 12:
-            end = datetime.date(year + 1, 1, 1)
-        else:
-            end = datetime.date(year, month + 1, 1)
+        # payments_monthly is kept by triggers; see database.ROLLUPS.
+        row = self.query("""
+        SELECT SUM(total) AS s
+        FROM payments_monthly
+        WHERE year=? AND month=?
+        """, (year, month))[0]
+        return row["s"] or 0.0
+
+    def total_for_range(self, start, end):
         row = self.query("""
         SELECT SUM(total) AS s
         FROM payments
         WHERE date_paid >= ? AND date_paid < ?
-        """, (start.isoformat(), end.isoformat()))[0]
+        """, (self._iso(start), self._iso(end)))[0]
         return row["s"] or 0.0
+
+    def monthly_series(self, start, end, group_by=None):
+        group = self._series_group(group_by)
+        extra = f", {group} AS {group_by}" if group else ""
+        keys = "1, 2" if group else "1"
+        return self.query(f"""
+        SELECT substr(p.date_paid, 1, 7) AS month{extra}, SUM(p.total) AS total
+        FROM payments p
+        LEFT JOIN tenants t ON p.tenant_id = t.tenant_id
+        WHERE p.date_paid >= ? AND p.date_paid < ?
+        GROUP BY {keys}
+        ORDER BY {keys}
+        """, (self._iso(start), self._iso(end)))
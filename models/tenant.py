@@ -1,9 +1,46 @@
+import threading
+from collections import OrderedDict
 from models.base import BaseModel
+from constants import PAGE_SIZE, TENANT_CACHE_SIZE
 
 
 class TenantModel(BaseModel):
-    def __init__(self, db):
+    PAGE_FILTERS = {
+        "status": "t.status = ?",
+        # Substring of the name, contact or unit code, any case, or the tenant id.
+        "text": "(instr(lower(t.name), lower(?)) > 0 OR instr(lower(t.contact), lower(?)) > 0"
+                " OR instr(lower(u.unit_code), lower(?)) > 0 OR t.tenant_id = ?)",
+    }
+    FIELDS = [
+        "name", "contact", "unit_id", "tenant_type",
+        "move_in", "move_out", "status",
+        "guardian_name", "guardian_contact", "guardian_relation",
+        "emergency_contact", "advance_paid", "deposit_paid", "move_out_reason"
+    ]
+
+    def __init__(self, db, cache_size=TENANT_CACHE_SIZE):
         super().__init__(db)
+        # Identity map: tenant_id -> joined tenant row, least recently used first.
+        self._identity = OrderedDict()
+        self._cache_size = cache_size
+        # Bumped by every invalidate and update, so a get() whose read raced
+        # one of them knows its row may be stale.
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        db.add_reset_listener(self.invalidate)
+
+    def invalidate(self, tenant_id=None):
+        with self._lock:
+            self._generation += 1
+            if tenant_id is None:
+                self._identity.clear()
+            else:
+                self._identity.pop(tenant_id, None)
+
+    def cache_stats(self):
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "size": len(self._identity)}
 
     def all(self):
         return self.query("""
@@ -13,6 +50,32 @@ class TenantModel(BaseModel):
         ORDER BY t.tenant_id
         """)
 
+    def iter_all(self, chunk_size=500):
+        return self._db.iter_query("""
+        SELECT t.*, u.unit_code, u.unit_type, u.price AS room_price
+        FROM tenants t
+        LEFT JOIN units u ON t.unit_id = u.unit_id
+        ORDER BY t.tenant_id
+        """, chunk_size=chunk_size)
+
+    def page(self, after_id=None, limit=PAGE_SIZE, filters=None, offset=0):
+        """One page of tenants (newest first) after ``after_id``; see ``PAGE_FILTERS``."""
+        return self._keyset_page("""
+        SELECT t.*, u.unit_code, u.unit_type, u.price AS room_price
+        FROM tenants t
+        LEFT JOIN units u ON t.unit_id = u.unit_id
+        """, "t.tenant_id", after_id, limit, filters, offset=offset)
+
+    def count(self, filters=None):
+        if not filters:
+            return self.query("SELECT COUNT(*) AS c FROM tenants")[0]["c"]
+        clauses, params = self._filter_clauses(filters)
+        return self.query("""
+        SELECT COUNT(*) AS c
+        FROM tenants t
+        LEFT JOIN units u ON t.unit_id = u.unit_id
+        WHERE """ + " AND ".join(clauses), params)[0]["c"]
+
     def active(self):
         return self.query("""
         SELECT t.*, u.unit_code, u.unit_type, u.price AS room_price
@@ -38,26 +101,77 @@ class TenantModel(BaseModel):
         ORDER BY name
         """, (unit_id,))
 
+    def occupants_by_unit(self):
+        """Map unit_id -> active tenants in that unit (ordered by name), in one query.
+
+        Units without active tenants are absent from the map.
+        """
+        occupants = {}
+        for row in self.query("""
+        SELECT * FROM tenants
+        WHERE status='Active' AND unit_id IS NOT NULL
+        ORDER BY unit_id, name
+        """):
+            occupants.setdefault(row["unit_id"], []).append(row)
+        return occupants
+
+    def occupant_counts(self):
+        """Map unit_id -> number of active tenants, in one GROUP BY query."""
+        rows = self.query("""
+        SELECT COUNT(*) AS c, unit_id FROM tenants
+        WHERE status='Active' AND unit_id IS NOT NULL
+        GROUP BY unit_id
+        """)
+        return {r["unit_id"]: r["c"] for r in rows}
+
     def get(self, tenant_id):
+        """Return the joined tenant row, the same object each time until it
+        is evicted; ``update`` changes it in place."""
+        with self._lock:
+            row = self._identity.get(tenant_id)
+            if row is not None:
+                self._identity.move_to_end(tenant_id)
+                self.cache_hits += 1
+                return row
+            self.cache_misses += 1
+            generation = self._generation
         rows = self.query("""
         SELECT t.*, u.unit_code, u.unit_type, u.price AS room_price
         FROM tenants t
         LEFT JOIN units u ON t.unit_id = u.unit_id
         WHERE t.tenant_id=?
         """, (tenant_id,))
-        return rows[0] if rows else None
+        if not rows:
+            return None
+        row = rows[0]
+        with self._lock:
+            if self._generation != generation:
+                # Served to this caller only; the next get() reads it again.
+                return self._identity.get(tenant_id, row)
+            row = self._identity.setdefault(tenant_id, row)
+            while len(self._identity) > self._cache_size:
+                self._identity.popitem(last=False)
+        return row
+
+    def _insert_sql(self):
+        cols = ",".join(self.FIELDS)
+        placeholders = ",".join(["?"] * len(self.FIELDS))
+        return f"INSERT INTO tenants ({cols}) VALUES ({placeholders})"
 
     def create(self, **data):
-        fields = [
-            "name", "contact", "unit_id", "tenant_type",
-            "move_in", "move_out", "status",
-            "guardian_name", "guardian_contact", "guardian_relation",
-            "emergency_contact", "advance_paid", "deposit_paid", "move_out_reason"
-        ]
-        cols = ",".join(fields)
-        placeholders = ",".join(["?"] * len(fields))
-        values = [data.get(f) for f in fields]
-        self.execute(f"INSERT INTO tenants ({cols}) VALUES ({placeholders})", values)
+        values = [data.get(f) for f in self.FIELDS]
+        cur = self.execute(self._insert_sql(), values)
+        self._db.notify_changed("tenants")
+        return cur.lastrowid
+
+    def create_many(self, rows):
+        """Insert an iterable of tenant dicts in one transaction; returns the new ids."""
+        ids = self._db.insert_many(
+            self._insert_sql(),
+            ([data.get(f) for f in self.FIELDS] for data in rows),
+        )
+        self._db.notify_changed("tenants")
+        return ids
 
     def update(self, tenant_id, **data):
         if not data:
@@ -65,6 +179,44 @@ class TenantModel(BaseModel):
         fields = ", ".join([f"{k}=?" for k in data.keys()])
         values = list(data.values()) + [tenant_id]
         self.execute(f"UPDATE tenants SET {fields} WHERE tenant_id=?", values)
+        self._refresh(tenant_id, data)
+        self._db.notify_changed("tenants")
+
+    def _refresh(self, tenant_id, data):
+        with self._lock:
+            self._generation += 1
+            if tenant_id not in self._identity:
+                return
+        data = dict(data)
+        if "unit_id" in data:
+            units = self.query(
+                "SELECT unit_code, unit_type, price AS room_price FROM units WHERE unit_id=?",
+                (data["unit_id"],),
+            )
+            data.update(units[0] if units else {"unit_code": None, "unit_type": None, "room_price": None})
+        with self._lock:
+            self._generation += 1
+            row = self._identity.get(tenant_id)
+            if row is not None:
+                row.update(data)
+
+    def update_many(self, updates):
+        """Apply an iterable of (tenant_id, data) pairs in one transaction.
+
+        Rows that change the same set of columns share one executemany call.
+        """
+        batches = {}
+        for tenant_id, data in updates:
+            if data:
+                keys = tuple(data.keys())
+                batches.setdefault(keys, []).append([data[k] for k in keys] + [tenant_id])
+        with self.transaction():
+            for keys, values in batches.items():
+                fields = ", ".join([f"{k}=?" for k in keys])
+                self._db.executemany(f"UPDATE tenants SET {fields} WHERE tenant_id=?", values)
+                for value_row in values:
+                    self.invalidate(value_row[-1])
+        self._db.notify_changed("tenants")
 
     def terminate(self, tenant_id, move_out_date, reason):
         self.update(tenant_id, status="Terminated", move_out=move_out_date, move_out_reason=reason)
@@ -72,18 +224,22 @@ class TenantModel(BaseModel):
     def restore(self, tenant_id):
         self.update(tenant_id, status="Active", move_out=None, move_out_reason="")
 
-    def search_active(self, query):
-        like = f"%{query}%"
-        return self.query("""
+    def search(self, query, status="Active", limit=None):
+        """Tenants matching ``query`` by name, contact or unit code prefix, best
+        match first; a numeric query also finds that tenant_id."""
+        where, params = ([], []) if status is None else (["t.status = ?"], [status])
+        rows = self._text_search("""
         SELECT t.*, u.unit_code, u.unit_type, u.price AS room_price
         FROM tenants t
         LEFT JOIN units u ON t.unit_id = u.unit_id
-        WHERE t.status='Active'
-          AND (
-              t.name LIKE ?
-              OR t.contact LIKE ?
-              OR u.unit_code LIKE ?
-              OR CAST(t.tenant_id AS TEXT) LIKE ?
-          )
-        ORDER BY t.tenant_id
-        """, (like, like, like, like))
+        """, "t.tenant_id", "tenants_fts", ("t.name", "t.contact", "u.unit_code"), query,
+            where, params, limit, weights=(10.0, 2.0, 5.0))
+        query = (query or "").strip()
+        if query.isdigit():
+            by_id = self.get(int(query))
+            if by_id is not None and (status is None or by_id["status"] == status):
+                rows = [by_id] + [r for r in rows if r["tenant_id"] != by_id["tenant_id"]]
+        return rows
+
+    def search_active(self, query):
+        return self.search(query)
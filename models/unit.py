@@ -1,27 +1,114 @@
+import threading
 from models.base import BaseModel
 
 
+def _contains(text, value):
+    # instr(lower(text), lower(value)) > 0, where a NULL text never matches.
+    return text is not None and str(value).lower() in text.lower()
+
+
 class UnitModel(BaseModel):
+    """Units are few and read on nearly every screen, so they are served
+    from an in-memory copy that is loaded on first use and dropped by
+    every write made through this model (and by restores/rollbacks).
+
+    ``occupant_count`` and ``status`` are maintained by triggers on the
+    tenants table, so the copy is also dropped when tenants change."""
+
+    STATUSES = ("Vacant", "Occupied", "Full")
+    PAGE_FILTERS = {
+        "status": "status = ?",
+        "unit_type": "unit_type = ? COLLATE NOCASE",
+        # Substring of the unit code or type, any case.
+        "text": "(instr(lower(unit_code), lower(?)) > 0 OR instr(lower(unit_type), lower(?)) > 0)",
+    }
+    # The same filters over a row of the in-memory copy.
+    ROW_FILTERS = {
+        "status": lambda u, value: u["status"] == value,
+        "unit_type": lambda u, value: u["unit_type"] is not None and u["unit_type"].lower() == str(value).lower(),
+        "text": lambda u, value: _contains(u["unit_code"], value) or _contains(u["unit_type"], value),
+    }
+
     def __init__(self, db):
         super().__init__(db)
+        self._cache = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        db.add_reset_listener(self.invalidate)
+        db.add_change_listener("tenants", self.invalidate)
+
+    def _cached(self):
+        """Return ``(rows, rows_by_id)``, loading them on a miss."""
+        if self._db.in_transaction():
+            # Tenant writes in an open transaction are announced only when
+            # it commits, so the copy may not reflect them yet.
+            rows = self.query("SELECT * FROM units ORDER BY unit_type, unit_code")
+            return rows, {r["unit_id"]: r for r in rows}
+        with self._lock:
+            if self._cache is not None:
+                self.cache_hits += 1
+                return self._cache
+            self.cache_misses += 1
+            generation = self._generation
+        rows = self.query("SELECT * FROM units ORDER BY unit_type, unit_code")
+        cache = (rows, {r["unit_id"]: r for r in rows})
+        with self._lock:
+            # A write invalidated the copy while this read ran, so the rows
+            # may predate it: serve them to this caller but do not keep them.
+            if self._generation == generation:
+                self._cache = cache
+        return cache
+
+    def invalidate(self):
+        with self._lock:
+            self._cache = None
+            self._generation += 1
+
+    def cache_stats(self):
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
 
     def all(self):
-        return self.query("SELECT * FROM units ORDER BY unit_type, unit_code")
+        return list(self._cached()[0])
 
     def filter_by_status(self, status=None):
-        if status == "Vacant":
-            return self.query("SELECT * FROM units WHERE status='Vacant' ORDER BY unit_type, unit_code")
-        elif status == "Occupied":
-            return self.query("SELECT * FROM units WHERE status='Occupied' ORDER BY unit_type, unit_code")
+        if status in self.STATUSES:
+            return [u for u in self._cached()[0] if u["status"] == status]
         else:
             return self.all()
 
-    def get(self, unit_id):
-        rows = self.query("SELECT * FROM units WHERE unit_id=?", (unit_id,))
-        return rows[0] if rows else None
+    def find(self, filters=None):
+        """Units matching ``filters`` (see ``PAGE_FILTERS``), in ``all()`` order.
+
+        Answered from the in-memory copy when it is loaded; otherwise the
+        filter runs in SQL, so a cold copy is not loaded only to be narrowed.
+        """
+        if not filters:
+            return self.all()
+        clauses, params = self._filter_clauses(filters)
+        with self._lock:
+            cache = None if self._db.in_transaction() else self._cache
+            if cache is not None:
+                self.cache_hits += 1
+        if cache is not None:
+            return [u for u in cache[0]
+                    if all(self.ROW_FILTERS[name](u, value) for name, value in filters.items())]
+        return self.query(
+            "SELECT * FROM units WHERE " + " AND ".join(clauses) + " ORDER BY unit_type, unit_code",
+            params,
+        )
+
+    def status_counts(self):
+        """Map each status in ``STATUSES`` to its number of units."""
+        counts = dict.fromkeys(self.STATUSES, 0)
+        for u in self._cached()[0]:
+            counts[u["status"]] = counts.get(u["status"], 0) + 1
+        return counts
 
-    def update_status(self, unit_id, status):
-        self.execute("UPDATE units SET status=? WHERE unit_id=?", (status, unit_id))
+    def get(self, unit_id):
+        return self._cached()[1].get(unit_id)
 
     def update_capacity(self, unit_id, capacity):
         self.execute("UPDATE units SET capacity=? WHERE unit_id=?", (capacity, unit_id))
+        self.invalidate()
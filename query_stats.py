@@ -0,0 +1,126 @@
+import re
+import json
+import random
+import datetime
+import threading
+from functools import lru_cache
+from constants import SLOW_QUERY_MS, SLOW_QUERY_LOG
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """Collapse whitespace and literals so the same statement always maps
+    to the same key, whatever its parameters or formatting."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def _percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    k = min(len(sorted_samples) - 1, int(round(pct / 100.0 * (len(sorted_samples) - 1))))
+    return sorted_samples[k]
+
+
+class _Entry:
+    __slots__ = ("count", "total", "max", "rows", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = []
+
+
+class QueryStats:
+    """Per-statement timing histograms plus a slow-query log.
+
+    Latencies are kept in a fixed-size reservoir per statement, so memory
+    stays bounded however long the application runs.
+    """
+
+    def __init__(self, slow_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG, sample_size=1024):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.sample_size = sample_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql, params, elapsed, rows, explain=None):
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            entry.count += 1
+            entry.total += elapsed
+            entry.rows += rows
+            if elapsed > entry.max:
+                entry.max = elapsed
+            if len(entry.samples) < self.sample_size:
+                entry.samples.append(elapsed)
+            else:
+                slot = random.randrange(entry.count)
+                if slot < self.sample_size:
+                    entry.samples[slot] = elapsed
+        if self.log_path and elapsed * 1000 >= self.slow_ms:
+            self._log_slow(sql, params, elapsed, explain)
+
+    def _log_slow(self, sql, params, elapsed, explain):
+        plan = []
+        if explain is not None:
+            try:
+                plan = explain(sql, params)
+            except Exception as e:
+                plan = [f"(plan unavailable: {e})"]
+        ts = datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+        lines = [f"[{ts}] {elapsed * 1000:.1f} ms  {normalize_sql(sql)}", f"  params: {params!r}"]
+        lines += [f"  plan: {p}" for p in plan]
+        with self._lock:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def snapshot(self):
+        """Stats per normalized statement, slowest total time first. Times are in ms."""
+        with self._lock:
+            items = [(k, e.count, e.total, e.max, e.rows, sorted(e.samples)) for k, e in self._entries.items()]
+        result = []
+        for sql, count, total, longest, rows, samples in items:
+            result.append({
+                "sql": sql,
+                "count": count,
+                "total_ms": total * 1000,
+                "mean_ms": total / count * 1000,
+                "p50_ms": _percentile(samples, 50) * 1000,
+                "p95_ms": _percentile(samples, 95) * 1000,
+                "p99_ms": _percentile(samples, 99) * 1000,
+                "max_ms": longest * 1000,
+                "rows": rows,
+            })
+        result.sort(key=lambda r: r["total_ms"], reverse=True)
+        return result
+
+    def report(self, limit=20):
+        lines = [f"{'count':>7} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'rows':>9}  sql"]
+        for r in self.snapshot()[:limit]:
+            lines.append(
+                f"{r['count']:>7} {r['total_ms']:>10.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                f"{r['p99_ms']:>8.2f} {r['rows']:>9}  {r['sql'][:120]}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,181 @@
+import keyword
+import threading
+
+
+class Record:
+    """A database row stored in ``__slots__``.
+
+    Supports attribute access (``row.name``) as well as the mapping and
+    index access that ``sqlite3.Row`` offered (``row["name"]``, ``row[0]``,
+    ``row.get("name")``, ``row.keys()``, ``dict(row)``). Rows are mutable
+    so caches can update them in place.
+
+    A concrete class is generated for every distinct column list; see
+    ``record_class``.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _slot_of = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return getattr(self, self.__slots__[key])
+        try:
+            slot = self._slot_of[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return getattr(self, slot)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, int):
+            setattr(self, self.__slots__[key], value)
+            return
+        try:
+            slot = self._slot_of[key]
+        except KeyError:
+            raise KeyError(key) from None
+        setattr(self, slot, value)
+
+    def get(self, key, default=None):
+        slot = self._slot_of.get(key)
+        return default if slot is None else getattr(self, slot)
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return [getattr(self, s) for s in self.__slots__]
+
+    def items(self):
+        return list(zip(self._fields, self.values()))
+
+    def update(self, data):
+        for key, value in data.items():
+            self[key] = value
+
+    def __contains__(self, key):
+        return key in self._slot_of
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return self._fields == other._fields and self.values() == other.values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        body = ", ".join(f"{k}={v!r}" for k, v in self.items())
+        return f"{type(self).__name__}({body})"
+
+
+class Unit(Record):
+    __slots__ = ()
+
+
+class Tenant(Record):
+    __slots__ = ()
+
+
+class Payment(Record):
+    __slots__ = ()
+
+
+class MaintenanceRequest(Record):
+    __slots__ = ()
+
+
+class Staff(Record):
+    __slots__ = ()
+
+
+class LogEntry(Record):
+    __slots__ = ()
+
+
+# Record type by first column, with columns of that table the row must also
+# have. Model queries start with their table's primary key (``SELECT t.*,
+# ...``); other tables keyed by one of these ids, such as tenant_balances
+# (which starts with tenant_id), lack the other columns and stay plain
+# ``Record``s.
+RECORD_TYPES = {
+    "unit_id": (Unit, ("unit_code", "unit_type", "capacity")),
+    "tenant_id": (Tenant, ("name", "tenant_type", "move_in")),
+    "payment_id": (Payment, ("tenant_id", "rent", "total")),
+    "request_id": (MaintenanceRequest, ("description", "priority", "date_requested")),
+    "staff_id": (Staff, ("name", "role")),
+    "log_id": (LogEntry, ("timestamp", "action")),
+}
+
+_RESERVED = set(dir(Record)) | {"self"}
+_classes = {}
+_classes_lock = threading.Lock()
+
+
+def _slot_names(columns):
+    slots = []
+    for i, col in enumerate(columns):
+        name = col
+        if (not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_")
+                or name in _RESERVED or name in slots):
+            name = f"_c{i}"
+        slots.append(name)
+    return slots
+
+
+def _record_type(columns):
+    if not columns or columns[0] not in RECORD_TYPES:
+        return Record
+    cls, required = RECORD_TYPES[columns[0]]
+    return cls if set(required) <= set(columns) else Record
+
+
+def record_class(columns):
+    """Return the (cached) Record subclass for a tuple of column names."""
+    cls = _classes.get(columns)
+    if cls is not None:
+        return cls
+    with _classes_lock:
+        cls = _classes.get(columns)
+        if cls is None:
+            cls = _classes[columns] = _make_class(columns)
+    return cls
+
+
+def _make_class(columns):
+    base = _record_type(columns)
+    slots = _slot_names(columns)
+    slot_of = {}
+    for col, slot in zip(columns, slots):
+        slot_of.setdefault(col, slot)
+    args = ", ".join(slots)
+    body = "".join(f"\n    self.{s} = {s}" for s in slots) or "\n    pass"
+    namespace = {}
+    exec(f"def __init__(self, {args}):{body}" if slots else f"def __init__(self):{body}", namespace)
+    cls = type(base.__name__, (base,), {
+        "__slots__": tuple(slots),
+        "__init__": namespace["__init__"],
+        "_fields": tuple(columns),
+        "_slot_of": slot_of,
+    })
+    return cls
+
+
+# The class of the last result set each thread read, keyed by the cursor's
+# description object, which sqlite3 reuses for every row of a result.
+_last = threading.local()
+
+
+def record_factory(cursor, row):
+    """sqlite3 row_factory that builds Record instances."""
+    description = cursor.description
+    if getattr(_last, "description", None) is not description:
+        _last.cls = record_class(tuple(d[0] for d in description))
+        _last.description = description
+    return _last.cls(*row)
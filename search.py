@@ -0,0 +1,85 @@
+from constants import SEARCH_DEBOUNCE_MS, SEARCH_REFINE_LIMIT
+
+
+def _extends(previous, query):
+    return query.startswith(previous)
+
+
+class SearchController:
+    """Search-as-you-type for one search box.
+
+    Writes to ``variable`` are debounced: the search runs ``delay_ms``
+    after the last keystroke. A query is then answered in one of two ways:
+
+    * if it extends the last answered query (``refines(previous, query)``)
+      and that answer held at most ``refine_limit`` rows, those rows are
+      narrowed in memory with ``matches(row, query)``;
+    * otherwise ``fetch_for(query)`` is called on the Tk thread, so it can
+      read any other filter widgets, and the function it returns runs on
+      ``loader``. That function may return None for "too many rows to hold";
+      the caller then keeps the filter in SQL and the next keystroke queries
+      again.
+
+    ``show(query, rows)`` gets every answer on the Tk thread.
+    """
+
+    def __init__(self, widget, loader, variable, fetch_for, show, matches,
+                 refines=_extends, delay_ms=SEARCH_DEBOUNCE_MS, refine_limit=SEARCH_REFINE_LIMIT):
+        self._widget = widget
+        self._loader = loader
+        self._variable = variable
+        self._fetch_for = fetch_for
+        self._show = show
+        self._matches = matches
+        self._refines = refines
+        self._delay_ms = delay_ms
+        self._refine_limit = refine_limit
+        self._key = f"search-{id(self)}"
+        self._after = None
+        self._query = None
+        self._rows = None
+        self._trace = variable.trace_add("write", self._changed)
+
+    def query(self):
+        return self._variable.get().strip()
+
+    def search(self, query):
+        """Answer ``query`` now, from the held rows when it refines them."""
+        self._cancel_pending()
+        if self._rows is not None and self._refines(self._query, query):
+            self._loader.cancel(self._key)
+            self._answered(query, [row for row in self._rows if self._matches(row, query)])
+            return
+        self._loader.submit(self._key, self._fetch_for(query), lambda rows: self._answered(query, rows))
+
+    def refresh(self):
+        """Fetch the current query again, dropping the held rows; for when
+        the data or another filter changed."""
+        self._query = self._rows = None
+        self.search(self.query())
+
+    def close(self):
+        self._cancel_pending()
+        self._loader.cancel(self._key)
+        self._variable.trace_remove("write", self._trace)
+
+    def _changed(self, *_args):
+        self._cancel_pending()
+        self._after = self._widget.after(self._delay_ms, self._fire)
+
+    def _fire(self):
+        self._after = None
+        if self._widget.winfo_exists():
+            self.search(self.query())
+
+    def _cancel_pending(self):
+        if self._after is not None:
+            self._widget.after_cancel(self._after)
+            self._after = None
+
+    def _answered(self, query, rows):
+        if rows is not None and len(rows) <= self._refine_limit:
+            self._query, self._rows = query, rows
+        else:
+            self._query, self._rows = None, None
+        self._show(query, rows)
@@ -0,0 +1,25 @@
+from models import ActivityLogModel
+
+
+def test_pages_cover_history_once(db):
+    model = ActivityLogModel(db)
+    for i in range(25):
+        model.log("bench", str(i))
+    seen, after = [], None
+    while True:
+        rows = model.page(after_id=after, limit=10)
+        seen.extend(r["log_id"] for r in rows)
+        if len(rows) < 10:
+            break
+        after = rows[-1]["log_id"]
+    assert seen == [r["log_id"] for r in model.all()]
+    assert model.estimate_count() == 25
+
+
+def test_count_applies_filters(db):
+    model = ActivityLogModel(db)
+    for action in ("login", "payment", "login"):
+        model.log(action)
+    assert model.count() == 3
+    assert model.count({"action": "login"}) == 2
+    assert model.count({"action": "logout"}) == 0
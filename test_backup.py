@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import threading
+import time
+
+from backup import BackupJob, BackupScheduler
+from models import ActivityLogModel
+
+
+def test_backup_is_a_snapshot_while_writes_continue(db, tmp_path):
+    logs = ActivityLogModel(db)
+    with db.transaction():
+        for i in range(2000):
+            logs.log("seed", "x" * 200)
+    stop = threading.Event()
+    commits = []
+
+    def write_pairs():
+        # Every commit adds two rows, so any consistent copy holds an even count.
+        while not stop.is_set():
+            with db.transaction():
+                logs.log("pair", "a")
+                logs.log("pair", "b")
+            commits.append(1)
+
+    writer = threading.Thread(target=write_pairs, daemon=True)
+    writer.start()
+    while not commits:
+        time.sleep(0.001)
+    dest = str(tmp_path / "copy.db")
+    try:
+        started = len(commits)
+        job = BackupJob(db.db_file, dest, pages=4).start()
+        assert job.wait(30), job.error
+        assert len(commits) > started, "no writes landed during the copy"
+    finally:
+        stop.set()
+        writer.join(5)
+    copy = sqlite3.connect(dest)
+    try:
+        assert copy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert copy.execute("SELECT COUNT(*) FROM activity_log").fetchone()[0] % 2 == 0
+    finally:
+        copy.close()
+    assert not os.path.exists(dest + ".part")
+
+
+def test_failed_backup_leaves_no_part_file(db, tmp_path):
+    dest = tmp_path / "taken"
+    dest.mkdir()
+    job = BackupJob(db.db_file, str(dest)).start()
+    assert not job.wait(30)
+    assert isinstance(job.error, OSError)
+    assert not os.path.exists(str(dest) + ".part")
+
+
+def test_prune_keeps_the_newest_and_ignores_other_files(tmp_path):
+    scheduler = BackupScheduler(str(tmp_path / "live.db"), directory=str(tmp_path), retention=2)
+    stamps = ["20250101-000000", "20250102-000000", "20250103-000000", "20250104-000000"]
+    for stamp in stamps:
+        (tmp_path / f"live-{stamp}.db").write_bytes(b"")
+    others = ["live-notes.db", "live-20250101-000000.db.part", "other-20250101-000000.db", "live-2025.db"]
+    for name in others:
+        (tmp_path / name).write_bytes(b"")
+    scheduler.prune()
+    left = sorted(os.listdir(tmp_path))
+    assert left == sorted([f"live-{s}.db" for s in stamps[-2:]] + others)
+    scheduler.prune()
+    assert sorted(os.listdir(tmp_path)) == left
@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import database
+from database import Database, SCHEMA_VERSION, validate_backup
+from models import ActivityLogModel, PaymentModel, TenantModel, UnitModel
+
+# The tables as the app created them before schema versioning.
+BASELINE_SCHEMA = """
+CREATE TABLE users (user_id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE, password TEXT);
+CREATE TABLE units (unit_id INTEGER PRIMARY KEY AUTOINCREMENT, unit_code TEXT, unit_type TEXT,
+                    price REAL, status TEXT, capacity INTEGER);
+CREATE TABLE tenants (tenant_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, contact TEXT, unit_id INTEGER,
+                      tenant_type TEXT, move_in DATE, move_out DATE, status TEXT, guardian_name TEXT,
+                      guardian_contact TEXT, guardian_relation TEXT, emergency_contact TEXT,
+                      advance_paid REAL DEFAULT 0, deposit_paid REAL DEFAULT 0, move_out_reason TEXT,
+                      FOREIGN KEY(unit_id) REFERENCES units(unit_id));
+CREATE TABLE payments (payment_id INTEGER PRIMARY KEY AUTOINCREMENT, tenant_id INTEGER, rent REAL,
+                       electricity REAL, water REAL, total REAL, date_paid DATE, status TEXT, note TEXT,
+                       FOREIGN KEY(tenant_id) REFERENCES tenants(tenant_id));
+CREATE TABLE maintenance (request_id INTEGER PRIMARY KEY AUTOINCREMENT, tenant_id INTEGER, description TEXT,
+                          priority TEXT, date_requested DATE, status TEXT, fee REAL DEFAULT 0, staff TEXT,
+                          date_completed DATE, deleted INTEGER DEFAULT 0,
+                          FOREIGN KEY(tenant_id) REFERENCES tenants(tenant_id));
+CREATE TABLE staff (staff_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, contact TEXT, role TEXT, status TEXT);
+CREATE TABLE activity_log (log_id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, action TEXT, details TEXT);
+INSERT INTO units (unit_code, unit_type, price, status, capacity) VALUES ('D01', 'Dorm', 8000, 'Vacant', 4);
+INSERT INTO tenants (name, contact, unit_id, tenant_type, status) VALUES ('Maria Santos', '0917', 1, 'Dorm', 'Active');
+INSERT INTO payments (tenant_id, rent, electricity, water, total, date_paid, status)
+    VALUES (1, 8000, 0, 0, 8000, '2025-03-05', 'Paid');
+INSERT INTO payments (tenant_id, rent, electricity, water, total, status) VALUES (1, 8000, 0, 0, 8000, 'Due');
+"""
+
+
+def copy_database(db, path):
+    dst = sqlite3.connect(path)
+    try:
+        db.conn.backup(dst)
+    finally:
+        dst.close()
+
+
+def test_baseline_database_is_migrated_to_current_version(tmp_path):
+    path = str(tmp_path / "baseline.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+    db = Database(path)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+        unit = UnitModel(db).get(1)
+        assert (unit["occupant_count"], unit["status"]) == (1, "Occupied")
+        payments = PaymentModel(db)
+        assert payments.total_for_month(2025, 3) == 8000
+        assert payments.balance(1)["outstanding_due"] == 8000
+        assert [t["name"] for t in TenantModel(db).search("santos")] == ["Maria Santos"]
+        assert not db.query("SELECT name FROM sqlite_master WHERE name LIKE 'trg_payments_fts%'")
+        # Opening it again has nothing left to apply.
+        assert db.migrate() == 0
+    finally:
+        db.close()
+
+
+def test_search_indexes_are_built_once_fts5_is_available(tmp_path, monkeypatch):
+    path = str(tmp_path / "nofts.db")
+    with monkeypatch.context() as patch:
+        patch.setattr(database, "_fts5_available", lambda c: False)
+        db = Database(path)
+        TenantModel(db).create(name="Juan Dela Cruz", status="Active")
+        assert not db.has_fts
+        db.close()
+    db = Database(path)
+    try:
+        assert db.has_fts and db.schema_version() == SCHEMA_VERSION
+        assert [t["name"] for t in TenantModel(db).search("jua cru")] == ["Juan Dela Cruz"]
+        assert not db.query("SELECT name FROM sqlite_master WHERE name IN ('payments_fts', 'maintenance_fts')")
+    finally:
+        db.close()
+
+
+def test_insert_many_returns_each_rows_id(db):
+    ids = db.insert_many(
+        "INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)",
+        [("clerk", "x"), ("admin", "taken"), ("owner", "y")],
+    )
+    assert ids[1] is None
+    rows = db.query("SELECT user_id, username FROM users WHERE user_id IN (?, ?)", ids[::2])
+    assert {r["username"]: r["user_id"] for r in rows} == {"clerk": ids[0], "owner": ids[2]}
+    assert db.insert_many("INSERT INTO activity_log (log_id, action) VALUES (?, ?)", [(3, "a"), (7, "b")]) == [3, 7]
+    assert db.insert_many("INSERT INTO activity_log (action) VALUES (?)", []) == []
+
+
+def test_validate_backup_rejects_unusable_files(db, tmp_path):
+    corrupt = tmp_path / "corrupt.db"
+    corrupt.write_bytes(b"SQLite format 3\x00" + b"\xff" * 4096)
+    other = str(tmp_path / "other.db")
+    conn = sqlite3.connect(other)
+    conn.execute("CREATE TABLE notes (body TEXT)")
+    conn.close()
+    newer = str(tmp_path / "newer.db")
+    copy_database(db, newer)
+    conn = sqlite3.connect(newer)
+    conn.execute("INSERT INTO schema_version (version, name) VALUES (?, 'future')", (SCHEMA_VERSION + 1,))
+    conn.commit()
+    conn.close()
+    for path, reason in [(str(corrupt), "not a valid database"), (other, "Not an apartment database"),
+                         (newer, "newer than this application"), (str(tmp_path / "missing.db"), "not found")]:
+        with pytest.raises(ValueError, match=reason):
+            validate_backup(path)
+    TenantModel(db).create(name="Kept", status="Active")
+    with pytest.raises(ValueError):
+        db.restore_from(newer)
+    assert [t["name"] for t in TenantModel(db).all()] == ["Kept"]
+
+
+def test_restore_migrates_an_older_backup(db, tmp_path):
+    old = str(tmp_path / "old.db")
+    conn = sqlite3.connect(old)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+    assert validate_backup(old) == 0
+    units = UnitModel(db)
+    assert len(units.all()) > 1
+    TenantModel(db).create(name="Replaced", status="Active")
+    db.restore_from(old)
+    assert db.schema_version() == SCHEMA_VERSION
+    assert [u["unit_code"] for u in units.all()] == ["D01"]
+    assert [t["name"] for t in TenantModel(db).search("santos")] == ["Maria Santos"]
+    assert PaymentModel(db).balance(1)["outstanding_due"] == 8000
+
+
+def test_streamed_query_stats_do_not_block_restore(db, tmp_path):
+    logs = ActivityLogModel(db)
+    for i in range(3):
+        logs.log("test", str(i))
+    backup = str(tmp_path / "backup.db")
+    copy_database(db, backup)
+    stats = db.enable_instrumentation(slow_ms=0, log_path=str(tmp_path / "slow.log"))
+    try:
+        rows = db.iter_query("SELECT * FROM activity_log", chunk_size=1)
+        next(rows)
+        restore = threading.Thread(target=db.restore_from, args=(backup,), daemon=True)
+        restore.start()
+        # Let the restore take the write lock and wait for the reader.
+        time.sleep(0.2)
+        closer = threading.Thread(target=rows.close, daemon=True)
+        closer.start()
+        closer.join(5)
+        restore.join(5)
+        assert not closer.is_alive() and not restore.is_alive(), "iter_query and restore_from deadlocked"
+        assert any("activity_log" in entry["sql"] for entry in stats.snapshot())
+    finally:
+        db.disable_instrumentation()
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from loader import BackgroundLoader
+
+
+class FakeWidget:
+    """Collects after() callbacks so a test can run the Tk loop by hand."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run(self, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            callback = self.scheduled.pop(0)
+            callback()
+            time.sleep(0.001)
+
+
+def test_result_delivered_on_poll():
+    widget = FakeWidget()
+    loader = BackgroundLoader(widget)
+    results = []
+    loader.submit("units", lambda: 42, results.append)
+    assert loader.is_loading("units")
+    widget.run()
+    assert results == [42]
+    assert not loader.busy
+    loader.shutdown()
+
+
+def test_superseded_result_is_dropped():
+    widget = FakeWidget()
+    loader = BackgroundLoader(widget, workers=2)
+    release = threading.Event()
+    results = []
+    loader.submit("payments", lambda: release.wait() and "old", results.append)
+    loader.submit("payments", lambda: "new", results.append)
+    release.set()
+    widget.run()
+    assert results == ["new"]
+    loader.shutdown()
+
+
+def test_cancel_all_drops_every_view():
+    widget = FakeWidget()
+    loader = BackgroundLoader(widget)
+    busy = []
+    loader.on_busy_changed = busy.append
+    results = []
+    loader.submit("tenants", lambda: 1, results.append)
+    loader.submit("reports", lambda: 2, results.append)
+    loader.cancel_all()
+    widget.run()
+    assert results == []
+    assert busy == [True, False]
+    loader.shutdown()
+
+
+def test_errors_go_to_on_error():
+    widget = FakeWidget()
+    loader = BackgroundLoader(widget)
+    errors = []
+
+    def fail():
+        raise ValueError("boom")
+
+    loader.submit("logs", fail, lambda result: None, on_error=errors.append)
+    widget.run()
+    assert [str(e) for e in errors] == ["boom"]
+    loader.shutdown()
@@ -0,0 +1,102 @@
+from models import TenantModel, PaymentModel
+
+
+def test_monthly_series_groups_by_month(db):
+    payments = PaymentModel(db)
+    tenant = TenantModel(db).create(name="A", tenant_type="Solo", status="Active")
+    payments.create_many([
+        {"tenant_id": tenant, "rent": 10, "date_paid": "2025-01-05"},
+        {"tenant_id": tenant, "rent": 5, "date_paid": "2025-01-31"},
+        {"tenant_id": tenant, "rent": 7, "date_paid": "2025-03-01"},
+    ])
+    series = payments.monthly_series("2025-01-01", "2025-04-01")
+    assert [(r["month"], r["total"]) for r in series] == [("2025-01", 15), ("2025-03", 7)]
+    by_type = payments.monthly_series("2025-01-01", "2025-02-01", group_by="tenant_type")
+    assert [tuple(r) for r in by_type] == [("2025-01", "Solo", 15)]
+    assert payments.total_for_range("2025-01-06", "2025-03-02") == 12
+
+
+def test_rollups_follow_payment_writes(db):
+    payments = PaymentModel(db)
+    tenant = TenantModel(db).create(name="A", tenant_type="Solo", status="Active")
+    payments.create_many([
+        {"tenant_id": tenant, "rent": 100, "date_paid": "2025-03-04"},
+        {"tenant_id": tenant, "rent": 50, "date_paid": "2025-03-20"},
+        {"tenant_id": tenant, "rent": 70, "status": "Due"},
+    ])
+    assert payments.total_for_month(2025, 3) == 150
+    db.execute("UPDATE payments SET date_paid='2025-04-01' WHERE rent=50")
+    assert (payments.total_for_month(2025, 3), payments.total_for_month(2025, 4)) == (100, 50)
+    db.execute("DELETE FROM payments WHERE rent=100")
+    assert payments.total_for_month(2025, 3) == 0
+    assert db.rebuild_rollups() == 1
+    assert payments.total_for_month(2025, 4) == 50
+
+
+def test_tenant_balances_follow_payments(db):
+    payments = PaymentModel(db)
+    tenant = TenantModel(db).create(name="A", status="Active")
+    first = payments.create(tenant, 100, 0, 0, status="Paid")
+    payments.create_due(tenant, 80, 10, 10)
+    payments.create_due(tenant, 50, 0, 0)
+    balance = payments.balance(tenant)
+    assert (balance["outstanding_due"], balance["months_in_arrears"]) == (150, 2)
+    assert balance["last_paid_date"] is not None
+    payments.update(first, 100, 0, 0, "Due", "")
+    balance = payments.balance(tenant)
+    assert (balance["outstanding_due"], balance["months_in_arrears"], balance["last_paid_date"]) == (250, 3, None)
+    assert payments.arrears_summary() == (1, 250)
+    assert db.rebuild_balances() == 1
+    assert payments.balance(tenant)["outstanding_due"] == 250
+
+
+def test_balance_ledger_matches_a_rebuild(db):
+    tenants, payments = TenantModel(db), PaymentModel(db)
+    first = tenants.create(name="A", status="Active")
+    second = tenants.create(name="B", status="Active")
+
+    def ledger():
+        # A tenant whose payments all moved away keeps a zeroed row, which a
+        # rebuild leaves out; both read as "owes nothing".
+        return [tuple(r) for r in db.query("SELECT * FROM tenant_balances ORDER BY tenant_id")
+                if tuple(r)[1:] != (0, 0, None)]
+
+    def assert_matches_rebuild():
+        kept = ledger()
+        assert kept
+        db.rebuild_balances()
+        assert ledger() == kept
+
+    paid = payments.create(first, 100, 0, 0, status="Paid")
+    due = payments.create(first, 80, 10, 10, status="Due")
+    payments.create(second, 60, 0, 0, status="Overdue")
+    assert_matches_rebuild()
+    payments.update(paid, 120, 5, 5, "Due", "")
+    payments.update(due, 80, 10, 10, "Paid", "")
+    assert_matches_rebuild()
+    db.execute("UPDATE payments SET tenant_id=?, date_paid='2025-01-05' WHERE payment_id=?", (second, due))
+    assert_matches_rebuild()
+    db.execute("DELETE FROM payments WHERE payment_id=?", (due,))
+    assert_matches_rebuild()
+    db.execute("DELETE FROM payments WHERE tenant_id=?", (first,))
+    assert_matches_rebuild()
+    assert set(payments.balances([first, second, 999])) <= {first, second}
+    assert payments.balances([second])[second]["outstanding_due"] == 60
+
+
+def test_page_and_count_apply_filters(db):
+    tenants, payments = TenantModel(db), PaymentModel(db)
+    solo = tenants.create(name="Solo Tenant", tenant_type="Solo", status="Active")
+    family = tenants.create(name="Family Tenant", tenant_type="Family", status="Active")
+    payments.create_many([
+        {"tenant_id": solo, "rent": 100, "date_paid": "2025-01-31"},
+        {"tenant_id": solo, "rent": 100, "date_paid": "2025-02-01"},
+        {"tenant_id": family, "rent": 200, "date_paid": "2025-02-28", "note": "late fee"},
+        {"tenant_id": family, "rent": 200, "date_paid": "2025-03-01"},
+        {"tenant_id": family, "rent": 200, "status": "Due"},
+    ])
+    feb = {"date_from": "2025-02-01", "date_to": "2025-03-01"}
+    assert [r["date_paid"] for r in payments.page(filters=feb)] == ["2025-02-28", "2025-02-01"]
+    assert payments.count(dict(feb, tenant_type="family")) == 1
+    assert payments.count({"status": "Due", "tenant_type": "Family"}) == 1
+    assert payments.count(dict(feb, text="LATE")) == 1
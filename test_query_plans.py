@@ -0,0 +1,107 @@
+import pytest
+
+from database import Database
+from models import TenantModel, PaymentModel, MaintenanceModel, ActivityLogModel
+
+
+class RecordingDatabase(Database):
+    """Remembers every SELECT the models issue so its plan can be checked."""
+
+    def __init__(self, db_file):
+        self.recorded = []
+        super().__init__(db_file)
+
+    def query(self, sql, params=()):
+        self.recorded.append((sql, params))
+        return super().query(sql, params)
+
+
+def plan_for(db, call):
+    db.recorded.clear()
+    call()
+    details = []
+    for sql, params in db.recorded:
+        rows = db.conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        details.extend(r["detail"] for r in rows)
+    return " | ".join(details)
+
+
+def assert_uses(db, call, index):
+    plan = plan_for(db, call)
+    assert index in plan, f"expected {index} in query plan, got: {plan}"
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = RecordingDatabase(str(tmp_path / "plans.db"))
+    yield database
+    database.close()
+
+
+def test_invoice_exists_uses_tenant_note_index(db):
+    assert_uses(
+        db, lambda: PaymentModel(db).invoice_exists_with_note(1, "Auto-bill"), "idx_payments_tenant_note")
+
+
+def test_payment_month_total_reads_rollup(db):
+    assert_uses(
+        db, lambda: PaymentModel(db).total_for_month(2025, 1),
+        "SEARCH payments_monthly USING PRIMARY KEY (year=? AND month=?)")
+
+
+def test_maintenance_month_total_reads_rollup(db):
+    assert_uses(
+        db, lambda: MaintenanceModel(db).total_fee_for_month(2025, 1),
+        "SEARCH maintenance_monthly USING PRIMARY KEY (year=? AND month=?)")
+
+
+def test_payment_range_total_uses_date_index(db):
+    assert_uses(
+        db, lambda: PaymentModel(db).total_for_range("2025-01-01", "2026-01-01"), "idx_payments_date_paid")
+
+
+def test_maintenance_series_uses_date_index(db):
+    assert_uses(
+        db, lambda: MaintenanceModel(db).monthly_series("2025-01-01", "2026-01-01", group_by="priority"),
+        "idx_maintenance_deleted_date")
+
+
+def test_maintenance_counts_use_status_index(db):
+    assert_uses(
+        db, lambda: MaintenanceModel(db).counts(), "idx_maintenance_deleted_status")
+
+
+def test_tenants_in_unit_uses_unit_status_index(db):
+    assert_uses(
+        db, lambda: TenantModel(db).tenants_in_unit(1), "idx_tenants_unit_status")
+
+
+def test_occupancy_lookups_are_one_query(db):
+    model = TenantModel(db)
+    db.recorded.clear()
+    model.occupants_by_unit()
+    model.occupant_counts()
+    assert len(db.recorded) == 2
+    assert "idx_tenants_unit_status" in plan_for(db, model.occupant_counts)
+
+
+def test_payment_page_seeks_on_primary_key(db):
+    assert_uses(
+        db, lambda: PaymentModel(db).page(after_id=1000, limit=50), "INTEGER PRIMARY KEY (rowid<?)")
+
+
+def test_maintenance_page_seeks_on_deleted_id_index(db):
+    assert_uses(
+        db, lambda: MaintenanceModel(db).page(after_id=1000, limit=50),
+        "idx_maintenance_deleted_id (deleted=? AND request_id<?)")
+
+
+def test_activity_log_page_seeks_on_primary_key(db):
+    assert_uses(
+        db, lambda: ActivityLogModel(db).page(after_id=1000, limit=50), "INTEGER PRIMARY KEY (rowid<?)")
+
+
+def test_payment_date_filter_uses_date_index(db):
+    assert_uses(
+        db, lambda: PaymentModel(db).page(filters={"date_from": "2025-02-01", "date_to": "2025-03-01"}),
+        "idx_payments_date_paid (date_paid>? AND date_paid<?)")
@@ -0,0 +1,54 @@
+import threading
+
+from database import ReaderPool
+from models import ActivityLogModel
+
+
+def test_pool_opens_at_most_size_connections(db):
+    pool = ReaderPool(db.db_file, db.profile, size=2)
+    try:
+        first, second = pool.acquire(), pool.acquire()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()), daemon=True)
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive() and got == []
+        pool.release(second)
+        waiter.join(5)
+        assert got == [second]
+        assert len(pool._opened) == 2
+        pool.release(first)
+        pool.release(second)
+    finally:
+        pool.close()
+
+
+def test_drained_waits_for_checked_out_readers(db):
+    pool = ReaderPool(db.db_file, db.profile, size=2)
+    conn = pool.acquire()
+    inside = threading.Event()
+
+    def drain():
+        with pool.drained():
+            inside.set()
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    assert not inside.wait(0.2)
+    pool.release(conn)
+    assert inside.wait(5)
+    drainer.join(5)
+    assert pool._opened == []
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM units").fetchone()[0] > 0
+    pool.close()
+
+
+def test_query_in_transaction_reads_the_writer(db):
+    logs = ActivityLogModel(db)
+    with db.transaction():
+        logs.log("login", "uncommitted")
+        assert [r["details"] for r in logs.all()] == ["uncommitted"]
+        with db._readers.connection() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM activity_log").fetchone()[0] == 0
+    assert logs.count() == 1
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from models import PaymentModel, TenantModel
+from records import Record, Tenant, record_class
+
+
+def test_access_by_key_index_and_attribute():
+    row = record_class(("tenant_id", "name", "class"))(7, "Ana", "A")
+    assert (row["tenant_id"], row[1], row.name) == (7, "Ana", "Ana")
+    # Column names that are not usable attributes are still reachable by key.
+    assert row["class"] == "A" and row.get("class") == "A"
+    assert row.get("missing", "-") == "-"
+    with pytest.raises(KeyError):
+        row["missing"]
+    row["name"] = "Ana Cruz"
+    assert row.name == "Ana Cruz"
+
+
+def test_keys_dict_and_equality():
+    cls = record_class(("unit_id", "unit_code"))
+    row = cls(1, "S01")
+    assert row.keys() == ["unit_id", "unit_code"]
+    assert dict(row) == {"unit_id": 1, "unit_code": "S01"}
+    assert list(row) == [1, "S01"] and len(row) == 2 and "unit_code" in row
+    assert row == cls(1, "S01")
+    assert row != cls(1, "S02")
+    assert row != record_class(("unit_code", "unit_id"))("S01", 1)
+
+
+def test_type_follows_the_whole_column_set(db):
+    tenants, payments = TenantModel(db), PaymentModel(db)
+    tenant = tenants.create(name="A", status="Active")
+    payments.create(tenant, 100, 0, 0, status="Due")
+    assert type(tenants.get(tenant)).__mro__[1] is Tenant
+    balance = payments.balance(tenant)
+    assert balance["tenant_id"] == tenant
+    assert type(balance).__mro__[1] is Record
+
+
+def test_threads_get_their_own_row_classes(db):
+    TenantModel(db).create(name="A", status="Active")
+    errors = []
+
+    def read(sql, key):
+        for _ in range(200):
+            for row in db.query(sql):
+                if key not in row:
+                    errors.append((sql, row.keys()))
+
+    threads = [threading.Thread(target=read, args=("SELECT * FROM units", "unit_code")),
+               threading.Thread(target=read, args=("SELECT * FROM tenants", "move_in"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,152 @@
+import time
+
+import pytest
+
+from loader import BackgroundLoader
+from models import TenantModel
+from search import SearchController
+
+
+class FakeWidget:
+    """Runs after() callbacks by hand, in the order they are due."""
+
+    def __init__(self):
+        self.now = 0
+        self.scheduled = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.scheduled[self.next_id] = (self.now + ms, callback)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def winfo_exists(self):
+        return True
+
+    def advance(self, ms):
+        self.now += ms
+        self.run()
+
+    def run(self, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            due = [(at, i) for i, (at, _cb) in self.scheduled.items() if at <= self.now]
+            if not due:
+                return
+            _at, after_id = min(due)
+            _at, callback = self.scheduled.pop(after_id)
+            callback()
+            time.sleep(0.001)
+
+
+class FakeVar:
+    def __init__(self):
+        self.value = ""
+        self.traces = {}
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in list(self.traces.values()):
+            callback("var", "", "write")
+
+    def trace_add(self, mode, callback):
+        name = f"trace{len(self.traces)}"
+        self.traces[name] = callback
+        return name
+
+    def trace_remove(self, mode, name):
+        del self.traces[name]
+
+
+NAMES = ["Juan Dela Cruz", "Juana Reyes", "Maria Santos", "Jose Rizal", "Julia Roberts"]
+
+
+def make_search(names=NAMES, refine_limit=10, poll_ms=10):
+    widget = FakeWidget()
+    loader = BackgroundLoader(widget, poll_ms=poll_ms)
+    var = FakeVar()
+    fetched, shown = [], []
+
+    def fetch_for(query):
+        fetched.append(query)
+        return lambda: [n for n in names if query.lower() in n.lower()]
+
+    search = SearchController(
+        widget, loader, var, fetch_for, lambda q, rows: shown.append((q, rows)),
+        lambda row, q: q.lower() in row.lower(), delay_ms=250, refine_limit=refine_limit,
+    )
+    return widget, loader, var, search, fetched, shown
+
+
+def test_keystrokes_are_debounced():
+    widget, loader, var, search, fetched, shown = make_search()
+    for text in ("j", "ju", "jua"):
+        var.set(text)
+        widget.advance(100)
+    assert fetched == []
+    widget.advance(250)
+    assert fetched == ["jua"]
+    widget.advance(50)
+    assert shown == [("jua", ["Juan Dela Cruz", "Juana Reyes"])]
+    loader.shutdown()
+
+
+def test_longer_query_narrows_held_rows():
+    widget, loader, var, search, fetched, shown = make_search()
+    var.set("ju")
+    widget.advance(300)
+    var.set("juan")
+    widget.advance(300)
+    var.set("juana")
+    widget.advance(300)
+    assert fetched == ["ju"]
+    assert shown[-2:] == [("juan", ["Juan Dela Cruz", "Juana Reyes"]), ("juana", ["Juana Reyes"])]
+    # Deleting a character is not a refinement.
+    var.set("jua")
+    widget.advance(300)
+    assert fetched == ["ju", "jua"]
+    loader.shutdown()
+
+
+def test_large_results_are_queried_again():
+    widget, loader, var, search, fetched, shown = make_search(refine_limit=1)
+    var.set("j")
+    widget.advance(300)
+    var.set("ju")
+    widget.advance(300)
+    assert fetched == ["j", "ju"]
+    loader.shutdown()
+
+
+def test_refresh_drops_held_rows():
+    widget, loader, var, search, fetched, shown = make_search()
+    var.set("ju")
+    widget.advance(300)
+    search.refresh()
+    widget.advance(50)
+    assert fetched == ["ju", "ju"]
+    search.close()
+    var.set("juan")
+    widget.advance(300)
+    assert fetched == ["ju", "ju"]
+    loader.shutdown()
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_text_matches_agrees_with_search(db, fts):
+    db.has_fts = db.has_fts and fts
+    tenants = TenantModel(db)
+    for i, name in enumerate(NAMES):
+        tenants.create(name=name, contact=f"091{7 + i}", status="Active")
+    rows = tenants.active()
+    for query in ["ju", "juan d", "cruz", "0917", "B-1", "jos riz", "zzz", "maría"]:
+        expected = sorted(r["tenant_id"] for r in tenants.search(query))
+        narrowed = sorted(r["tenant_id"] for r in rows
+                          if tenants.text_matches((r["name"], r["contact"], r["unit_code"]), query))
+        assert narrowed == expected, (query, narrowed, expected)
@@ -0,0 +1,80 @@
+import models.base
+from models import TenantModel
+
+
+def test_update_during_get_is_not_lost(db):
+    tenants = TenantModel(db)
+    tenant_id = tenants.create(name="Juan Dela Cruz", contact="0917", status="Active")
+    read = tenants.query
+
+    def read_then_update(sql, params=()):
+        # get() has read the row when another thread updates it.
+        rows = read(sql, params)
+        tenants.query = read
+        tenants.update(tenant_id, contact="0918")
+        return rows
+
+    tenants.query = read_then_update
+    tenants.get(tenant_id)
+    assert tenants.get(tenant_id)["contact"] == "0918"
+
+
+def test_update_changes_cached_row_in_place(db):
+    tenants = TenantModel(db)
+    unit = db.query("SELECT unit_id, unit_code FROM units ORDER BY unit_id LIMIT 1")[0]
+    tenant_id = tenants.create(name="Maria Santos", status="Active")
+    row = tenants.get(tenant_id)
+    assert row["unit_code"] is None
+    tenants.update(tenant_id, unit_id=unit["unit_id"])
+    assert tenants.get(tenant_id) is row
+    assert row["unit_id"] == unit["unit_id"] and row["unit_code"] == unit["unit_code"]
+
+
+def test_create_many_and_update_many(db):
+    tenants = TenantModel(db)
+    ids = tenants.create_many({"name": name, "status": "Active"} for name in ("A", "B", "C"))
+    assert [tenants.get(i)["name"] for i in ids] == ["A", "B", "C"]
+    cached = tenants.get(ids[0])
+    tenants.update_many([(ids[0], {"contact": "0917"}), (ids[1], {"contact": "0918"}), (ids[2], {"status": "Terminated"})])
+    assert [tenants.get(i)["contact"] for i in ids[:2]] == ["0917", "0918"]
+    assert tenants.get(ids[0]) is not cached
+    assert [t["tenant_id"] for t in tenants.active()] == ids[:2]
+
+
+def test_search_matches_prefixes_with_and_without_fts(db):
+    tenants = TenantModel(db)
+    tenants.create(name="Juan Dela Cruz", contact="0917", unit_id=1, status="Active")
+    tenants.create(name="Maria Santos", contact="0918", unit_id=2, status="Active")
+    tenants.create(name="Juan Reyes", contact="0919", unit_id=3, status="Terminated")
+    for has_fts in (db.has_fts, False):
+        db.has_fts = has_fts
+        assert [t["name"] for t in tenants.search("jua cru")] == ["Juan Dela Cruz"]
+        assert [t["name"] for t in tenants.search("S02")] == ["Maria Santos"]
+        assert len(tenants.search("juan", status=None)) == 2
+        assert tenants.search("") == []
+
+
+def test_common_terms_come_in_id_order_past_rank_limit(db):
+    tenants = TenantModel(db)
+    ids = [tenants.create(name=name, status="Active") for name in ("Mar Cruz", "Maria Mar", "Mark Mar Mar")]
+    rank_limit = models.base.SEARCH_RANK_LIMIT
+    models.base.SEARCH_RANK_LIMIT = 2
+    try:
+        assert [t["tenant_id"] for t in tenants.search("mar", limit=2)] == ids[:2]
+        assert len(tenants.search("mar")) == 3
+    finally:
+        models.base.SEARCH_RANK_LIMIT = rank_limit
+
+
+def test_page_and_count_apply_filters(db):
+    tenants = TenantModel(db)
+    juan = tenants.create(name="Juan Dela Cruz", contact="0917", unit_id=1, status="Active")
+    maria = tenants.create(name="Maria Santos", contact="0918", unit_id=2, status="Active")
+    tenants.create(name="Juan Reyes", contact="0919", unit_id=3, status="Terminated")
+    active = {"status": "Active"}
+    assert [t["tenant_id"] for t in tenants.page(filters=active)] == [maria, juan]
+    assert [t["tenant_id"] for t in tenants.page(filters=active, limit=1, after_id=maria)] == [juan]
+    assert tenants.count(active) == 2 and tenants.count() == 3
+    assert [t["name"] for t in tenants.page(filters=dict(active, text="JUAN"))] == ["Juan Dela Cruz"]
+    assert tenants.count(dict(active, text="s02")) == 1
+    assert [t["tenant_id"] for t in tenants.page(filters={"text": str(maria)})] == [maria]
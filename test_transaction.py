@@ -0,0 +1,72 @@
+import pytest
+
+from models import ActivityLogModel, TenantModel, UnitModel
+
+
+def details(db):
+    return [r["details"] for r in db.query("SELECT details FROM activity_log ORDER BY log_id")]
+
+
+def test_nested_blocks_commit_together(db):
+    logs = ActivityLogModel(db)
+    with db.transaction():
+        logs.log("test", "outer")
+        with db.transaction():
+            logs.log("test", "inner")
+        assert db.in_transaction()
+    assert not db.in_transaction()
+    assert details(db) == ["outer", "inner"]
+
+
+def test_inner_failure_rolls_back_only_its_savepoint(db):
+    logs = ActivityLogModel(db)
+    with db.transaction():
+        logs.log("test", "before")
+        with pytest.raises(ValueError):
+            with db.transaction():
+                logs.log("test", "inner")
+                raise ValueError
+        logs.log("test", "after")
+    assert details(db) == ["before", "after"]
+
+
+def test_failure_rolls_back_everything(db):
+    logs = ActivityLogModel(db)
+    resets = []
+    db.add_reset_listener(lambda: resets.append(1))
+    with pytest.raises(ValueError):
+        with db.transaction():
+            logs.log("test", "outer")
+            with db.transaction():
+                logs.log("test", "inner")
+            raise ValueError
+    assert details(db) == []
+    assert resets == [1]
+    assert not db.in_transaction()
+
+
+def test_changes_are_announced_once_per_commit(db):
+    tenants = TenantModel(db)
+    changed = []
+    db.add_change_listener("tenants", lambda: changed.append(1))
+    with db.transaction():
+        for name in ("A", "B"):
+            tenants.create(name=name, status="Active")
+        with db.transaction():
+            tenants.create(name="C", status="Active")
+        assert changed == []
+    assert changed == [1]
+    with pytest.raises(ValueError):
+        with db.transaction():
+            tenants.create(name="D", status="Active")
+            raise ValueError
+    assert changed == [1]
+
+
+def test_unit_reads_inside_a_transaction_see_its_writes(db):
+    tenants, units = TenantModel(db), UnitModel(db)
+    unit_id = units.all()[0]["unit_id"]
+    with db.transaction():
+        tenants.create(name="A", unit_id=unit_id, status="Active")
+        assert units.get(unit_id)["occupant_count"] == 1
+    assert units.get(unit_id)["occupant_count"] == 1
@@ -0,0 +1,86 @@
+import pytest
+
+from models import TenantModel, UnitModel
+
+
+def first_dorm(units):
+    return next(u for u in units.all() if u["unit_type"] == "Dorm")["unit_id"]
+
+
+def test_write_during_cache_fill_is_not_lost(db):
+    units = UnitModel(db)
+    unit_id = units.all()[0]["unit_id"]
+    units.invalidate()
+    read = units.query
+
+    def read_then_write(sql, params=()):
+        # The fill has read its rows when another thread writes.
+        rows = read(sql, params)
+        units.query = read
+        units.update_capacity(unit_id, 99)
+        return rows
+
+    units.query = read_then_write
+    units.all()
+    assert units.get(unit_id)["capacity"] == 99
+
+
+def test_occupancy_triggers_derive_unit_status(db):
+    tenants, units = TenantModel(db), UnitModel(db)
+    dorm = first_dorm(units)
+    units.update_capacity(dorm, 2)
+    a = tenants.create(name="A", unit_id=dorm, status="Active")
+    assert units.get(dorm)["status"] == "Occupied"
+    tenants.create(name="B", unit_id=dorm, status="Active")
+    assert units.get(dorm)["status"] == "Full"
+    tenants.terminate(a, "2025-01-01", "moved")
+    assert (units.get(dorm)["occupant_count"], units.get(dorm)["status"]) == (1, "Occupied")
+
+
+def test_occupancy_follows_status_to_and_from_null(db):
+    tenants, units = TenantModel(db), UnitModel(db)
+    dorm = first_dorm(units)
+    tenant = tenants.create(name="A", unit_id=dorm, status=None)
+    assert units.get(dorm)["occupant_count"] == 0
+    tenants.update(tenant, status="Active")
+    assert (units.get(dorm)["occupant_count"], units.get(dorm)["status"]) == (1, "Occupied")
+    tenants.update(tenant, status=None)
+    assert (units.get(dorm)["occupant_count"], units.get(dorm)["status"]) == (0, "Vacant")
+
+
+def test_occupants_are_grouped_by_unit(db):
+    tenants = TenantModel(db)
+    tenants.create_many([
+        {"name": "B", "unit_id": 1, "status": "Active"},
+        {"name": "A", "unit_id": 1, "status": "Active"},
+        {"name": "C", "unit_id": 2, "status": "Active"},
+        {"name": "D", "unit_id": 2, "status": "Terminated"},
+    ])
+    assert [t["name"] for t in tenants.occupants_by_unit()[1]] == ["A", "B"]
+    assert tenants.occupant_counts() == {1: 2, 2: 1}
+
+
+def test_find_filters_the_cache_once_it_is_loaded(db):
+    units = UnitModel(db)
+    # A cold copy is not loaded just to be filtered.
+    cold = units.find({"unit_type": "dorm"})
+    assert units.cache_stats() == {"hits": 0, "misses": 0}
+    dorms = [u for u in units.all() if u["unit_type"] == "Dorm"]
+    assert cold == dorms
+    assert units.find() == units.all()
+
+    def no_query(sql, params=()):
+        raise AssertionError(sql)
+
+    units.query = no_query
+    assert units.find({"unit_type": "dorm"}) == dorms
+    vacant_dorms = units.find({"status": "Vacant", "text": "DORM"})
+    assert vacant_dorms == [u for u in dorms if u["status"] == "Vacant"]
+    del units.query
+    for filters in ({"text": "s0"}, {"status": "Vacant"}, {"unit_type": "FAMILY", "text": "1"}):
+        warm = units.find(filters)
+        units.invalidate()
+        assert warm and warm == units.find(filters)
+        units.all()
+    with pytest.raises(ValueError):
+        units.find({"floor": 2})
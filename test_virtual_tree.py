@@ -0,0 +1,175 @@
+import pytest
+
+from models import TenantModel, PaymentModel
+from virtual_tree import RowWindow, sync_tree
+
+PAGE = 10
+
+
+class FakeTree:
+    """The part of ttk.Treeview that sync_tree uses, counting the calls."""
+
+    def __init__(self):
+        self.order = []
+        self.items = {}
+        self.calls = []
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def delete(self, *iids):
+        self.calls.append(("delete",) + iids)
+        for iid in iids:
+            self.order.remove(iid)
+            del self.items[iid]
+
+    def insert(self, parent, index, iid, values, tags):
+        self.calls.append(("insert", iid))
+        self.order.insert(index, iid)
+        self.items[iid] = (values, tags)
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def item(self, iid, values, tags):
+        self.calls.append(("item", iid))
+        self.items[iid] = (values, tags)
+
+
+@pytest.fixture
+def payments(db):
+    """45 payments split between two tenants of different types."""
+    tenants = TenantModel(db)
+    alice = tenants.create(name="Alice Reyes", tenant_type="Solo", status="Active")
+    bob = tenants.create(name="Bob Cruz", tenant_type="Family", status="Active")
+    model = PaymentModel(db)
+    model.create_many(
+        {"tenant_id": alice if i % 3 else bob, "rent": 100 + i, "note": f"bill {i}"} for i in range(45)
+    )
+    return model
+
+
+def fetcher(payments, filters=None):
+    def fetch(after, offset, limit):
+        rows = payments.page(after_id=after, limit=limit, filters=filters, offset=offset)
+        return [(r["payment_id"], (r["payment_id"], r["name"]), ()) for r in rows]
+    return fetch
+
+
+def fill(window, fetch):
+    """Fetch what the window wants, as the widget's loader would."""
+    while window.wanted():
+        page = window.wanted()[0]
+        window.store(page, fetch(*window.fetch_args(page)))
+
+
+def test_scrolling_shows_every_row_once(payments):
+    fetch = fetcher(payments)
+    window = RowWindow(page_size=PAGE, buffer_pages=1)
+    # The unfiltered grid is sized from the key range, not COUNT(*).
+    assert payments.estimate_count() == payments.count()
+    window.reset(payments.estimate_count())
+    window.resize(7)
+    seen = []
+    while True:
+        fill(window, fetch)
+        rows = window.rows()
+        assert None not in rows
+        seen.extend(key for key, _values, _tags in rows[len(seen) - window.offset:])
+        if window.offset + window.visible >= window.total:
+            break
+        window.scroll_to(window.offset + window.visible)
+    assert seen == [r["payment_id"] for r in payments.all()]
+
+
+def test_next_page_seeks_from_last_key(payments):
+    fetch = fetcher(payments)
+    window = RowWindow(page_size=PAGE, buffer_pages=1)
+    window.reset(payments.count())
+    window.resize(5)
+    window.store(0, fetch(*window.fetch_args(0)))
+    after, offset, limit = window.fetch_args(1)
+    assert (after, offset, limit) == (window.pages[0][-1][0], 0, PAGE)
+    # Jumping into the middle has no previous page to seek from.
+    window.scroll_to(32)
+    assert window.wanted()[0] == 3
+    assert window.fetch_args(3) == (None, 30, PAGE)
+    assert window.rows() == [None] * 5
+    window.store(3, fetch(*window.fetch_args(3)))
+    assert [row[0] for row in window.rows()] == [r["payment_id"] for r in payments.all()[32:37]]
+
+
+def test_only_buffered_pages_are_kept():
+    window = RowWindow(page_size=PAGE, buffer_pages=1)
+    window.reset(1000)
+    window.resize(5)
+    for page in range(6):
+        window.store(page, [(page * PAGE + i, (), ()) for i in range(PAGE)])
+    assert sorted(window.pages) == [0, 1]
+    window.scroll_to(500)
+    assert window.pages == {}
+    assert window.wanted() == [50, 51, 49]
+
+
+def test_short_page_corrects_total():
+    window = RowWindow(page_size=PAGE, buffer_pages=1)
+    window.reset(25)
+    window.resize(30)
+    window.store(0, [(i, (), ()) for i in range(PAGE)])
+    window.store(1, [(i, (), ()) for i in range(PAGE, 2 * PAGE)])
+    assert window.store(2, [(20, (), ())])
+    assert window.total == 21
+    assert len(window.rows()) == 21
+    assert window.fraction() == (0.0, 1.0)
+
+
+def test_index_of_finds_selected_row():
+    window = RowWindow(page_size=PAGE, buffer_pages=1)
+    window.reset(100)
+    window.resize(5)
+    window.store(1, [(100 - i, (), ()) for i in range(PAGE, 2 * PAGE)])
+    assert window.index_of(88) == 12
+    assert window.row_at(12)[0] == 88
+    assert window.index_of(7) is None
+
+
+def test_sync_tree_touches_only_changed_rows():
+    tree = FakeTree()
+    rows = [(i, (i, f"row {i}"), ()) for i in range(1000)]
+    sync_tree(tree, rows)
+    assert len(tree.calls) == 1000
+    tree.calls.clear()
+    sync_tree(tree, rows)
+    assert tree.calls == []
+    rows[500] = (500, (500, "paid"), ("overdue",))
+    sync_tree(tree, rows)
+    assert tree.calls == [("item", "500")]
+    assert tree.items["500"] == ((500, "paid"), ("overdue",))
+
+
+def test_sync_tree_inserts_deletes_and_reorders():
+    tree = FakeTree()
+    sync_tree(tree, [(k, (k,), ()) for k in (1, 2, 3, 4)])
+    tree.calls.clear()
+    sync_tree(tree, [(k, (k,), ()) for k in (5, 1, 3, 6, 4, 3)])
+    assert tree.order == ["5", "1", "3", "6", "4"]
+    assert sorted(tree.calls) == [("delete", "2"), ("insert", "5"), ("insert", "6")]
+    sync_tree(tree, [(k, (k,), ()) for k in (4, 3, 1)])
+    assert tree.order == ["4", "3", "1"]
+
+
+def test_payment_text_filter_matches_name_note_and_tenant(payments):
+    by_name = payments.page(filters={"text": "alice"}, limit=100)
+    assert by_name and all(r["name"] == "Alice Reyes" for r in by_name)
+    assert payments.count({"text": "ALICE"}) == len(by_name)
+    assert [r["note"] for r in payments.page(filters={"text": "bill 4"}, limit=100)] == [
+        "bill 44", "bill 43", "bill 42", "bill 41", "bill 40", "bill 4"]
+    by_type = payments.count({"text": "cruz", "tenant_type": "family"})
+    assert by_type == payments.count({"tenant_type": "Family"})
+    window = RowWindow(page_size=PAGE)
+    window.reset(payments.count({"text": "alice"}))
+    window.resize(100)
+    fill(window, fetcher(payments, {"text": "alice"}))
+    assert [row[0] for row in window.rows()] == [r["payment_id"] for r in by_name]
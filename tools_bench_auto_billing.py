@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from database import Database
+from models import TenantModel, PaymentModel
+
+TENANTS = 500
+
+
+class CountingDatabase(Database):
+    commits = 0
+
+    def _commit(self):
+        self.commits += 1
+        super()._commit()
+
+
+def auto_bill(db, note, use_transaction):
+    # Same statements per tenant as MainApp.generate_auto_bills.
+    tenant_model = TenantModel(db)
+    payment_model = PaymentModel(db)
+
+    def run():
+        for t in tenant_model.active():
+            if payment_model.invoice_exists_with_note(t["tenant_id"], note):
+                continue
+            payment_model.create_due(t["tenant_id"], t["room_price"] or 0.0, 150.0, 80.0, note=note)
+
+    if use_transaction:
+        with db.transaction():
+            run()
+    else:
+        run()
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    db = CountingDatabase(os.path.join(tmp, "bench.db"))
+    tenants = TenantModel(db)
+    with db.transaction():
+        for i in range(TENANTS):
+            tenants.create(name=f"Tenant {i}", unit_id=(i % 50) + 1, tenant_type="Solo", status="Active")
+
+    for use_transaction in (False, True):
+        db.commits = 0
+        start = time.perf_counter()
+        auto_bill(db, f"Auto-bill bench {use_transaction}", use_transaction)
+        elapsed = time.perf_counter() - start
+        label = "one transaction" if use_transaction else "commit per invoice"
+        print(f"{label:<20} {db.commits:>5} commits {elapsed * 1000:10.1f} ms for {TENANTS} invoices")
+    db.close()
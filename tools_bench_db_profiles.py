@@ -0,0 +1,91 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from database import Database, PROFILES, _apply_profile
+
+COMMITS = 300
+READERS = 4
+DURATION = 2.0
+
+
+def open_conn(path, profile):
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=0 if profile is None else 5)
+    if profile is not None:
+        _apply_profile(conn, profile)
+    return conn
+
+
+def commit_latency(path, profile):
+    conn = open_conn(path, profile)
+    start = time.perf_counter()
+    for i in range(COMMITS):
+        conn.execute("INSERT INTO activity_log (timestamp, action, details) VALUES (?,?,?)",
+                     ("2025-01-01 00:00:00", "bench", str(i)))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed / COMMITS * 1000
+
+
+def read_concurrency(path, profile):
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "busy": 0}
+    lock = threading.Lock()
+
+    def writer():
+        conn = open_conn(path, profile)
+        while not stop.is_set():
+            try:
+                conn.execute("INSERT INTO activity_log (timestamp, action, details) VALUES (?,?,?)",
+                             ("2025-01-01 00:00:00", "bench", "w"))
+                conn.commit()
+                with lock:
+                    counts["writes"] += 1
+            except sqlite3.OperationalError:
+                with lock:
+                    counts["busy"] += 1
+        conn.close()
+
+    def reader():
+        conn = open_conn(path, profile)
+        while not stop.is_set():
+            try:
+                conn.execute("SELECT COUNT(*), MAX(log_id) FROM activity_log").fetchone()
+                with lock:
+                    counts["reads"] += 1
+            except sqlite3.OperationalError:
+                with lock:
+                    counts["busy"] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(READERS)]
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    return counts
+
+
+print(f"{'profile':<12} {'commit ms':>10} {'reads/s':>10} {'writes/s':>10} {'busy':>6}")
+for profile in [None] + list(PROFILES):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        Database(path, profile=profile or "desktop").close()
+        if profile is None:
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.close()
+        latency = commit_latency(path, profile)
+        counts = read_concurrency(path, profile)
+        print(f"{profile or 'stock':<12} {latency:>10.3f} {counts['reads'] / DURATION:>10.0f} "
+              f"{counts['writes'] / DURATION:>10.0f} {counts['busy']:>6}")
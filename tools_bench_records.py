@@ -0,0 +1,54 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from database import Database
+from models import PaymentModel
+from records import record_factory
+
+PAYMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+SQL = "SELECT * FROM payments ORDER BY payment_id"
+
+
+def measure(label, conn, total_of):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = conn.execute(SQL).fetchall()
+    fetched = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    total = 0.0
+    for r in rows:
+        total += total_of(r)
+    iterated = time.perf_counter() - start
+    print(f"{label:<22} {current / len(rows):8.1f} B/row  fetch {fetched:6.2f} s  iterate {iterated:6.2f} s")
+    return total
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "bench.db")
+    db = Database(path, profile="bulk-load")
+    PaymentModel(db).create_many(
+        {"tenant_id": i % 500, "rent": 4500.0, "electricity": 150.0, "water": 80.0,
+         "status": "Paid", "date_paid": "2025-01-01", "note": "Auto-bill"}
+        for i in range(PAYMENTS)
+    )
+    db.close()
+
+    print(f"{PAYMENTS} payments")
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    measure("sqlite3.Row [key]", conn, lambda r: r["total"])
+    conn.row_factory = record_factory
+    measure("Record [key]", conn, lambda r: r["total"])
+    measure("Record .attr", conn, lambda r: r.total)
+    conn.close()
@@ -0,0 +1,51 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from database import Database
+from models import TenantModel
+
+TENANTS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+RUNS = 20
+QUERIES = ["mar", "santos", "juan dela", "0917", "D03", "zzz"]
+
+FIRST = ["Juan", "Maria", "Jose", "Ana", "Pedro", "Rosa", "Carlo", "Liza", "Mark", "Grace"]
+LAST = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Dela Cruz", "Ramos", "Flores", "Aquino"]
+
+
+def bench(model, query):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        rows = model.search(query, limit=200)
+    return (time.perf_counter() - start) / RUNS * 1000, len(rows)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    db = Database(os.path.join(tmp, "bench.db"), profile="bulk-load")
+    rng = random.Random(7)
+    model = TenantModel(db)
+    start = time.perf_counter()
+    model.create_many({
+        "name": f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}",
+        "contact": f"09{rng.randint(10, 99)}{rng.randint(1000000, 9999999)}",
+        "unit_id": rng.randint(1, 50),
+        "tenant_type": "Dorm",
+        "status": "Active",
+    } for i in range(TENANTS))
+    print(f"inserted {TENANTS:,} tenants (with FTS triggers) in {time.perf_counter() - start:.2f} s")
+
+    has_fts = db.has_fts
+    print(f"{'query':<12} {'LIKE ms':>9} {'FTS5 ms':>9} {'hits':>6}")
+    for query in QUERIES:
+        db.has_fts = False
+        like_ms, _ = bench(model, query)
+        db.has_fts = has_fts
+        fts_ms, hits = bench(model, query)
+        print(f"{query:<12} {like_ms:>9.2f} {fts_ms:>9.2f} {hits:>6}")
+    db.close()
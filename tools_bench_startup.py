@@ -0,0 +1,67 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from database import Database, _create_base_tables
+
+RUNS = 50
+
+LEGACY_COLUMNS = [
+    ("units", "capacity", "INTEGER DEFAULT 1"),
+    ("tenants", "guardian_name", "TEXT DEFAULT ''"),
+    ("tenants", "guardian_contact", "TEXT DEFAULT ''"),
+    ("tenants", "guardian_relation", "TEXT DEFAULT ''"),
+    ("tenants", "emergency_contact", "TEXT DEFAULT ''"),
+    ("tenants", "advance_paid", "REAL DEFAULT 0"),
+    ("tenants", "deposit_paid", "REAL DEFAULT 0"),
+    ("tenants", "move_out_reason", "TEXT DEFAULT ''"),
+    ("payments", "note", "TEXT DEFAULT ''"),
+    ("maintenance", "fee", "REAL DEFAULT 0"),
+    ("maintenance", "staff", "TEXT DEFAULT ''"),
+    ("maintenance", "date_completed", "DATE DEFAULT NULL"),
+    ("maintenance", "deleted", "INTEGER DEFAULT 0"),
+    ("staff", "status", "TEXT DEFAULT 'Active'"),
+]
+
+
+def legacy_open(path):
+    # What every startup did before schema versioning: all CREATE TABLE
+    # statements plus one PRAGMA scan (and possible commit) per column.
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+    _create_base_tables(c)
+    conn.commit()
+    for table, column, col_def in LEGACY_COLUMNS:
+        cur = conn.cursor()
+        cur.execute(f"PRAGMA table_info({table})")
+        cols = [r[1] for r in cur.fetchall()]
+        if column not in cols:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_def}")
+            conn.commit()
+    return conn
+
+
+def bench(label, opener, path):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        opener(path).close()
+    elapsed = (time.perf_counter() - start) / RUNS
+    print(f"{label:<28} {elapsed * 1000:8.3f} ms/open")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "bench.db")
+
+    start = time.perf_counter()
+    Database(path).close()
+    print(f"{'cold create + migrate':<28} {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+    bench("legacy per-startup scan", legacy_open, path)
+    bench("versioned (up to date)", Database, path)
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from virtual_tree import sync_tree
+
+ROWS = 50_000
+RUNS = 5
+COLUMNS = ("payment_id", "tenant", "total", "status")
+
+
+def grid_rows(run):
+    # Run ``run`` of a refresh after one payment in the middle changed status.
+    rows = []
+    for i in range(ROWS):
+        status = "Paid" if i == ROWS // 2 and run % 2 else "Due"
+        rows.append((i, (i, f"Tenant {i % 997}", 100.0 + i % 50, status), ()))
+    return rows
+
+
+def reload_all(tree, rows):
+    # What every load_* did before: drop every item and insert them again.
+    tree.delete(*tree.get_children())
+    for key, values, tags in rows:
+        tree.insert("", tk.END, iid=str(key), values=values, tags=tags)
+
+
+def bench(label, root, refresh):
+    tree = ttk.Treeview(root, columns=COLUMNS, show="headings")
+    refresh(tree, grid_rows(0))
+    root.update_idletasks()
+    tree.selection_set(str(ROWS // 2))
+    tree.yview_moveto(0.5)
+    batches = [grid_rows(run) for run in range(1, RUNS + 1)]
+    start = time.perf_counter()
+    for rows in batches:
+        refresh(tree, rows)
+        root.update_idletasks()
+    elapsed = (time.perf_counter() - start) / RUNS
+    kept = "kept" if tree.selection() == (str(ROWS // 2),) else "lost"
+    print(f"{label:<24} {elapsed * 1000:10.1f} ms/refresh   selection {kept}")
+    tree.destroy()
+
+
+try:
+    root = tk.Tk()
+except tk.TclError as e:
+    sys.exit(f"needs a display: {e}")
+root.withdraw()
+print(f"one changed row in a {ROWS:,} row grid")
+bench("delete all + reinsert", root, reload_all)
+bench("sync_tree", root, sync_tree)
+root.destroy()
@@ -0,0 +1,26 @@
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from constants import DB_FILE
+from database import Database
+
+# Usage: python tools_rebuild_rollups.py [path/to/apartment.db]
+path = sys.argv[1] if len(sys.argv) > 1 else DB_FILE
+if not os.path.isfile(path):
+    sys.exit(f"Database not found: {path}")
+
+db = Database(path)
+try:
+    start = time.perf_counter()
+    rows = db.rebuild_rollups()
+    print(f"Rebuilt {rows} monthly rollup rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+    start = time.perf_counter()
+    tenants = db.rebuild_balances()
+    print(f"Rebuilt {tenants} tenant balances in {(time.perf_counter() - start) * 1000:.1f} ms")
+finally:
+    db.close()
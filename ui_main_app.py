@@ -27,6 +27,8 @@ from constants import (
     FAMILY_WATER,
     DORM_ELEC,
     DORM_WATER,
+    PAGE_SIZE,
+    SEARCH_REFINE_LIMIT,
 )
 
 from models import (
@@ -47,8 +49,13 @@ from dialogs import (
     StaffDialog,
     MoveOutDialog,
     ChangePasswordDialog,
+    ProgressDialog,
 )
 from dialogs import ReceiptDialog
+from backup import BackupJob, RestoreJob
+from loader import BackgroundLoader
+from virtual_tree import VirtualTreeview, sync_tree, list_source
+from search import SearchController
 
 
 class MainApp(ctk.CTk):
@@ -63,6 +70,9 @@ class MainApp(ctk.CTk):
         self.activity_model = ActivityLogModel(db)
         self.logout_requested = False
         self.current_view = None
+        self._view_title = ""
+        self.loader = BackgroundLoader(self)
+        self.loader.on_busy_changed = self._show_loading
 
         self.title("Apartment Billing System")
         self.geometry("1280x720")
@@ -181,10 +191,30 @@ class MainApp(ctk.CTk):
         self.body_frame.grid(row=1, column=0, columnspan=3, sticky="nsew", padx=0, pady=0)
 
     def clear_body(self, title):
+        # Results still loading for the old view would land in destroyed widgets.
+        self.loader.cancel_all()
         for w in self.body_frame.winfo_children():
             w.destroy()
+        self._view_title = title
         self.header_label.configure(text=title)
 
+    def _show_loading(self, busy):
+        self.header_label.configure(text=f"{self._view_title}  (loading...)" if busy else self._view_title)
+        self.configure(cursor="watch" if busy else "")
+
+    def destroy(self):
+        self.loader.shutdown()
+        super().destroy()
+
+    def _fill_tree(self, tree, rows):
+        """Show ``rows`` ((key, values, tags)) in ``tree``, touching only the items that changed."""
+        if tree.winfo_exists():
+            sync_tree(tree, rows)
+
+    def _show_total(self, label, total, noun):
+        if label.winfo_exists():
+            label.configure(text=f"{total:,} {noun}")
+
     def logout(self):
         if not messagebox.askyesno("Logout", "Are you sure you want to log out?", parent=self):
             return
@@ -238,7 +268,7 @@ class MainApp(ctk.CTk):
 
         total_units = len(self.unit_model.all())
         active_tenants = len(self.tenant_model.active())
-        vacants = self.db.query("SELECT COUNT(*) as c FROM units WHERE status='Vacant'")[0]["c"]
+        vacants = self.unit_model.status_counts()["Vacant"]
 
         income_30 = self.db.query(
             "SELECT SUM(total) as s FROM payments WHERE date_paid>=?",
@@ -246,6 +276,7 @@ class MainApp(ctk.CTk):
         )[0]["s"] or 0.0
 
         total_req, pending_req = self.maintenance_model.counts()
+        in_arrears, outstanding = self.payment_model.arrears_summary()
 
         title_font = ctk.CTkFont(size=12, weight="bold")
         value_font = ctk.CTkFont(size=26, weight="bold")
@@ -270,7 +301,7 @@ class MainApp(ctk.CTk):
                     sub_lbl.bind("<Button-1>", lambda e: on_click())
             return card
 
-        make_card(0, "TOTAL TENANTS", str(active_tenants), accent="#2f6fff", subtitle="+ demo data", on_click=lambda: self.show_tenants())
+        make_card(0, "TOTAL TENANTS", str(active_tenants), accent="#2f6fff", subtitle=f"{in_arrears} in arrears (₱{outstanding:,.2f} due)", on_click=lambda: self.show_tenants())
         make_card(1, "VACANT UNITS", str(vacants), accent="#2fe6c1", subtitle=f"out of {total_units} units", on_click=lambda: self.show_units())
         make_card(2, "BILLING SUMMARY", f"₱{income_30:,.2f}", accent="#3ad65a", subtitle="Collected this month", on_click=lambda: self.show_billing())
         make_card(3, "MAINTENANCE COUNT", str(pending_req), accent="#ff9a33", subtitle="Pending requests", on_click=lambda: self.show_maintenance())
@@ -297,30 +328,21 @@ class MainApp(ctk.CTk):
             self.dashboard_pay_tree.column(c, width=110, anchor="w")
         self.dashboard_pay_tree.pack(fill="both", expand=True, padx=8, pady=(0,8))
 
-        def row_get(r, k, default=''):
-            try:
-                return r[k] if (r is not None and k in getattr(r, 'keys', lambda: [])()) else default
-            except Exception:
-                try:
-                    return r.get(k, default) if hasattr(r, 'get') else default
-                except Exception:
-                    return default
-
-        payments = list(self.payment_model.all())
+        payments = self.payment_model.page(limit=PAGE_SIZE)
         for p in reversed(payments):
-            tname = row_get(p, 'name', '')
-            tenant_id = row_get(p, 'tenant_id', '')
+            tname = p.get('name', '')
+            tenant_id = p.get('tenant_id', '')
             # fetch unit code from tenant's unit
             unit_code = ''
             if tenant_id:
                 try:
                     tenant_row = self.db.query("SELECT u.unit_code FROM tenants t LEFT JOIN units u ON t.unit_id = u.unit_id WHERE t.tenant_id=?", (tenant_id,))[0]
-                    unit_code = row_get(tenant_row, 'unit_code', '')
+                    unit_code = tenant_row.get('unit_code', '')
                 except Exception:
                     unit_code = ''
-            amount = f"₱{(row_get(p, 'total', 0) or 0):,.2f}"
-            date_paid = row_get(p, 'date_paid', '')
-            status = row_get(p, 'status', '')
+            amount = f"₱{(p.get('total', 0) or 0):,.2f}"
+            date_paid = p.get('date_paid', '')
+            status = p.get('status', '')
             self.dashboard_pay_tree.insert('', tk.END, values=(tname, unit_code, amount, date_paid, status))
 
         maint_card = ctk.CTkFrame(bottom_frame, corner_radius=8, border_width=1, border_color="#2f6fff", fg_color="#061428")
@@ -342,17 +364,17 @@ class MainApp(ctk.CTk):
 
         maints = self.maintenance_model.all()
         for m in maints[-10:]:
-            tenant_id = row_get(m, 'tenant_id', '')
+            tenant_id = m.get('tenant_id', '')
             unit_code = ''
             if tenant_id:
                 try:
                     tenant_row = self.db.query("SELECT u.unit_code FROM tenants t LEFT JOIN units u ON t.unit_id = u.unit_id WHERE t.tenant_id=?", (tenant_id,))[0]
-                    unit_code = row_get(tenant_row, 'unit_code', '')
+                    unit_code = tenant_row.get('unit_code', '')
                 except Exception:
                     unit_code = ''
-            issue = row_get(m, 'description') or row_get(m, 'issue') or ''
-            pr = row_get(m, 'priority', '')
-            st = row_get(m, 'status', '')
+            issue = m.get('description') or ''
+            pr = m.get('priority', '')
+            st = m.get('status', '')
             self.dashboard_maint_tree.insert('', tk.END, values=(unit_code, issue, pr, st))
 
     def show_units(self):
@@ -375,6 +397,10 @@ class MainApp(ctk.CTk):
         self.unit_search_var = tk.StringVar()
         search_e = ctk.CTkEntry(filters_row, width=220, textvariable=self.unit_search_var, placeholder_text="Unit number...")
         search_e.pack(side="left", padx=(0, 12))
+        self.unit_search = SearchController(
+            search_e, self.loader, self.unit_search_var,
+            self._unit_search, self._show_units, self._unit_matches,
+        )
         ctk.CTkButton(filters_row, text="Go", width=70, command=self.load_units).pack(side="left", padx=(0, 12))
 
         ctk.CTkLabel(filters_row, text="Floor:", width=60).pack(side="left", padx=(0, 6))
@@ -386,7 +412,7 @@ class MainApp(ctk.CTk):
         self.unit_status_var = tk.StringVar(value="All Status")
         status_cmb = ctk.CTkComboBox(
             filters_row,
-            values=["All Status", "Vacant", "Occupied"],
+            values=["All Status", "Vacant", "Occupied", "Full"],
             width=140,
             variable=self.unit_status_var,
             command=lambda _v=None: self.load_units()
@@ -430,42 +456,51 @@ class MainApp(ctk.CTk):
         self.load_units()
 
     def load_units(self):
-        if not hasattr(self, "units_tree"):
-            return
-        for r in self.units_tree.get_children():
-            self.units_tree.delete(r)
-
-        status = getattr(self, "unit_status_var", None)
-        status = status.get() if status is not None else "All"
-        
-        search = self.unit_search_var.get().strip().lower() if hasattr(self, "unit_search_var") else ""
-
-        rows = self.unit_model.filter_by_status(status if status in ("Vacant", "Occupied") else None)
-        for u in rows:
-            if search:
-                unit_code = (u["unit_code"] or "").lower()
-                unit_type = (u["unit_type"] or "").lower()
-                if search not in unit_code and search not in unit_type:
-                    continue
-            
+        if not hasattr(self, "unit_search"):
+            return
+        self.unit_search.refresh()
+
+    def _unit_filters(self, query):
+        filters = {}
+        status = self.unit_status_var.get() if hasattr(self, "unit_status_var") else "All"
+        if status in self.unit_model.STATUSES:
+            filters["status"] = status
+        if query:
+            filters["text"] = query
+        return filters
+
+    def _unit_search(self, query):
+        filters = self._unit_filters(query)
+        return lambda: self._fetch_units(filters)
+
+    def _show_units(self, query, rows):
+        self._fill_tree(self.units_tree, rows)
+
+    def _unit_matches(self, row, query):
+        # the same columns as UnitModel's "text" filter
+        query = query.lower()
+        values = row[1]
+        return query in (values[1] or "").lower() or query in (values[2] or "").lower()
+
+    def _fetch_units(self, filters):
+        items = []
+        occupants = self.tenant_model.occupants_by_unit()
+        for u in self.unit_model.find(filters):
             tenant_list = ""
             if u["unit_type"].lower() == "dorm":
-                tenants = self.tenant_model.tenants_in_unit(u["unit_id"])
+                tenants = occupants.get(u["unit_id"])
                 if tenants:
                     tenant_list = ", ".join(f"[{t['tenant_id']}] {t['name']}" for t in tenants)
-            self.units_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    u["unit_id"],
-                    u["unit_code"],
-                    u["unit_type"],
-                    f"₱{u['price']:.2f}",
-                    u["status"],
-                    u["capacity"],
-                    tenant_list
-                )
-            )
+            items.append((u["unit_id"], (
+                u["unit_id"],
+                u["unit_code"],
+                u["unit_type"],
+                f"₱{u['price']:.2f}",
+                u["status"],
+                u["capacity"],
+                tenant_list
+            ), ()))
+        return items
 
     def get_selected_unit_id(self):
         if not hasattr(self, "units_tree"):
@@ -505,8 +540,7 @@ class MainApp(ctk.CTk):
         if new_cap < 0:
             messagebox.showwarning("Input", "Capacity cannot be negative.", parent=self)
             return
-        tenants = self.tenant_model.tenants_in_unit(uid)
-        current = len(tenants)
+        current = unit["occupant_count"]
         if new_cap < current:
             if not messagebox.askyesno("Capacity Reduction", f"New capacity ({new_cap}) is less than current occupants ({current}).\nDo you want to proceed?", parent=self):
                 return
@@ -515,16 +549,6 @@ class MainApp(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update capacity: {e}", parent=self)
             return
-        if current >= new_cap:
-            new_status = 'Full'
-        elif current > 0:
-            new_status = 'Occupied'
-        else:
-            new_status = 'Vacant'
-        try:
-            self.unit_model.update_status(uid, new_status)
-        except Exception:
-            pass
         self.load_units()
         messagebox.showinfo("Saved", f"Capacity for {unit['unit_code']} set to {new_cap}.", parent=self)
 
@@ -547,6 +571,11 @@ class MainApp(ctk.CTk):
         self.tenant_search_var = tk.StringVar()
         search_e = ctk.CTkEntry(filters_row, width=420, textvariable=self.tenant_search_var, placeholder_text="Search by name, email, phone, or unit")
         search_e.pack(side="left", padx=(0,12))
+        self.tenant_search = SearchController(
+            search_e, self.loader, self.tenant_search_var,
+            self._tenant_search, self._show_tenants, self._tenant_matches,
+            refines=self._tenant_refines,
+        )
         ctk.CTkButton(filters_row, text="Go", width=70, command=self.load_tenants).pack(side="left", padx=(0,12))
 
         ctk.CTkLabel(filters_row, text="Status Filter:", width=110).pack(side="left", padx=(0,6))
@@ -573,64 +602,99 @@ class MainApp(ctk.CTk):
             "tenant_type",
             "move_in",
             "status",
+            "balance_due",
+            "months_in_arrears",
+        )
+        self.tenants_tree = VirtualTreeview(
+            table_box, self.loader, cols, style="WhiteBlueprint.Treeview",
+            on_total=lambda n: self._show_total(self.tenant_page_lbl, n, "tenants"),
         )
-        self.tenants_tree = ttk.Treeview(table_box, columns=cols, show="headings", style="WhiteBlueprint.Treeview")
         for c in cols:
             self.tenants_tree.heading(c, text=c.replace("_", " ").title())
             self.tenants_tree.column(c, minwidth=140, stretch=True, anchor="w")
         self.tenants_tree.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
 
-        vsb = ttk.Scrollbar(table_box, orient="vertical", command=self.tenants_tree.yview)
-        self.tenants_tree.configure(yscrollcommand=vsb.set)
-        vsb.grid(row=0, column=1, sticky="ns", padx=(0,8), pady=8)
+        self.tenant_page_lbl = ctk.CTkLabel(table_box, text="", text_color="#9fc5ff")
+        self.tenant_page_lbl.grid(row=1, column=0, sticky="w", padx=12, pady=(0,6))
+
+        try:
+            self.tenants_tree.tag_configure("arrears", foreground="red")
+        except Exception:
+            pass
 
         self.load_tenants()
 
     def load_tenants(self):
-        if not hasattr(self, "tenants_tree"):
-            return
-        for r in self.tenants_tree.get_children():
-            self.tenants_tree.delete(r)
+        if not hasattr(self, "tenant_search"):
+            return
+        self.tenant_search.refresh()
+
+    def _tenant_search(self, query):
+        def fetch():
+            # A query's best matches are ranked and held while they are few
+            # enough to narrow in memory; past that, and with no query, the
+            # grid pages through the tenants in SQL.
+            if not query:
+                return None
+            rows = self.tenant_model.search(query, limit=SEARCH_REFINE_LIMIT + 1)
+            return self._tenant_items(rows) if len(rows) <= SEARCH_REFINE_LIMIT else None
+
+        return fetch
+
+    def _show_tenants(self, query, rows):
+        if not self.tenants_tree.winfo_exists():
+            return
+        filters = {"status": "Active"}
+        if query:
+            filters["text"] = query
+        source = ("tenants", tuple(sorted(filters.items())))
+        if rows is None:
+            self.tenants_tree.set_source(
+                lambda after, offset, limit: self._fetch_tenants(after, offset, limit, filters),
+                lambda: self.tenant_model.count(filters),
+                source=source,
+            )
+        else:
+            fetch, count = list_source(rows)
+            self.tenants_tree.set_source(fetch, count, source=source)
 
-        query = self.tenant_search_var.get().strip().lower() if hasattr(self, "tenant_search_var") else ""
-        rows = self.tenant_model.active()
-        
-        for t in rows:
-            if query:
-                name = (t["name"] or "").lower()
-                contact = (t["contact"] or "").lower()
-                tid_str = str(t["tenant_id"] or "")
-                if query not in name and query not in contact and query not in tid_str:
-                    continue
+    def _tenant_matches(self, row, query):
+        # name, contact and unit code, the columns TenantModel.search looks at
+        return self.tenant_model.text_matches(row[1][1:4], query)
 
-            self.tenants_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    t["tenant_id"],
-                    t["name"],
-                    t["contact"] or "",
-                    t["unit_code"] or "",
-                    t["tenant_type"] or "",
-                    t["move_in"] or "",
-                    t["status"] or "",
-                )
-            )
+    @staticmethod
+    def _tenant_refines(previous, query):
+        # A numeric query also finds that tenant_id, which need not be among
+        # the matches of a shorter number.
+        return query.startswith(previous) and not query.isdigit()
+
+    def _fetch_tenants(self, after, offset, limit, filters):
+        return self._tenant_items(self.tenant_model.page(after_id=after, limit=limit, filters=filters, offset=offset))
+
+    def _tenant_items(self, rows):
+        balances = self.payment_model.balances(t["tenant_id"] for t in rows)
+        items = []
+        for t in rows:
+            balance = balances.get(t["tenant_id"])
+            due = balance["outstanding_due"] if balance else 0.0
+            arrears = balance["months_in_arrears"] if balance else 0
+            items.append((t["tenant_id"], (
+                t["tenant_id"],
+                t["name"],
+                t["contact"] or "",
+                t["unit_code"] or "",
+                t["tenant_type"] or "",
+                t["move_in"] or "",
+                t["status"] or "",
+                f"₱{due:,.2f}",
+                arrears,
+            ), ("arrears",) if arrears > 0 else ()))
+        return items
 
     def get_selected_tenant_id(self):
         if not hasattr(self, "tenants_tree"):
             return None
-        sel = self.tenants_tree.selection()
-        if not sel:
-            return None
-        item = self.tenants_tree.item(sel[0])
-        vals = item["values"]
-        if not vals:
-            return None
-        try:
-            return int(vals[0])
-        except (TypeError, ValueError):
-            return None
+        return self.tenants_tree.selected_key()
 
     def add_tenant(self):
         dlg = TenantDialog(self, self.unit_model, self.tenant_model)
@@ -638,7 +702,6 @@ class MainApp(ctk.CTk):
         if dlg.saved:
             data = dlg.result
             self.tenant_model.create(**data)
-            self.unit_model.update_status(data["unit_id"], "Occupied")
             self.load_tenants()
             self.log_action("Add Tenant", f"{data['name']} (unit_id={data['unit_id']})")
             messagebox.showinfo("Saved", "Tenant added.", parent=self)
@@ -658,13 +721,7 @@ class MainApp(ctk.CTk):
         self.wait_window(dlg)
         if dlg.saved:
             data = dlg.result
-            old_unit_id = tenant["unit_id"]
-            new_unit_id = data["unit_id"]
             self.tenant_model.update(tid, **data)
-            if old_unit_id != new_unit_id:
-                if not self.tenant_model.tenants_in_unit(old_unit_id):
-                    self.unit_model.update_status(old_unit_id, "Vacant")
-                self.unit_model.update_status(new_unit_id, "Occupied")
             self.load_tenants()
             self.log_action("Edit Tenant", f"{data['name']} (tenant_id={tid})")
             messagebox.showinfo("Saved", "Tenant updated.", parent=self)
@@ -692,10 +749,6 @@ class MainApp(ctk.CTk):
         move_out_date = datetime.date.today().isoformat()
         self.tenant_model.terminate(tid, move_out_date, dlg.reason)
 
-        if tenant["unit_id"]:
-            if not self.tenant_model.tenants_in_unit(tenant["unit_id"]):
-                self.unit_model.update_status(tenant["unit_id"], "Vacant")
-
         self.load_tenants()
         self.log_action("Terminate Tenant", f"{tenant['name']} (tenant_id={tid}) - {dlg.reason}")
         messagebox.showinfo("Terminated", "Tenant moved out / terminated.", parent=self)
@@ -726,10 +779,35 @@ class MainApp(ctk.CTk):
         )
         self.pay_type_cmb.pack(side="left", padx=(0,12))
 
+        ctk.CTkLabel(filters_row, text="Status:", width=60).pack(side="left", padx=(0,6))
+        self.pay_status_var = tk.StringVar(value="All")
+        ctk.CTkComboBox(
+            filters_row,
+            values=["All", "Paid", "Due", "Overdue"],
+            width=120,
+            variable=self.pay_status_var,
+            command=lambda _v=None: self.load_payments()
+        ).pack(side="left", padx=(0,12))
+
+        ctk.CTkLabel(filters_row, text="Paid From:", width=80).pack(side="left", padx=(0,6))
+        self.pay_from_var = tk.StringVar()
+        pay_from_e = ctk.CTkEntry(filters_row, width=110, textvariable=self.pay_from_var, placeholder_text="YYYY-MM-DD")
+        pay_from_e.pack(side="left", padx=(0,6))
+        ctk.CTkLabel(filters_row, text="To:", width=30).pack(side="left", padx=(0,6))
+        self.pay_to_var = tk.StringVar()
+        pay_to_e = ctk.CTkEntry(filters_row, width=110, textvariable=self.pay_to_var, placeholder_text="YYYY-MM-DD")
+        pay_to_e.pack(side="left", padx=(0,12))
+        for entry in (pay_from_e, pay_to_e):
+            entry.bind("<Return>", lambda _e: self.load_payments())
+
         ctk.CTkLabel(filters_row, text="Search:", width=80).pack(side="left", padx=(0,6))
         self.pay_search_var = tk.StringVar()
         pay_search_e = ctk.CTkEntry(filters_row, width=220, textvariable=self.pay_search_var, placeholder_text="Name / Tenant ID")
         pay_search_e.pack(side="left", padx=(0,12))
+        self.pay_search = SearchController(
+            pay_search_e, self.loader, self.pay_search_var,
+            self._payment_search, self._show_payments, self._payment_matches,
+        )
         ctk.CTkButton(filters_row, text="Go", width=70, command=self.load_payments).pack(side="left", padx=(0,12))
 
         actions = ctk.CTkFrame(filter_box, fg_color="transparent")
@@ -746,15 +824,17 @@ class MainApp(ctk.CTk):
         table_box.grid_columnconfigure(0, weight=1)
 
         cols = ("payment_id", "tenant", "tenant_type", "rent", "electricity", "water", "total", "date_paid", "status")
-        self.pay_tree = ttk.Treeview(table_box, columns=cols, show="headings", style="WhiteBlueprint.Treeview")
+        self.pay_tree = VirtualTreeview(
+            table_box, self.loader, cols, style="WhiteBlueprint.Treeview",
+            on_total=lambda n: self._show_total(self.pay_page_lbl, n, "payments"),
+        )
         for c in cols:
             self.pay_tree.heading(c, text=c.replace("_", " ").title())
             self.pay_tree.column(c, minwidth=130, stretch=True, anchor="w")
         self.pay_tree.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
 
-        vsb = ttk.Scrollbar(table_box, orient="vertical", command=self.pay_tree.yview)
-        self.pay_tree.configure(yscrollcommand=vsb.set)
-        vsb.grid(row=0, column=1, sticky="ns", padx=(0,8), pady=8)
+        self.pay_page_lbl = ctk.CTkLabel(table_box, text="", text_color="#9fc5ff")
+        self.pay_page_lbl.grid(row=1, column=0, sticky="w", padx=12, pady=(0,6))
 
         try:
             self.pay_tree.tag_configure("overdue", foreground="red")
@@ -763,48 +843,93 @@ class MainApp(ctk.CTk):
 
         self.load_payments()
 
+    def _payment_filters(self, query):
+        filters = {}
+        selected_type = self.pay_type_var.get() if hasattr(self, "pay_type_var") else "All"
+        if selected_type != "All":
+            filters["tenant_type"] = selected_type
+        status = self.pay_status_var.get() if hasattr(self, "pay_status_var") else "All"
+        if status != "All":
+            filters["status"] = status
+        # "To" is inclusive on screen and exclusive in the model; dates that
+        # do not parse are left out of the filter.
+        date_from = self._entry_date(getattr(self, "pay_from_var", None))
+        if date_from is not None:
+            filters["date_from"] = date_from.isoformat()
+        date_to = self._entry_date(getattr(self, "pay_to_var", None))
+        if date_to is not None:
+            filters["date_to"] = (date_to + datetime.timedelta(days=1)).isoformat()
+        if query:
+            filters["text"] = query
+        return filters
+
+    def _entry_date(self, var):
+        text = var.get().strip() if var is not None else ""
+        try:
+            return datetime.date.fromisoformat(text) if text else None
+        except ValueError:
+            return None
+
     def load_payments(self):
-        if not hasattr(self, "pay_tree"):
+        if not hasattr(self, "pay_search"):
             return
-        for r in self.pay_tree.get_children():
-            self.pay_tree.delete(r)
+        self.pay_search.refresh()
 
-        selected_type = self.pay_type_var.get() if hasattr(self, "pay_type_var") else "All"
-        search = self.pay_search_var.get().strip().lower() if hasattr(self, "pay_search_var") else ""
-        for row in self.payment_model.all():
-            ttype = (row["tenant_type"] or "").title()
-            if selected_type != "All" and ttype.lower() != selected_type.lower():
-                continue
+    def _payment_search(self, query):
+        filters = self._payment_filters(query)
 
-            if search:
-                name = (row["name"] or "").lower()
-                note = (row["note"] or "").lower()
-                tid_str = str(row["tenant_id"] or "")
-                if search not in name and search not in note and search not in tid_str:
-                    continue
+        def fetch():
+            # Few enough matches are held so a longer query narrows them in
+            # memory; past that the grid pages through the query in SQL.
+            rows = self.payment_model.page(limit=SEARCH_REFINE_LIMIT + 1, filters=filters)
+            return rows if len(rows) <= SEARCH_REFINE_LIMIT else None
+
+        return fetch
 
-            tags = ()
-            st = (row["status"] or "").lower()
-            if st in ("overdue", "due"):
-                tags = ("overdue",)
-
-            self.pay_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    row["payment_id"],
-                    row["name"] or "",
-                    ttype,
-                    row["rent"] or 0.0,
-                    row["electricity"] or 0.0,
-                    row["water"] or 0.0,
-                    row["total"] or 0.0,
-                    row["date_paid"] or "",
-                    row["status"] or "",
-                    row["note"] or "",
-                ),
-                tags=tags
+    def _show_payments(self, query, rows):
+        if not self.pay_tree.winfo_exists():
+            return
+        filters = self._payment_filters(query)
+        source = ("payments", tuple(sorted(filters.items())))
+        if rows is None:
+            self.pay_tree.set_source(
+                lambda after, offset, limit: self._fetch_payments(after, offset, limit, filters),
+                # Payments are never deleted, so with no filter the key
+                # range is the row count and no scan is needed.
+                (lambda: self.payment_model.count(filters)) if filters else self.payment_model.estimate_count,
+                source=source,
             )
+        else:
+            fetch, count = list_source((row["payment_id"], *self._payment_item(row)) for row in rows)
+            self.pay_tree.set_source(fetch, count, source=source)
+
+    def _payment_matches(self, row, query):
+        # the same columns as PaymentModel's "text" filter
+        query = query.lower()
+        return (query in (row["name"] or "").lower() or query in (row["note"] or "").lower()
+                or query in str(row["tenant_id"] or ""))
+
+    def _fetch_payments(self, after, offset, limit, filters):
+        rows = self.payment_model.page(after_id=after, limit=limit, filters=filters, offset=offset)
+        return [(row["payment_id"], *self._payment_item(row)) for row in rows]
+
+    def _payment_item(self, row):
+        tags = ()
+        st = (row["status"] or "").lower()
+        if st in ("overdue", "due"):
+            tags = ("overdue",)
+        return ((
+            row["payment_id"],
+            row["name"] or "",
+            (row["tenant_type"] or "").title(),
+            row["rent"] or 0.0,
+            row["electricity"] or 0.0,
+            row["water"] or 0.0,
+            row["total"] or 0.0,
+            row["date_paid"] or "",
+            row["status"] or "",
+            row["note"] or "",
+        ), tags)
 
     def new_payment(self):
         dlg = PaymentDialog(self)
@@ -821,17 +946,7 @@ class MainApp(ctk.CTk):
     def get_selected_payment_id(self):
         if not hasattr(self, "pay_tree"):
             return None
-        sel = self.pay_tree.selection()
-        if not sel:
-            return None
-        item = self.pay_tree.item(sel[0])
-        vals = item["values"]
-        if not vals:
-            return None
-        try:
-            return int(vals[0])
-        except (TypeError, ValueError):
-            return None
+        return self.pay_tree.selected_key()
 
     def mark_payment_paid(self):
         payment_id = self.get_selected_payment_id()
@@ -884,22 +999,11 @@ class MainApp(ctk.CTk):
     def edit_payment(self):
         if not hasattr(self, "pay_tree"):
             return
-        sel = self.pay_tree.selection()
-        if not sel:
+        payment_id = self.get_selected_payment_id()
+        if not payment_id:
             messagebox.showwarning("Select", "Please select a payment to edit.", parent=self)
             return
 
-        item = self.pay_tree.item(sel[0])
-        vals = item["values"]
-        if not vals:
-            return
-        payment_id = vals[0]
-        try:
-            payment_id = int(payment_id)
-        except (TypeError, ValueError):
-            messagebox.showwarning("Error", "Invalid payment ID.", parent=self)
-            return
-
         row = self.payment_model.get(payment_id)
         if not row:
             messagebox.showwarning("Not Found", "Payment not found.", parent=self)
@@ -946,47 +1050,46 @@ class MainApp(ctk.CTk):
         note = f"Auto-bill {month_label}"
 
         active_tenants = self.tenant_model.active()
+        roommate_counts = self.tenant_model.occupant_counts()
         created_count = 0
 
-        for t in active_tenants:
-            tenant_id = t["tenant_id"]
-            if self.payment_model.invoice_exists_with_note(tenant_id, note):
-                continue
+        with self.db.transaction():
+            for t in active_tenants:
+                tenant_id = t["tenant_id"]
+                if self.payment_model.invoice_exists_with_note(tenant_id, note):
+                    continue
 
-            rent = t["room_price"] or 0.0
-            ut = (t["tenant_type"] or "").strip().lower()
-            unit_id = t.get("unit_id")
-            
-            if ut == "solo":
-                elec, water = SOLO_ELEC, SOLO_WATER
-            elif ut == "family":
-                elec, water = FAMILY_ELEC, FAMILY_WATER
-            elif ut == "dorm":
-                # For dorm: split utilities equally among all roommates in the unit
-                if unit_id:
-                    roommates = self.tenant_model.tenants_in_unit(unit_id)
-                    roommate_count = len(roommates) if roommates else 1
-                    elec = (DORM_ELEC / roommate_count) if roommate_count > 0 else DORM_ELEC
-                    water = (DORM_WATER / roommate_count) if roommate_count > 0 else DORM_WATER
+                rent = t["room_price"] or 0.0
+                ut = (t["tenant_type"] or "").strip().lower()
+                unit_id = t.get("unit_id")
+
+                if ut == "solo":
+                    elec, water = SOLO_ELEC, SOLO_WATER
+                elif ut == "family":
+                    elec, water = FAMILY_ELEC, FAMILY_WATER
+                elif ut == "dorm":
+                    # For dorm: split utilities equally among all roommates in the unit
+                    if unit_id:
+                        roommate_count = roommate_counts.get(unit_id) or 1
+                        elec = (DORM_ELEC / roommate_count) if roommate_count > 0 else DORM_ELEC
+                        water = (DORM_WATER / roommate_count) if roommate_count > 0 else DORM_WATER
+                    else:
+                        elec, water = DORM_ELEC, DORM_WATER
                 else:
-                    elec, water = DORM_ELEC, DORM_WATER
-            else:
-                elec = water = 0.0
-            if ut == "dorm" and unit_id:
-                roommates = self.tenant_model.tenants_in_unit(unit_id)
-                split_note = f"{note} (split {len(roommates)} roommates)"
-            else:
-                split_note = note
+                    elec = water = 0.0
+                if ut == "dorm" and unit_id:
+                    split_note = f"{note} (split {roommate_counts.get(unit_id, 0)} roommates)"
+                else:
+                    split_note = note
 
-            self.payment_model.create_due(tenant_id, rent, elec, water, note=split_note)
-            created_count += 1
+                self.payment_model.create_due(tenant_id, rent, elec, water, note=split_note)
+                created_count += 1
 
         self.load_payments()
         messagebox.showinfo("Auto-Billing", f"Generated {created_count} new invoice(s).\nDorm utilities split equally among roommates.", parent=self)
 
     def export_payments_csv(self):
-        rows = self.payment_model.all()
-        if not rows:
+        if not self.payment_model.count():
             messagebox.showwarning("No Data", "No payments to export.", parent=self)
             return
 
@@ -1003,7 +1106,7 @@ class MainApp(ctk.CTk):
             w = csv.writer(f)
             w.writerow(["payment_id", "tenant", "tenant_type", "rent", "electricity", "water",
                         "total", "date_paid", "status", "note"])
-            for r in rows:
+            for r in self.payment_model.iter_all():
                 w.writerow([
                     r["payment_id"],
                     r["name"] or "",
@@ -1019,8 +1122,7 @@ class MainApp(ctk.CTk):
         messagebox.showinfo("Exported", f"Saved to {path}", parent=self)
 
     def export_payments_excel(self):
-        rows = self.payment_model.all()
-        if not rows:
+        if not self.payment_model.count():
             messagebox.showwarning("No Data", "No payments to export.", parent=self)
             return
         if Workbook is None:
@@ -1035,12 +1137,11 @@ class MainApp(ctk.CTk):
         if not path:
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Payments"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Payments")
         headers = ["Payment ID", "Tenant", "Tenant Type", "Rent", "Electricity", "Water", "Total", "Date Paid", "Status", "Note"]
         ws.append(headers)
-        for r in rows:
+        for r in self.payment_model.iter_all():
             ws.append([
                 r["payment_id"],
                 r["name"] or "",
@@ -1057,8 +1158,7 @@ class MainApp(ctk.CTk):
         messagebox.showinfo("Exported", f"Saved to {path}", parent=self)
 
     def export_tenants_excel(self):
-        rows = self.tenant_model.all()
-        if not rows:
+        if not self.tenant_model.count():
             messagebox.showwarning("No Data", "No tenants to export.", parent=self)
             return
         if Workbook is None:
@@ -1073,13 +1173,11 @@ class MainApp(ctk.CTk):
         if not path:
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Tenants"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Tenants")
         headers = ["Tenant ID", "Name", "Contact", "Unit Code", "Tenant Type", "Move In", "Status", "Advance Paid", "Deposit Paid"]
         ws.append(headers)
-        rows_all = self.tenant_model.all()
-        for t in rows_all:
+        for t in self.tenant_model.iter_all():
             ws.append([
                 t["tenant_id"],
                 t["name"] or "",
@@ -1111,9 +1209,8 @@ class MainApp(ctk.CTk):
         if not path:
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Units"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Units")
         headers = ["Unit ID", "Unit Code", "Unit Type", "Price", "Status", "Capacity"]
         ws.append(headers)
         for u in rows:
@@ -1151,40 +1248,39 @@ class MainApp(ctk.CTk):
         table_box.grid_columnconfigure(0, weight=1)
 
         cols = ("request_id", "tenant_id", "tenant_name", "description", "priority", "date_requested", "date_completed", "status", "fee", "staff")
-        self.maint_tree = ttk.Treeview(table_box, columns=cols, show="headings", style="WhiteBlueprint.Treeview")
+        self.maint_tree = VirtualTreeview(
+            table_box, self.loader, cols, style="WhiteBlueprint.Treeview",
+            on_total=lambda n: self._show_total(self.maint_page_lbl, n, "requests"),
+        )
         for c in cols:
             self.maint_tree.heading(c, text=c.replace("_", " ").title())
             self.maint_tree.column(c, minwidth=100, stretch=True, anchor="w")
         self.maint_tree.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
 
-        vsb = ttk.Scrollbar(table_box, orient="vertical", command=self.maint_tree.yview)
-        self.maint_tree.configure(yscrollcommand=vsb.set)
-        vsb.grid(row=0, column=1, sticky="ns", padx=(0,8), pady=8)
+        self.maint_page_lbl = ctk.CTkLabel(table_box, text="", text_color="#9fc5ff")
+        self.maint_page_lbl.grid(row=1, column=0, sticky="w", padx=12, pady=(0,6))
 
         self.load_maintenance()
 
     def load_maintenance(self):
         if not hasattr(self, "maint_tree"):
             return
-        for r in self.maint_tree.get_children():
-            self.maint_tree.delete(r)
-        for m in self.maintenance_model.all():
-            self.maint_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    m["request_id"],
-                    m["tenant_id"] or "",
-                    m["tenant_name"] or "",
-                    m["description"] or "",
-                    m["priority"] or "",
-                    m["date_requested"] or "",
-                    m["date_completed"] or "",
-                    m["status"] or "",
-                    m["fee"] or 0.0,
-                    m["staff"] or "",
-                )
-            )
+        self.maint_tree.set_source(self._fetch_maintenance, self.maintenance_model.count, source=("maintenance",))
+
+    def _fetch_maintenance(self, after, offset, limit):
+        rows = self.maintenance_model.page(after_id=after, limit=limit, offset=offset)
+        return [(m["request_id"], (
+            m["request_id"],
+            m["tenant_id"] or "",
+            m["tenant_name"] or "",
+            m["description"] or "",
+            m["priority"] or "",
+            m["date_requested"] or "",
+            m["date_completed"] or "",
+            m["status"] or "",
+            m["fee"] or 0.0,
+            m["staff"] or "",
+        ), ()) for m in rows]
 
     def new_maintenance(self):
         dlg = MaintenanceDialog(self, self.staff_model)
@@ -1200,23 +1296,12 @@ class MainApp(ctk.CTk):
     def get_selected_maintenance_id(self):
         if not hasattr(self, "maint_tree"):
             return None
-        sel = self.maint_tree.selection()
-        if not sel:
-            return None
-        item = self.maint_tree.item(sel[0])
-        vals = item.get("values") or []
-        if not vals:
-            return None
-        try:
-            return int(vals[0])
-        except (TypeError, ValueError):
-            return None
+        return self.maint_tree.selected_key()
 
     def mark_maintenance_in_progress(self):
         # Auto-select the first pending request
-        all_requests = self.maintenance_model.all()
-        pending_requests = [m for m in all_requests if (m["status"] or "").lower() == "pending"]
-        
+        pending_requests = self.maintenance_model.page(limit=1, filters={"status": "Pending"})
+
         if not pending_requests:
             messagebox.showinfo("No Pending", "No pending maintenance requests to mark in progress.", parent=self)
             return
@@ -1229,17 +1314,17 @@ class MainApp(ctk.CTk):
         messagebox.showinfo("Updated", f"Request #{req_id} marked as In Progress.", parent=self)
 
     def mark_maintenance_completed(self):
-        all_requests = self.maintenance_model.all()
-        in_progress_requests = [m for m in all_requests if (m["status"] or "").lower() == "in progress"]
-        
+        in_progress_requests = self.maintenance_model.page(limit=1, filters={"status": "In Progress"})
+
         if not in_progress_requests:
             messagebox.showinfo("No In Progress", "No in-progress maintenance requests to mark completed.", parent=self)
             return
         req_id = in_progress_requests[0]["request_id"]
         
-        self.maintenance_model.update_status(req_id, "Completed")
-        self.db.execute("UPDATE maintenance SET date_completed=? WHERE request_id=?", 
-                       (datetime.date.today().isoformat(), req_id))
+        with self.db.transaction():
+            self.maintenance_model.update_status(req_id, "Completed")
+            self.db.execute("UPDATE maintenance SET date_completed=? WHERE request_id=?", 
+                           (datetime.date.today().isoformat(), req_id))
         self.load_maintenance()
         self.log_action("Maintenance Completed", f"request_id={req_id}")
         messagebox.showinfo("Completed", f"Request #{req_id} marked as completed.", parent=self)
@@ -1329,25 +1414,21 @@ class MainApp(ctk.CTk):
     def load_deleted_maintenance(self):
         if not hasattr(self, "deleted_maint_tree"):
             return
-        for r in self.deleted_maint_tree.get_children():
-            self.deleted_maint_tree.delete(r)
+        rows = []
         for m in self.maintenance_model.all_including_deleted():
             if m.get("deleted") == 1:
-                self.deleted_maint_tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        m["request_id"],
-                        m["tenant_id"] or "",
-                        m["tenant_name"] or "",
-                        m["description"] or "",
-                        m["priority"] or "",
-                        m["date_requested"] or "",
-                        m["status"] or "",
-                        m["fee"] or 0.0,
-                        m["staff"] or "",
-                    )
-                )
+                rows.append((m["request_id"], (
+                    m["request_id"],
+                    m["tenant_id"] or "",
+                    m["tenant_name"] or "",
+                    m["description"] or "",
+                    m["priority"] or "",
+                    m["date_requested"] or "",
+                    m["status"] or "",
+                    m["fee"] or 0.0,
+                    m["staff"] or "",
+                ), ()))
+        self._fill_tree(self.deleted_maint_tree, rows)
 
     def get_selected_deleted_maintenance_id(self):
         if not hasattr(self, "deleted_maint_tree"):
@@ -1436,21 +1517,16 @@ class MainApp(ctk.CTk):
     def load_staff(self):
         if not hasattr(self, "staff_tree"):
             return
-        for r in self.staff_tree.get_children():
-            self.staff_tree.delete(r)
         view = (self.staff_view_var.get() if hasattr(self, "staff_view_var") else "Active").lower()
-        rows = self.staff_model.all()
-        for s in rows:
-            st = (s.get("status") or "").lower() if isinstance(s, dict) else ((s[4] or "").lower() if len(s) > 4 else "")
+        rows = []
+        for s in self.staff_model.all():
+            st = (s["status"] or "").lower()
             if view == "active" and st != "active":
                 continue
             if view == "archived" and st != "archived":
                 continue
-            self.staff_tree.insert(
-                "",
-                tk.END,
-                values=(s["staff_id"], s["name"], s["contact"], s["role"], s["status"])
-            )
+            rows.append((s["staff_id"], (s["staff_id"], s["name"], s["contact"], s["role"], s["status"]), ()))
+        self._fill_tree(self.staff_tree, rows)
 
     def get_selected_staff_id(self):
         if not hasattr(self, "staff_tree"):
@@ -1518,8 +1594,7 @@ class MainApp(ctk.CTk):
             return
         try:
             for s in archived:
-                sid = s['staff_id'] if isinstance(s, dict) else s[0]
-                self.staff_model.delete(sid)
+                self.staff_model.delete(s["staff_id"])
         except Exception:
             messagebox.showerror("Error", "Failed to remove archived staff.", parent=self)
             return
@@ -1588,23 +1663,17 @@ class MainApp(ctk.CTk):
     def load_recycle(self):
         if not hasattr(self, "recycle_tree"):
             return
-        for r in self.recycle_tree.get_children():
-            self.recycle_tree.delete(r)
-        for t in self.tenant_model.terminated():
-            self.recycle_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    t["tenant_id"],
-                    t["name"],
-                    t["contact"] or "",
-                    t["unit_code"] or "",
-                    t["tenant_type"] or "",
-                    t["move_in"] or "",
-                    t["move_out"] or "",
-                    t["move_out_reason"] or "",
-                )
-            )
+        rows = [(t["tenant_id"], (
+            t["tenant_id"],
+            t["name"],
+            t["contact"] or "",
+            t["unit_code"] or "",
+            t["tenant_type"] or "",
+            t["move_in"] or "",
+            t["move_out"] or "",
+            t["move_out_reason"] or "",
+        ), ()) for t in self.tenant_model.terminated()]
+        self._fill_tree(self.recycle_tree, rows)
 
     def get_selected_recycle_tenant_id(self):
         if not hasattr(self, "recycle_tree"):
@@ -1633,8 +1702,6 @@ class MainApp(ctk.CTk):
             return
 
         self.tenant_model.restore(tid)
-        if t["unit_id"]:
-            self.unit_model.update_status(t["unit_id"], "Occupied")
 
         self.load_recycle()
         messagebox.showinfo("Restored", "Tenant restored to Active status.", parent=self)
@@ -1692,6 +1759,8 @@ class MainApp(ctk.CTk):
         ctk.CTkButton(filters_row, text="Generate", width=120, command=self.load_reports).pack(side="left", padx=8)
         ctk.CTkButton(filters_row, text="Export PDF", width=120, command=lambda: None).pack(side="left", padx=8)
         ctk.CTkButton(filters_row, text="Export CSV", width=120, command=lambda: None).pack(side="left", padx=8)
+        ctk.CTkButton(filters_row, text="Backup DB", width=120, command=self.backup_database).pack(side="left", padx=8)
+        ctk.CTkButton(filters_row, text="Restore DB", width=120, command=self.restore_database).pack(side="left", padx=8)
 
         table_box = ctk.CTkFrame(frame, corner_radius=8, border_width=1, border_color="#2f6fff", fg_color="#061428")
         table_box.grid(row=2, column=0, sticky="nsew", padx=8, pady=0)
@@ -1720,7 +1789,7 @@ class MainApp(ctk.CTk):
         lbl.grid(row=1, column=0, sticky="w", padx=8, pady=(4,2))
 
         cols = ("timestamp", "action", "details")
-        self.logs_tree = ttk.Treeview(table_box, columns=cols, show="headings", style="White.Treeview")
+        self.logs_tree = VirtualTreeview(table_box, self.loader, cols, style="White.Treeview")
         for c in cols:
             self.logs_tree.heading(c, text=c.title())
             if c == "timestamp":
@@ -1731,32 +1800,69 @@ class MainApp(ctk.CTk):
                 self.logs_tree.column(c, minwidth=200, stretch=True, anchor="w")
         self.logs_tree.grid(row=2, column=0, sticky="nsew", padx=8, pady=(0,8))
 
-        vsb = ttk.Scrollbar(table_box, orient="vertical", command=self.logs_tree.yview)
-        self.logs_tree.configure(yscrollcommand=vsb.set)
-        vsb.grid(row=2, column=1, sticky="ns", padx=(0,8), pady=(0,8))
-
         self.load_reports()
         self.load_activity_logs()
 
     def load_reports(self):
         year = self.rep_year_var.get() if hasattr(self, "rep_year_var") else datetime.date.today().year
         month = self.rep_month_var.get() if hasattr(self, "rep_month_var") else datetime.date.today().month
+        self.loader.submit("reports", lambda: self._fetch_reports(year, month), self._show_reports_data)
 
+    def _fetch_reports(self, year, month):
         income = self.payment_model.total_for_month(year, month)
         maint_cost = self.maintenance_model.total_fee_for_month(year, month)
         net_income = income - maint_cost
 
-        ytd_income = 0.0
-        ytd_expenses = 0.0
-        for m in range(1, month + 1):
-            ytd_income += self.payment_model.total_for_month(year, m)
-            ytd_expenses += self.maintenance_model.total_fee_for_month(year, m)
+        ytd_start = datetime.date(year, 1, 1)
+        ytd_end = datetime.date(year + 1, 1, 1) if month == 12 else datetime.date(year, month + 1, 1)
+        ytd_income = self.payment_model.total_for_range(ytd_start, ytd_end)
+        ytd_expenses = self.maintenance_model.total_for_range(ytd_start, ytd_end)
         ytd_net = ytd_income - ytd_expenses
 
         total_units = len(self.unit_model.all())
-        occupied = self.db.query("SELECT COUNT(*) as c FROM units WHERE status='Occupied'")[0]["c"]
+        unit_counts = self.unit_model.status_counts()
+        occupied = unit_counts["Occupied"] + unit_counts["Full"]
         occupancy_rate = (occupied / total_units * 100) if total_units > 0 else 0.0
 
+        lines = []
+        lines.append(f"REPORTS FOR {year}-{month:02d}")
+        lines.append("=" * 40)
+        lines.append("")
+        lines.append(f"Total Billing Collected (Paid) This Month: ₱{income:.2f}")
+        lines.append(f"Total Maintenance Fees This Month: ₱{maint_cost:.2f}")
+        lines.append(f"Net Income This Month: ₱{net_income:.2f}")
+        lines.append("")
+        lines.append(f"Revenue: ₱{ytd_income:,.2f}")
+        lines.append(f"Expenses: ₱{ytd_expenses:,.2f}")
+        lines.append(f"Net Income: ₱{ytd_net:,.2f}")
+        lines.append("")
+        lines.append(f"Occupancy Rate: {occupancy_rate:.1f}% ({occupied}/{total_units} units)")
+        lines.append("")
+        lines.append("Active Tenants by Type:")
+        counts = {"Solo": 0, "Family": 0, "Dorm": 0, "Other": 0}
+        for t in self.tenant_model.active():
+            tt = (t["tenant_type"] or "").title()
+            if tt not in counts:
+                counts["Other"] += 1
+            else:
+                counts[tt] += 1
+        for k, v in counts.items():
+            lines.append(f"  {k}: {v}")
+
+        return {
+            "ytd_income": ytd_income,
+            "ytd_expenses": ytd_expenses,
+            "ytd_net": ytd_net,
+            "occupancy_rate": occupancy_rate,
+            "text": "\n".join(lines),
+        }
+
+    def _show_reports_data(self, data):
+        ytd_income = data["ytd_income"]
+        ytd_expenses = data["ytd_expenses"]
+        ytd_net = data["ytd_net"]
+        occupancy_rate = data["occupancy_rate"]
+
         if hasattr(self, "metric_rev"):
             for child in self.metric_rev.winfo_children():
                 if isinstance(child, ctk.CTkLabel) and "₱" not in child.cget("text"):
@@ -1789,47 +1895,19 @@ class MainApp(ctk.CTk):
                     child.configure(text=f"{occupancy_rate:.1f}%")
                     break
 
-        lines = []
-        lines.append(f"REPORTS FOR {year}-{month:02d}")
-        lines.append("=" * 40)
-        lines.append("")
-        lines.append(f"Total Billing Collected (Paid) This Month: ₱{income:.2f}")
-        lines.append(f"Total Maintenance Fees This Month: ₱{maint_cost:.2f}")
-        lines.append(f"Net Income This Month: ₱{net_income:.2f}")
-        lines.append("")
-        lines.append(f"Revenue: ₱{ytd_income:,.2f}")
-        lines.append(f"Expenses: ₱{ytd_expenses:,.2f}")
-        lines.append(f"Net Income: ₱{ytd_net:,.2f}")
-        lines.append("")
-        lines.append(f"Occupancy Rate: {occupancy_rate:.1f}% ({occupied}/{total_units} units)")
-        lines.append("")
-        lines.append("Active Tenants by Type:")
-        counts = {"Solo": 0, "Family": 0, "Dorm": 0, "Other": 0}
-        for t in self.tenant_model.active():
-            tt = (t["tenant_type"] or "").title()
-            if tt not in counts:
-                counts["Other"] += 1
-            else:
-                counts[tt] += 1
-        for k, v in counts.items():
-            lines.append(f"  {k}: {v}")
-
         if hasattr(self, "reports_text"):
             self.reports_text.delete("1.0", "end")
-            self.reports_text.insert("1.0", "\n".join(lines))
+            self.reports_text.insert("1.0", data["text"])
 
     def load_activity_logs(self):
         if not hasattr(self, "logs_tree"):
             return
-        for r in self.logs_tree.get_children():
-            self.logs_tree.delete(r)
-        rows = self.activity_model.all()
-        for row in rows:
-            self.logs_tree.insert(
-                "",
-                tk.END,
-                values=(row["timestamp"], row["action"], row["details"] or ""),
-            )
+        # The log is only appended to or cleared, so its key range is exact.
+        self.logs_tree.set_source(self._fetch_activity_logs, self.activity_model.estimate_count, source=("logs",))
+
+    def _fetch_activity_logs(self, after, offset, limit):
+        rows = self.activity_model.page(after_id=after, limit=limit, offset=offset)
+        return [(row["log_id"], (row["timestamp"], row["action"], row["details"] or ""), ()) for row in rows]
 
     def export_logs_excel(self):
         if Workbook is None:
@@ -1842,11 +1920,10 @@ class MainApp(ctk.CTk):
         )
         if not path:
             return
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Activity Logs"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Activity Logs")
         ws.append(["Log ID", "Timestamp", "Action", "Details"])
-        for row in self.activity_model.all():
+        for row in self.activity_model.iter_all():
             ws.append([row["log_id"], row["timestamp"], row["action"], row["details"] or ""])
         wb.save(path)
         messagebox.showinfo("Saved", f"Logs exported to {path}", parent=self)
@@ -1859,7 +1936,6 @@ class MainApp(ctk.CTk):
         messagebox.showinfo("Cleared", "All activity logs have been cleared.", parent=self)
 
     def backup_database(self):
-        from shutil import copy2
         path = filedialog.asksaveasfilename(
             defaultextension=".db",
             filetypes=[("Database Files", "*.db"), ("All Files", "*.*")],
@@ -1867,15 +1943,18 @@ class MainApp(ctk.CTk):
         )
         if not path:
             return
-        try:
-            copy2(self.db.db_file, path)
+
+        def done(job):
+            if job.error is not None:
+                messagebox.showerror("Backup Error", f"Failed to backup database:\n{job.error}", parent=self)
+                return
             self.log_action("Backup Database", f"Backup saved to {path}")
             messagebox.showinfo("Backup", f"Database backup saved to {path}", parent=self)
-        except Exception as e:
-            messagebox.showerror("Backup Error", f"Failed to backup database:\n{e}", parent=self)
+
+        job = BackupJob(self.db.db_file, path).start()
+        ProgressDialog(self, "Backup", "Backing up database...", job, on_done=done)
 
     def restore_database(self):
-        from shutil import copy2
         if not messagebox.askyesno(
             "Restore Database",
             "Restoring a backup will overwrite the current data. Continue?",
@@ -1888,19 +1967,17 @@ class MainApp(ctk.CTk):
         )
         if not path:
             return
-        try:
-            self.db.close()
-        except Exception:
-            pass
-        try:
-            copy2(path, self.db.db_file)
-            messagebox.showinfo(
-                "Restore",
-                "Database has been restored. Please restart the application to apply changes.",
-                parent=self,
-            )
-        except Exception as e:
-            messagebox.showerror("Restore Error", f"Failed to restore database:\n{e}", parent=self)
+
+        def done(job):
+            if job.error is not None:
+                messagebox.showerror("Restore Error", f"Failed to restore database:\n{job.error}", parent=self)
+                return
+            self.refresh_current_view()
+            self.log_action("Restore Database", f"Restored from {path}")
+            messagebox.showinfo("Restore", "Database has been restored.", parent=self)
+
+        job = RestoreJob(self.db, path).start()
+        ProgressDialog(self, "Restore", "Restoring database...", job, on_done=done, modal=True)
 
     def change_password(self):
         dlg = ChangePasswordDialog(self, self.db)
@@ -0,0 +1,427 @@
+import functools
+import sys
+import traceback
+import weakref
+from tkinter import ttk
+from constants import PAGE_SIZE, VIRTUAL_BUFFER_PAGES
+
+_LOADING_IID = "loading-"
+_WHEEL_ROWS = 3
+
+# tree -> {iid: (values, tags)} as sync_tree last wrote them. Reading them
+# back from Tk would cost a round trip per item and return Tcl-converted values.
+_shown = weakref.WeakKeyDictionary()
+
+
+def sync_tree(tree, rows):
+    """Make the top-level items of ``tree`` be ``rows`` (``(key, values,
+    tags)``, in order), keyed by ``key``.
+
+    Only rows that were added, removed or changed since the last sync touch
+    Tk, so an unchanged item keeps its selection and the view does not
+    jump. Later rows with an already seen key are skipped. Every write to
+    ``tree`` must go through here, or the diff will be against stale rows.
+    """
+    shown = _shown.get(tree, {})
+    wanted = {}
+    for key, values, tags in rows:
+        iid = str(key)
+        if iid not in wanted:
+            wanted[iid] = (tuple(values), tuple(tags))
+
+    current = tree.get_children()
+    stale = [iid for iid in current if iid not in wanted]
+    if stale:
+        tree.delete(*stale)
+    kept = [iid for iid in current if iid in wanted]
+    existing = set(kept)
+    reorder = kept != [iid for iid in wanted if iid in existing]
+
+    for index, (iid, row) in enumerate(wanted.items()):
+        values, tags = row
+        if iid not in existing:
+            tree.insert("", index, iid=iid, values=values, tags=tags)
+            continue
+        if reorder:
+            tree.move(iid, "", index)
+        if shown.get(iid) != row:
+            tree.item(iid, values=values, tags=tags)
+    _shown[tree] = wanted
+
+
+def list_source(rows):
+    """``(fetch, count)`` for ``VirtualTreeview.set_source`` over rows
+    (``(key, values, tags)``) already in memory."""
+    rows = list(rows)
+    position = {row[0]: i for i, row in enumerate(rows)}
+
+    def fetch(after, offset, limit):
+        start = offset if after is None else position[after] + 1 + offset
+        return rows[start:start + limit]
+
+    return fetch, lambda: len(rows)
+
+
+class RowWindow:
+    """The rows behind a virtual grid: how many there are, which of them
+    are on screen, and the fetched pages around those.
+
+    Rows are ``(key, values, tags)`` tuples and page ``n`` holds rows
+    ``n * page_size`` up to the next page. Only the pages under the window
+    plus ``buffer_pages`` on either side are kept. No Tk state lives here.
+    """
+
+    def __init__(self, page_size=PAGE_SIZE, buffer_pages=VIRTUAL_BUFFER_PAGES):
+        self.page_size = page_size
+        self.buffer_pages = buffer_pages
+        self.total = 0
+        self.offset = 0
+        self.visible = 1
+        self.pages = {}
+
+    def reset(self, total, offset=0):
+        """Forget every page and show ``total`` rows from ``offset``."""
+        self.pages = {}
+        self.total = total
+        self.offset = offset
+        self.scroll_to(offset)
+
+    def resize(self, visible):
+        visible = max(1, visible)
+        if visible == self.visible:
+            return False
+        self.visible = visible
+        self.scroll_to(self.offset)
+        return True
+
+    def scroll_to(self, offset):
+        """Start the window at row ``offset``; returns whether it moved."""
+        offset = max(0, min(offset, self.total - self.visible))
+        moved = offset != self.offset
+        self.offset = offset
+        self._evict()
+        return moved
+
+    def see(self, index):
+        """Scroll just enough for row ``index`` to be on screen."""
+        if index < self.offset:
+            return self.scroll_to(index)
+        if index >= self.offset + self.visible:
+            return self.scroll_to(index - self.visible + 1)
+        return False
+
+    def fraction(self):
+        """The window as ``(first, last)`` fractions, for a scrollbar."""
+        if not self.total:
+            return 0.0, 1.0
+        return self.offset / self.total, min(1.0, (self.offset + self.visible) / self.total)
+
+    def _span(self):
+        first = self.offset // self.page_size
+        last = max(first, (self.offset + self.visible - 1) // self.page_size)
+        return first, last
+
+    def wanted(self):
+        """Pages to fetch, those under the window before the buffer."""
+        first, last = self._span()
+        order = list(range(first, last + 1))
+        for step in range(1, self.buffer_pages + 1):
+            order += [last + step, first - step]
+        return [p for p in order
+                if p >= 0 and p * self.page_size < self.total and p not in self.pages]
+
+    def fetch_args(self, page):
+        """``(after_key, offset, limit)`` for fetching ``page``.
+
+        When the previous page is held the fetch continues from its last
+        key (a keyset seek); otherwise it skips the rows before the page.
+        """
+        previous = self.pages.get(page - 1)
+        if previous and len(previous) == self.page_size:
+            return previous[-1][0], 0, self.page_size
+        return None, page * self.page_size, self.page_size
+
+    def store(self, page, rows):
+        """Keep a fetched page; returns whether the rows on screen changed.
+
+        A short page is where the rows end, so ``total`` is corrected when
+        rows were added or removed since it was counted.
+        """
+        rows = list(rows)
+        self.pages[page] = rows
+        changed = False
+        if len(rows) < self.page_size:
+            total = page * self.page_size + len(rows)
+            if total != self.total:
+                self.pages = {p: r for p, r in self.pages.items() if p <= page}
+                self.total = total
+                self.scroll_to(self.offset)
+                changed = True
+        first, last = self._span()
+        self._evict()
+        return changed or first <= page <= last
+
+    def _evict(self):
+        first, last = self._span()
+        lo, hi = first - self.buffer_pages, last + self.buffer_pages
+        for page in [p for p in self.pages if not lo <= p <= hi]:
+            del self.pages[page]
+
+    def rows(self):
+        """The rows on screen, ``None`` for those whose page is not fetched yet."""
+        out = []
+        for index in range(self.offset, min(self.total, self.offset + self.visible)):
+            page, i = divmod(index, self.page_size)
+            rows = self.pages.get(page)
+            if rows is None:
+                out.append(None)
+            elif i < len(rows):
+                out.append(rows[i])
+        return out
+
+    def row_at(self, index):
+        page, i = divmod(index, self.page_size)
+        rows = self.pages.get(page)
+        return rows[i] if rows is not None and i < len(rows) else None
+
+    def index_of(self, key):
+        """Row number of ``key`` if its page is held, else None."""
+        for page, rows in self.pages.items():
+            for i, row in enumerate(rows):
+                if row[0] == key:
+                    return page * self.page_size + i
+        return None
+
+
+class VirtualTreeview(ttk.Frame):
+    """A Treeview and scrollbar that only create items for the rows on screen.
+
+    Rows come from ``set_source(fetch, count)``: ``fetch(after_key, offset,
+    limit)`` returns up to ``limit`` ``(key, values, tags)`` rows, skipping
+    ``offset`` rows after the one keyed ``after_key`` (or from the first row
+    when it is None), like a model's ``page()``; ``count()`` returns the
+    number of rows. Both run on ``loader`` and must not touch Tk. Pages
+    are fetched as the window scrolls onto them, so a grid opens in the
+    time one page takes whatever the size of the table.
+
+    Item ids are the row keys. ``selected_key()`` and ``select(key)``
+    survive the selected row scrolling out of the window, and so does the
+    position across ``refresh()``.
+    """
+
+    def __init__(self, master, loader, columns, style=None, on_total=None, **tree_options):
+        super().__init__(master)
+        self._loader = loader
+        self._name = f"virtual-tree-{id(self)}"
+        self._window = RowWindow()
+        self._fetch = None
+        self._count = None
+        self._source = None
+        self._requested = set()
+        self._keys = {}
+        self._selected = None
+        self.on_total = on_total
+
+        options = {"columns": columns, "show": "headings", "selectmode": "browse"}
+        if style:
+            options["style"] = style
+        options.update(tree_options)
+        self.tree = ttk.Treeview(self, **options)
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.tree.tag_configure("loading", foreground="gray")
+        self._row_height = self._lookup_row_height(style)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        for widget in (self.tree, self.vsb):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", self._on_wheel)
+            widget.bind("<Button-5>", self._on_wheel)
+        for sequence, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"),
+                               ("<Next>", "page"), ("<Home>", "-all"), ("<End>", "all")):
+            self.tree.bind(sequence, lambda _e, step=step: self._on_key(step))
+
+    def heading(self, column, **options):
+        return self.tree.heading(column, **options)
+
+    def column(self, column, **options):
+        return self.tree.column(column, **options)
+
+    def tag_configure(self, tag, **options):
+        return self.tree.tag_configure(tag, **options)
+
+    @property
+    def total(self):
+        return self._window.total
+
+    def set_source(self, fetch, count, source=None):
+        """Show the rows of ``fetch``/``count``.
+
+        ``source`` names the query (say, the filters it was built from);
+        when it matches the current one this is a refresh that keeps the
+        position and selection, otherwise the grid starts from the top.
+        """
+        keep = source is not None and source == self._source
+        self._fetch, self._count, self._source = fetch, count, source
+        if not keep:
+            self._selected = None
+        self._reload(keep)
+
+    def refresh(self):
+        """Re-count and re-fetch the rows, keeping position and selection."""
+        if self._fetch is not None:
+            self._reload(True)
+
+    def selected_key(self):
+        return self._selected
+
+    def select(self, key):
+        """Select the row keyed ``key``, scrolling to it if its page is held."""
+        self._selected = key
+        index = self._window.index_of(key)
+        if index is not None:
+            self._window.see(index)
+        self._render()
+
+    def destroy(self):
+        self._cancel_requests()
+        super().destroy()
+
+    def _reload(self, keep_position):
+        self._cancel_requests()
+        offset = self._window.offset if keep_position else 0
+        page = offset // self._window.page_size
+        fetch, count, limit = self._fetch, self._count, self._window.page_size
+
+        def load():
+            return count(), fetch(None, page * limit, limit)
+
+        self._loader.submit(self._name, load, lambda result: self._reloaded(page, offset, *result))
+
+    def _reloaded(self, page, offset, total, rows):
+        if not self.winfo_exists():
+            return
+        self._window.reset(total, offset)
+        self._window.store(page, rows)
+        self._render()
+        self._total_changed()
+
+    def _cancel_requests(self):
+        self._loader.cancel(self._name)
+        for page in self._requested:
+            self._loader.cancel(f"{self._name}:{page}")
+        self._requested.clear()
+
+    def _request_pages(self):
+        for page in self._window.wanted():
+            if page in self._requested:
+                continue
+            self._requested.add(page)
+            self._loader.submit(
+                f"{self._name}:{page}",
+                functools.partial(self._fetch, *self._window.fetch_args(page)),
+                lambda rows, page=page: self._page_loaded(page, rows),
+                lambda error, page=page: self._page_failed(page, error),
+            )
+
+    def _page_loaded(self, page, rows):
+        self._requested.discard(page)
+        if not self.winfo_exists():
+            return
+        total = self._window.total
+        if self._window.store(page, rows):
+            self._render()
+        else:
+            self._request_pages()
+        if self._window.total != total:
+            self._total_changed()
+
+    def _page_failed(self, page, error):
+        self._requested.discard(page)
+        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+
+    def _total_changed(self):
+        if self.on_total is not None:
+            self.on_total(self._window.total)
+
+    def _render(self):
+        if not self.tree.winfo_exists():
+            return
+        rows = []
+        self._keys = {}
+        for i, row in enumerate(self._window.rows()):
+            if row is None:
+                rows.append((f"{_LOADING_IID}{i}", ("Loading...",), ("loading",)))
+            else:
+                rows.append(row)
+                self._keys.setdefault(str(row[0]), row[0])
+        sync_tree(self.tree, rows)
+        if self._selected is not None and str(self._selected) in self._keys:
+            self.tree.selection_set(str(self._selected))
+        self.vsb.set(*self._window.fraction())
+        self._request_pages()
+
+    def _scroll_to(self, offset):
+        if self._window.scroll_to(offset):
+            self._render()
+
+    def _lookup_row_height(self, style):
+        lookup = ttk.Style(self).lookup
+        for name in (style, "Treeview"):
+            if name:
+                try:
+                    return int(lookup(name, "rowheight"))
+                except (TypeError, ValueError):
+                    pass
+        return 20
+
+    def _on_configure(self, event):
+        # One row's worth of height goes to the heading.
+        if self._window.resize(event.height // self._row_height - 1):
+            self._render()
+
+    def _on_select(self, _event=None):
+        selection = self.tree.selection()
+        if selection:
+            key = self._keys.get(selection[0])
+            if key is not None:
+                self._selected = key
+        elif self._selected is not None and self.tree.exists(str(self._selected)):
+            # Deselected while on screen; a row scrolled out stays selected.
+            self._selected = None
+
+    def _on_scrollbar(self, *args):
+        window = self._window
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * window.total))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (window.visible if args[2] == "pages" else 1)
+            self._scroll_to(window.offset + step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            step = -_WHEEL_ROWS
+        else:
+            step = _WHEEL_ROWS
+        self._scroll_to(self._window.offset + step)
+        return "break"
+
+    def _on_key(self, step):
+        window = self._window
+        if step in ("page", "-page"):
+            step = window.visible if step == "page" else -window.visible
+        elif step in ("all", "-all"):
+            step = window.total if step == "all" else -window.total
+        index = window.index_of(self._selected) if self._selected is not None else None
+        target = window.offset if index is None else index + step
+        target = max(0, min(target, window.total - 1))
+        window.see(target)
+        row = window.row_at(target)
+        if row is not None:
+            self._selected = row[0]
+        self._render()
+        return "break"